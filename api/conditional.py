@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+	if not if_none_match:
+		return False
+	if if_none_match.strip() == "*":
+		return True
+	# Weak comparison: W/"x" and "x" name the same representation.
+	wanted = etag.removeprefix("W/")
+	return any(candidate.strip().removeprefix("W/") == wanted for candidate in if_none_match.split(","))
+
+
+def conditional_json(request: Request, tag: str, build: Callable[[], Any]) -> Response:
+	# Weak because GZipMiddleware may re-encode the body; the tag tracks the state, not the bytes.
+	etag = f'W/"{tag}"'
+	headers = {"ETag": etag, "Cache-Control": "no-cache"}
+	if _matches(request.headers.get("if-none-match"), etag):
+		return Response(status_code=304, headers=headers)
+	return JSONResponse(build(), headers=headers)
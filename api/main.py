@@ -1,10 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from api.middleware.metrics import MetricsMiddleware
+from api.middleware.rate_limit import RateLimitMiddleware
+from api.routers.alerts import router as alerts_router
 from api.routers.ask import router as ask_router
 from api.routers.health import router as health_router
 from api.routers.ingest import router as ingest_router
+from api.routers.metrics import router as metrics_router
 from api.routers.phd import router as phd_router
+from floramigo.core.config import settings
 
 
 app = FastAPI(
@@ -13,6 +19,9 @@ app = FastAPI(
 	description="Sensor-aware Floramigo chatbot API adapted from the floramigo-plant-care-main reference project.",
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+# Added before CORS so that 429 responses still carry CORS headers.
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
 	CORSMiddleware,
 	allow_origins=["*"],
@@ -20,8 +29,12 @@ app.add_middleware(
 	allow_methods=["*"],
 	allow_headers=["*"],
 )
+# Outermost, so the recorded latency includes rate limiting, CORS, and compression.
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(health_router)
 app.include_router(ask_router)
 app.include_router(ingest_router)
 app.include_router(phd_router)
+app.include_router(alerts_router)
+app.include_router(metrics_router)
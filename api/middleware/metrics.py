@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import time
+
+from api.middleware.rate_limit import ROUTE_GROUPS
+from floramigo.core.config import settings
+from floramigo.core.metrics import HTTP_REQUEST_SECONDS
+
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope) -> str:
+	route = scope.get("route")
+	if route is not None:
+		return route.path
+	# Requests the rate limiter rejects never reach the router; their paths are exact and few.
+	path = scope["path"].rstrip("/") or "/"
+	return path if (scope["method"], path) in ROUTE_GROUPS else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+	def __init__(self, app, enabled: bool | None = None):
+		self.app = app
+		self.enabled = settings.metrics_enabled if enabled is None else enabled
+
+	async def __call__(self, scope, receive, send) -> None:
+		if scope["type"] != "http" or not self.enabled:
+			await self.app(scope, receive, send)
+			return
+
+		status = 500
+		started = time.perf_counter()
+
+		async def send_wrapper(message) -> None:
+			nonlocal status
+			if message["type"] == "http.response.start":
+				status = message["status"]
+			await send(message)
+
+		try:
+			await self.app(scope, receive, send_wrapper)
+		finally:
+			# The router writes the matched route into the shared scope, so the label is the
+			# route template ("/ask") rather than the raw path, keeping label cardinality bounded.
+			HTTP_REQUEST_SECONDS.labels(scope["method"], route_label(scope), str(status)).observe(
+				time.perf_counter() - started
+			)
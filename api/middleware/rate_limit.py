@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import math
+import time
+from collections import OrderedDict
+
+from floramigo.core.config import settings
+
+
+# (method, exact path) -> limiter group; reads such as GET /ingest/current stay unthrottled.
+ROUTE_GROUPS = {("POST", "/ask"): "ask", ("POST", "/ingest/telemetry"): "ingest"}
+
+
+class TokenBucketLimiter:
+	def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+		self.rate = rate
+		self.burst = float(burst)
+		self.max_clients = max_clients
+		# client key -> [tokens, last refill time]; least recently seen clients are evicted first.
+		self.buckets: OrderedDict[str, list[float]] = OrderedDict()
+		self.rejected = 0
+
+	def acquire(self, key: str, now: float | None = None) -> float:
+		now = time.monotonic() if now is None else now
+		bucket = self.buckets.get(key)
+		if bucket is None:
+			bucket = [self.burst, now]
+			self.buckets[key] = bucket
+			if len(self.buckets) > self.max_clients:
+				self.buckets.popitem(last=False)
+		else:
+			self.buckets.move_to_end(key)
+			bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+			bucket[1] = now
+
+		if bucket[0] >= 1.0:
+			bucket[0] -= 1.0
+			return 0.0
+		self.rejected += 1
+		return (1.0 - bucket[0]) / self.rate if self.rate > 0 else 60.0
+
+	def stats(self) -> dict:
+		return {"rate": self.rate, "burst": self.burst, "clients": len(self.buckets), "rejected": self.rejected}
+
+
+class RateLimitMiddleware:
+	def __init__(
+		self,
+		app,
+		limiters: dict[str, TokenBucketLimiter] | None = None,
+		max_concurrency: int | None = None,
+		key_header: str | None = None,
+		enabled: bool | None = None,
+	):
+		self.app = app
+		self.enabled = settings.rate_limit_enabled if enabled is None else enabled
+		self.limiters = limiters if limiters is not None else {
+			"ask": TokenBucketLimiter(settings.rate_limit_ask_rate, settings.rate_limit_ask_burst, settings.rate_limit_max_clients),
+			"ingest": TokenBucketLimiter(settings.rate_limit_ingest_rate, settings.rate_limit_ingest_burst, settings.rate_limit_max_clients),
+		}
+		self.max_concurrency = max_concurrency or settings.max_concurrent_requests
+		self.key_header = (key_header or settings.rate_limit_key_header).lower().encode("latin-1")
+		self.in_flight = 0
+		self.shed = 0
+
+	def _group(self, method: str, path: str) -> str | None:
+		group = ROUTE_GROUPS.get((method, path.rstrip("/") or "/"))
+		return group if group in self.limiters else None
+
+	def _client_key(self, scope) -> str:
+		for name, value in scope.get("headers", ()):
+			if name == self.key_header and value:
+				return "key:" + value.decode("latin-1")
+		client = scope.get("client")
+		return "ip:" + client[0] if client else "ip:unknown"
+
+	async def _reject(self, send, retry_after: float, detail: str) -> None:
+		body = json.dumps({"detail": detail}).encode("utf-8")
+		await send(
+			{
+				"type": "http.response.start",
+				"status": 429,
+				"headers": [
+					(b"content-type", b"application/json"),
+					(b"content-length", str(len(body)).encode("latin-1")),
+					(b"retry-after", str(max(1, math.ceil(retry_after))).encode("latin-1")),
+				],
+			}
+		)
+		await send({"type": "http.response.body", "body": body})
+
+	async def __call__(self, scope, receive, send) -> None:
+		if scope["type"] != "http" or not self.enabled:
+			await self.app(scope, receive, send)
+			return
+		group = self._group(scope["method"], scope["path"])
+		if group is None:
+			await self.app(scope, receive, send)
+			return
+
+		# Shed load before touching the client's bucket so rejected requests do not spend tokens.
+		if self.in_flight >= self.max_concurrency:
+			self.shed += 1
+			await self._reject(send, 1.0, "Server is busy. Please retry shortly.")
+			return
+		retry_after = self.limiters[group].acquire(self._client_key(scope))
+		if retry_after:
+			await self._reject(send, retry_after, f"Rate limit exceeded for {group} requests.")
+			return
+
+		self.in_flight += 1
+		try:
+			await self.app(scope, receive, send)
+		finally:
+			self.in_flight -= 1
+
+	def stats(self) -> dict:
+		return {
+			"enabled": self.enabled,
+			"in_flight": self.in_flight,
+			"max_concurrency": self.max_concurrency,
+			"shed": self.shed,
+			"groups": {group: limiter.stats() for group, limiter in self.limiters.items()},
+		}
@@ -9,6 +9,7 @@ class AskRequest(BaseModel):
 	message: str = Field(..., min_length=1)
 	plant_name: str | None = None
 	include_sensor_context: bool = True
+	include_timings: bool = False
 
 
 class AskResponse(BaseModel):
@@ -16,6 +17,8 @@ class AskResponse(BaseModel):
 	sensor_status: str
 	sensor_summary: str
 	plant_status: dict[str, Any]
+	intent: str | None = None
+	timings: dict[str, float] | None = None
 
 
 class TelemetryRequest(BaseModel):
@@ -27,6 +30,7 @@ class TelemetryRequest(BaseModel):
 	light_raw: int | None = None
 	light: int | None = None
 	timestamp: str | None = None
+	plant_name: str | None = None
 
 
 class TelemetryResponse(BaseModel):
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from floramigo.core.alert_log import InvalidCursor, get_alert_log, to_epoch
+
+
+router = APIRouter(tags=["alerts"])
+
+
+@router.get("/alerts")
+def query_alerts(
+	since: str | None = Query(None, description="Epoch seconds or ISO 8601 timestamp; only newer alerts are returned."),
+	type: str | None = Query(None, description="Alert type, e.g. moisture_low."),
+	severity: str | None = Query(None, description="info, warning, or critical."),
+	device: str | None = Query(None, description="Device id that raised the alert."),
+	limit: int = Query(100, ge=1, le=1000),
+	cursor: str | None = Query(None, description="next_cursor from the previous page."),
+) -> dict:
+	try:
+		since_ts = to_epoch(since)
+	except ValueError as exc:
+		raise HTTPException(status_code=400, detail=f"Invalid since: {since!r}") from exc
+	try:
+		alerts, next_cursor = get_alert_log().query(since_ts, type, severity, device, limit, cursor)
+	except InvalidCursor as exc:
+		raise HTTPException(status_code=400, detail=str(exc)) from exc
+	return {"alerts": alerts, "next_cursor": next_cursor}
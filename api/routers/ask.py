@@ -1,17 +1,32 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from api.models.command import AskRequest, AskResponse
 from floramigo.core.orchestrator import orchestrator
+from floramigo.core.rag_pipeline import retrieval_cache_stats
 
 
 router = APIRouter(tags=["ask"])
 
 
+def server_timing(timings: dict[str, float]) -> str:
+	return ", ".join(f"{name};dur={duration}" for name, duration in timings.items())
+
+
 @router.post("/ask", response_model=AskResponse)
-def ask_floramigo(payload: AskRequest) -> AskResponse:
+def ask_floramigo(payload: AskRequest, response: Response) -> AskResponse:
 	result = orchestrator.chat(
 		payload.message,
 		plant_name=payload.plant_name,
 		include_sensor_context=payload.include_sensor_context,
 	)
-	return AskResponse(**result)
+	# The header is always sent so browser devtools can show it; the body only carries timings on request.
+	timings = result.pop("timings")
+	response.headers["Server-Timing"] = server_timing(timings)
+	return AskResponse(**result, timings=timings if payload.include_timings else None)
+
+
+@router.get("/ask/cache")
+def response_cache_stats() -> dict:
+	if orchestrator.response_cache is None:
+		return {"enabled": False, "retrieval": retrieval_cache_stats()}
+	return {"enabled": True, **orchestrator.response_cache.stats(), "retrieval": retrieval_cache_stats()}
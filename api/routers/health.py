@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from api.models.command import HealthResponse
+from floramigo.core.orchestrator import orchestrator
 from floramigo.core.phd import plant_health_daemon
 
 
@@ -15,3 +16,12 @@ def healthcheck() -> HealthResponse:
 		api="floramigo",
 		sensor_monitor_running=plant_health_daemon.running,
 	)
+
+
+@router.get("/health/llm")
+def llm_health() -> dict:
+	return {
+		"available": orchestrator.llm_client.available,
+		**orchestrator.llm_client.stats(),
+		"routing": orchestrator.model_router.stats(),
+	}
@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
+from api.conditional import conditional_json
 from api.models.command import TelemetryRequest, TelemetryResponse
-from floramigo.core.phd import get_alerts, get_current_readings, plant_health_daemon
+from floramigo.core.phd import get_alerts, get_current_readings, get_state_tag, plant_health_daemon
+from floramigo.pcd.profiles import resolve_plant_name
 
 
 router = APIRouter(prefix="/ingest", tags=["ingest"])
@@ -9,7 +11,10 @@ router = APIRouter(prefix="/ingest", tags=["ingest"])
 
 @router.post("/telemetry", response_model=TelemetryResponse)
 def ingest_telemetry(payload: TelemetryRequest) -> TelemetryResponse:
-	reading = plant_health_daemon.ingest_reading(payload.model_dump(exclude_none=True))
+	# Compared after resolution, so an alias or typo of the current plant does not rewrite it on every reading.
+	if payload.plant_name and resolve_plant_name(payload.plant_name) != plant_health_daemon.plant_name:
+		plant_health_daemon.assign_plant(payload.plant_name)
+	reading = plant_health_daemon.ingest_reading(payload.model_dump(exclude_none=True, exclude={"plant_name"}))
 	return TelemetryResponse(
 		accepted=True,
 		reading=reading,
@@ -18,8 +23,8 @@ def ingest_telemetry(payload: TelemetryRequest) -> TelemetryResponse:
 
 
 @router.get("/current")
-def current_readings() -> dict:
-	return get_current_readings()
+def current_readings(request: Request) -> Response:
+	return conditional_json(request, f"current-{get_state_tag()}", get_current_readings)
 
 
 @router.get("/alerts")
@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from floramigo.core.metrics import registry
+from floramigo.core.orchestrator import orchestrator
+from floramigo.core.rag_pipeline import retrieval_cache_stats
+
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _cache_hit_ratios() -> dict[tuple[str, ...], float]:
+	ratios = {("retrieval",): retrieval_cache_stats()["hit_rate"]}
+	if orchestrator.response_cache is not None:
+		ratios[("response",)] = orchestrator.response_cache.stats()["hit_rate"]
+	return ratios
+
+
+def _cache_lookups() -> dict[tuple[str, ...], float]:
+	retrieval = retrieval_cache_stats()
+	lookups = {("retrieval", "hit"): retrieval["hits"], ("retrieval", "miss"): retrieval["misses"]}
+	if orchestrator.response_cache is not None:
+		response = orchestrator.response_cache.stats()
+		lookups[("response", "hit")] = response["hits"] + response["near_hits"]
+		lookups[("response", "miss")] = response["misses"]
+	return lookups
+
+
+# Cache figures are read from the caches' own counters at scrape time, so lookups pay nothing extra.
+registry.gauge("floramigo_cache_hit_ratio", "Cache hit ratio since start.", ("cache",), function=_cache_hit_ratios)
+registry.gauge("floramigo_cache_lookups", "Cache lookups since start by result.", ("cache", "result"), function=_cache_lookups)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+	return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,20 +1,26 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
+from api.conditional import conditional_json
 from api.models.command import MonitorResponse
-from floramigo.core.phd import get_plant_status, plant_health_daemon
+from floramigo.core.phd import get_plant_status, get_state_tag, plant_health_daemon
 
 
 router = APIRouter(tags=["phd"])
 
 
 @router.get("/diagnose")
-def diagnose() -> dict:
-	return get_plant_status()
+def diagnose(request: Request) -> Response:
+	return conditional_json(request, f"diagnose-{get_state_tag()}", get_plant_status)
 
 
 @router.post("/monitor/start", response_model=MonitorResponse)
 def start_monitor() -> MonitorResponse:
-	plant_health_daemon.start()
+	if not plant_health_daemon.start():
+		return MonitorResponse(
+			ok=False,
+			detail="Another worker owns the serial monitor; readings are shared through the state store.",
+			plant_status=get_plant_status(),
+		)
 	return MonitorResponse(ok=True, detail="Sensor monitor started.", plant_status=get_plant_status())
 
 
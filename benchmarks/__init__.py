@@ -0,0 +1 @@
+"""Floramigo benchmarking and load-testing tools."""
@@ -0,0 +1,187 @@
+"""Deterministic OpenAI-compatible chat completions server for offline benchmarking.
+
+Run it next to the API and point Floramigo at it:
+
+	python -m benchmarks.fake_llm --port 9100 --latency-ms 600 --tokens-per-second 40
+	FLORAMIGO_OPENAI_BASE_URL=http://127.0.0.1:9100/v1 uvicorn api.main:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, fields
+from itertools import count
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+REPLY_SENTENCES = [
+	"Check the top few centimetres of soil before watering again.",
+	"Your readings look steady, so keep the current routine for now.",
+	"Move the pot closer to bright, indirect light if growth has slowed.",
+	"Let excess water drain fully so the roots do not sit in moisture.",
+	"Mist sparingly and improve airflow if humidity stays high.",
+	"Yellowing lower leaves often point to overwatering rather than thirst.",
+	"Rotate the plant weekly so it grows evenly toward the light.",
+	"Wipe the leaves gently to keep dust from blocking light.",
+]
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass
+class FakeLLMConfig:
+	latency_distribution: str = "lognormal"
+	latency_ms: float = 400.0
+	latency_jitter: float = 0.5
+	tokens_per_second: float = 50.0
+	reply_tokens: int = 60
+	error_rate: float = 0.0
+	error_status: int = 500
+	seed: int = 7
+
+	def sample_latency(self, rng: random.Random) -> float:
+		base = max(self.latency_ms, 0.0) / 1000
+		if self.latency_distribution == "fixed" or base == 0:
+			return base
+		if self.latency_distribution == "uniform":
+			spread = base * self.latency_jitter
+			return max(0.0, rng.uniform(base - spread, base + spread))
+		if self.latency_distribution == "normal":
+			return max(0.0, rng.gauss(base, base * self.latency_jitter))
+		# lognormal with `latency_ms` as the median and `latency_jitter` as sigma
+		return rng.lognormvariate(math.log(base), self.latency_jitter)
+
+
+def _reply_for(messages: list[dict], reply_tokens: int) -> str:
+	prompt = json.dumps(messages, sort_keys=True)
+	offset = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest(), 16)
+	words: list[str] = []
+	index = 0
+	while len(words) < reply_tokens:
+		words.extend(REPLY_SENTENCES[(offset + index) % len(REPLY_SENTENCES)].split())
+		index += 1
+	return " ".join(words[:reply_tokens])
+
+
+def _count_tokens(messages: list[dict]) -> int:
+	return sum(len(str(message.get("content", "")).split()) for message in messages)
+
+
+def create_app(config: FakeLLMConfig | None = None) -> FastAPI:
+	config = config or FakeLLMConfig()
+	app = FastAPI(title="Floramigo fake LLM", version="0.1.0")
+	app.state.config = config
+	request_ids = count(1)
+
+	@app.get("/v1/models")
+	def list_models() -> dict:
+		return {"object": "list", "data": [{"id": "floramigo-fake", "object": "model", "owned_by": "floramigo"}]}
+
+	@app.post("/v1/chat/completions")
+	async def chat_completions(request: Request):
+		body = await request.json()
+		request_id = next(request_ids)
+		# Each request gets its own seeded stream so a run is reproducible regardless of concurrency.
+		rng = random.Random(f"{config.seed}:{request_id}")
+		latency = config.sample_latency(rng)
+
+		if rng.random() < config.error_rate:
+			await asyncio.sleep(latency)
+			return JSONResponse(
+				status_code=config.error_status,
+				content={"error": {"message": "Injected failure", "type": "fake_llm_error", "code": config.error_status}},
+			)
+
+		messages = body.get("messages", [])
+		model = body.get("model", "floramigo-fake")
+		reply_tokens = min(config.reply_tokens, int(body.get("max_tokens") or config.reply_tokens))
+		reply = _reply_for(messages, reply_tokens)
+		tokens = reply.split()
+		per_token = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+		completion_id = f"chatcmpl-fake-{request_id}"
+		created = int(time.time())
+		usage = {
+			"prompt_tokens": _count_tokens(messages),
+			"completion_tokens": len(tokens),
+			"total_tokens": _count_tokens(messages) + len(tokens),
+		}
+
+		if body.get("stream"):
+			async def event_stream():
+				await asyncio.sleep(latency)
+				for index, token in enumerate(tokens):
+					chunk = {
+						"id": completion_id,
+						"object": "chat.completion.chunk",
+						"created": created,
+						"model": model,
+						"choices": [
+							{
+								"index": 0,
+								"delta": {"role": "assistant", "content": token if index == 0 else f" {token}"},
+								"finish_reason": None,
+							}
+						],
+					}
+					yield f"data: {json.dumps(chunk)}\n\n"
+					if per_token:
+						await asyncio.sleep(per_token)
+				final = {
+					"id": completion_id,
+					"object": "chat.completion.chunk",
+					"created": created,
+					"model": model,
+					"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+				}
+				yield f"data: {json.dumps(final)}\n\n"
+				yield "data: [DONE]\n\n"
+
+			return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+		await asyncio.sleep(latency + per_token * len(tokens))
+		return {
+			"id": completion_id,
+			"object": "chat.completion",
+			"created": created,
+			"model": model,
+			"choices": [
+				{
+					"index": 0,
+					"message": {"role": "assistant", "content": reply},
+					"finish_reason": "stop",
+				}
+			],
+			"usage": usage,
+		}
+
+	return app
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Run a deterministic fake OpenAI chat completions server.")
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=9100)
+	defaults = FakeLLMConfig()
+	for field in fields(FakeLLMConfig):
+		option = "--" + field.name.replace("_", "-")
+		if field.name == "latency_distribution":
+			parser.add_argument(option, choices=LATENCY_DISTRIBUTIONS, default=defaults.latency_distribution)
+		else:
+			parser.add_argument(option, type=type(getattr(defaults, field.name)), default=getattr(defaults, field.name))
+	args = parser.parse_args()
+
+	import uvicorn
+
+	config = FakeLLMConfig(**{field.name: getattr(args, field.name) for field in fields(FakeLLMConfig)})
+	uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,102 @@
+"""Measure the fast-path intent router on a labeled query set.
+
+	python -m benchmarks.intent --llm-latency-ms 1200 --llm-cost-per-call 0.0004
+
+Reports classification accuracy, classifier latency, the share of queries answered
+without the LLM, and the estimated latency and cost saved per 1,000 questions.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from floramigo.core.intent import ADVICE, classify_intent, telemetry_answer
+from floramigo.core.resilience import percentile
+
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+SAMPLE_STATUS = {
+	"status": "good",
+	"summary": "Your plant is mostly doing well, but soil moisture is low at 18%.",
+	"issues": ["Soil moisture is low at 18%"],
+	"good_points": [
+		"Temperature is comfortable at 23.5°C",
+		"Air humidity is comfortable at 45.0%",
+		"Light levels look usable",
+	],
+	"data": {
+		"temperature": 23.5,
+		"humidity": 45.0,
+		"moisture": 18,
+		"light": 250,
+		"timestamp": "2026-03-06T10:30:00",
+		"source": "api",
+	},
+	"recent_alerts": [],
+}
+
+
+def load_queries(path: Path) -> list[dict]:
+	with open(path, "r", encoding="utf-8") as handle:
+		return json.load(handle)
+
+
+def run(queries: list[dict], repeat: int, llm_latency_ms: float, llm_cost_per_call: float) -> dict:
+	correct = 0
+	wrong_fast_path = 0
+	fast_path = 0
+	for row in queries:
+		predicted = classify_intent(row["query"])
+		correct += predicted == row["intent"]
+		if predicted != ADVICE:
+			fast_path += 1
+			wrong_fast_path += row["intent"] == ADVICE
+
+	classify_samples: list[float] = []
+	answer_samples: list[float] = []
+	for _ in range(repeat):
+		for row in queries:
+			started = time.perf_counter()
+			intent = classify_intent(row["query"])
+			classify_samples.append(time.perf_counter() - started)
+			if intent != ADVICE:
+				started = time.perf_counter()
+				telemetry_answer(intent, SAMPLE_STATUS)
+				answer_samples.append(time.perf_counter() - started)
+
+	total = len(queries)
+	fast_share = fast_path / total if total else 0.0
+	fast_path_ms = percentile(classify_samples, 0.5) * 1000 + percentile(answer_samples, 0.5) * 1000
+	return {
+		"queries": total,
+		"accuracy": round(correct / total, 4) if total else 0.0,
+		"fast_path_share": round(fast_share, 4),
+		"advice_misrouted_to_fast_path": wrong_fast_path,
+		"classifier_p50_us": round(percentile(classify_samples, 0.5) * 1e6, 2),
+		"classifier_p99_us": round(percentile(classify_samples, 0.99) * 1e6, 2),
+		"template_answer_p50_us": round(percentile(answer_samples, 0.5) * 1e6, 2),
+		"estimated_per_1000_questions": {
+			"llm_calls_avoided": round(fast_share * 1000),
+			"latency_saved_seconds": round(fast_share * 1000 * (llm_latency_ms - fast_path_ms) / 1000, 1),
+			"cost_saved": round(fast_share * 1000 * llm_cost_per_call, 4),
+		},
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Benchmark the fast-path intent router.")
+	parser.add_argument("--queries", type=Path, default=DATA_DIR / "intent_queries.json")
+	parser.add_argument("--repeat", type=int, default=200)
+	parser.add_argument("--llm-latency-ms", type=float, default=1200.0, help="Typical /ask LLM latency to compare against.")
+	parser.add_argument("--llm-cost-per-call", type=float, default=0.0004, help="Typical cost of one LLM call in USD.")
+	args = parser.parse_args()
+
+	report = run(load_queries(args.queries), args.repeat, args.llm_latency_ms, args.llm_cost_per_call)
+	print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,310 @@
+"""Drive a mix of ingest, diagnose, and ask traffic against the API and report capacity.
+
+	python -m benchmarks.loadgen --spawn --duration 30 --rate 50 --mix ingest=6,diagnose=3,ask=1
+	python -m benchmarks.loadgen --url http://127.0.0.1:8000 --concurrency 32 --output load.json
+
+``--spawn`` starts the fake LLM and the API (on a throwaway SQLite state store) as
+subprocesses and tears them down afterwards. Without ``--rate`` the generator runs
+closed-loop with ``--concurrency`` workers; with it, requests start on a fixed schedule
+and latency is measured from the scheduled start, so a stalled server cannot hide its
+queueing delay. The JSON report has throughput, p50/p90/p99 latency, and error and
+rate-limit shares per endpoint, plus the ``/ask`` stage breakdown from ``Server-Timing``.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+import httpx
+
+from floramigo.core.resilience import percentile
+
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+ROOT_DIR = Path(__file__).resolve().parent.parent
+ENDPOINTS = ("ingest", "diagnose", "ask")
+DEFAULT_MIX = "ingest=6,diagnose=3,ask=1"
+PLANTS = ("Peace Lily", "Snake Plant", "Spider Plant", "Basil", None)
+
+
+def parse_mix(text: str) -> dict[str, float]:
+	mix: dict[str, float] = {}
+	for part in text.split(","):
+		name, _, weight = part.partition("=")
+		name = name.strip()
+		if name not in ENDPOINTS:
+			raise ValueError(f"Unknown endpoint {name!r} in mix; expected one of {', '.join(ENDPOINTS)}.")
+		mix[name] = float(weight or 1)
+	if not any(weight > 0 for weight in mix.values()):
+		raise ValueError("The mix needs at least one endpoint with a positive weight.")
+	return mix
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+	stages: dict[str, float] = {}
+	for entry in header.split(","):
+		name, _, params = entry.strip().partition(";")
+		for param in params.split(";"):
+			key, _, value = param.strip().partition("=")
+			if key == "dur" and name:
+				try:
+					stages[name] = float(value)
+				except ValueError:
+					pass
+	return stages
+
+
+class RequestFactory:
+	# Seeded so two runs with the same arguments send the same sequence of requests.
+	def __init__(self, seed: int = 7, questions: list[str] | None = None):
+		self.rng = random.Random(seed)
+		self.questions = questions or [row["query"] for row in json.loads((DATA_DIR / "intent_queries.json").read_text(encoding="utf-8"))]
+
+	def build(self, endpoint: str) -> tuple[str, str, dict | None]:
+		if endpoint == "ingest":
+			return "POST", "/ingest/telemetry", {
+				"temperature": round(self.rng.uniform(12, 32), 1),
+				"humidity": round(self.rng.uniform(25, 75), 1),
+				"moisture_pct": self.rng.randint(8, 85),
+				"light_raw": self.rng.randint(30, 900),
+			}
+		if endpoint == "diagnose":
+			return "GET", "/diagnose", None
+		return "POST", "/ask", {"message": self.rng.choice(self.questions), "plant_name": self.rng.choice(PLANTS)}
+
+
+class Recorder:
+	def __init__(self):
+		self.latencies: dict[str, list[float]] = defaultdict(list)
+		self.statuses: dict[str, Counter] = defaultdict(Counter)
+		self.stages: dict[str, list[float]] = defaultdict(list)
+
+	def record(self, endpoint: str, status: int, seconds: float, server_timing: str | None = None) -> None:
+		self.latencies[endpoint].append(seconds)
+		self.statuses[endpoint][status] += 1
+		if server_timing:
+			for stage, duration in parse_server_timing(server_timing).items():
+				self.stages[stage].append(duration)
+
+	def report(self, elapsed: float) -> dict:
+		endpoints = {}
+		for endpoint in sorted(self.latencies, key=ENDPOINTS.index):
+			endpoints[endpoint] = summarize(self.latencies[endpoint], self.statuses[endpoint], elapsed)
+		all_latencies = [value for values in self.latencies.values() for value in values]
+		all_statuses = sum(self.statuses.values(), Counter())
+		return {
+			"elapsed_seconds": round(elapsed, 3),
+			"overall": summarize(all_latencies, all_statuses, elapsed),
+			"endpoints": endpoints,
+			"ask_stages_ms": {
+				stage: {"p50": round(percentile(values, 0.5), 3), "p95": round(percentile(values, 0.95), 3)}
+				for stage, values in self.stages.items()
+			},
+		}
+
+
+def summarize(latencies: list[float], statuses: Counter, elapsed: float) -> dict:
+	requests = sum(statuses.values())
+	# Status 0 marks transport failures (refused connections, timeouts).
+	errors = sum(count for status, count in statuses.items() if status == 0 or status >= 500)
+	rate_limited = statuses.get(429, 0)
+	ok = sum(count for status, count in statuses.items() if 200 <= status < 400)
+	milliseconds = [value * 1000 for value in latencies]
+	return {
+		"requests": requests,
+		"ok": ok,
+		"throughput_rps": round(ok / elapsed, 2) if elapsed > 0 else 0.0,
+		"error_rate": round(errors / requests, 4) if requests else 0.0,
+		"rate_limited_rate": round(rate_limited / requests, 4) if requests else 0.0,
+		"latency_ms": {
+			"p50": round(percentile(milliseconds, 0.5), 2),
+			"p90": round(percentile(milliseconds, 0.9), 2),
+			"p99": round(percentile(milliseconds, 0.99), 2),
+			"max": round(max(milliseconds), 2) if milliseconds else 0.0,
+		},
+		"statuses": {str(status): count for status, count in sorted(statuses.items())},
+	}
+
+
+async def _send(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, request, started: float, client_key: str) -> None:
+	method, path, body = request
+	try:
+		response = await client.request(method, path, json=body, headers={"X-Client-Key": client_key})
+		status, timing = response.status_code, response.headers.get("server-timing")
+	except httpx.HTTPError:
+		status, timing = 0, None
+	recorder.record(endpoint, status, time.perf_counter() - started, timing if endpoint == "ask" else None)
+
+
+async def run_load(
+	client: httpx.AsyncClient,
+	mix: dict[str, float],
+	duration: float,
+	concurrency: int = 16,
+	rate: float | None = None,
+	clients: int = 1,
+	seed: int = 7,
+) -> dict:
+	factory = RequestFactory(seed)
+	recorder = Recorder()
+	endpoints = [name for name in mix if mix[name] > 0]
+	weights = [mix[name] for name in endpoints]
+	keys = [f"loadgen-{index}" for index in range(max(1, clients))]
+	started = time.perf_counter()
+	deadline = started + duration
+
+	def next_request(sequence: int):
+		endpoint = factory.rng.choices(endpoints, weights)[0]
+		return endpoint, factory.build(endpoint), keys[sequence % len(keys)]
+
+	if rate:
+		# Open loop: request i is due at started + i / rate whether or not earlier ones finished.
+		# Requests beyond the client's connection limit wait in its pool, and that wait counts as latency.
+		in_flight: set[asyncio.Task] = set()
+		sequence = 0
+		while True:
+			due = started + sequence / rate
+			if due >= deadline:
+				break
+			delay = due - time.perf_counter()
+			if delay > 0:
+				await asyncio.sleep(delay)
+			endpoint, request, key = next_request(sequence)
+			sequence += 1
+			task = asyncio.create_task(_send(client, recorder, endpoint, request, due, key))
+			in_flight.add(task)
+			task.add_done_callback(in_flight.discard)
+		if in_flight:
+			await asyncio.gather(*in_flight)
+	else:
+		counter = iter(range(1 << 62))
+
+		async def worker() -> None:
+			while time.perf_counter() < deadline:
+				endpoint, request, key = next_request(next(counter))
+				await _send(client, recorder, endpoint, request, time.perf_counter(), key)
+
+		await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+
+	return recorder.report(time.perf_counter() - started)
+
+
+def _free_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(("127.0.0.1", 0))
+		return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+	deadline = time.monotonic() + timeout
+	while time.monotonic() < deadline:
+		try:
+			if httpx.get(url, timeout=1.0).status_code == 200:
+				return
+		except httpx.HTTPError:
+			pass
+		time.sleep(0.1)
+	raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s.")
+
+
+@contextmanager
+def spawn_stack(llm_latency_ms: float, llm_tokens_per_second: float, workers: int, rate_limit: bool):
+	llm_port, api_port = _free_port(), _free_port()
+	processes: list[subprocess.Popen] = []
+	with tempfile.TemporaryDirectory(prefix="floramigo-load-") as state_dir:
+		env = {
+			**os.environ,
+			"FLORAMIGO_OPENAI_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+			"FLORAMIGO_STATE_BACKEND": "sqlite",
+			"FLORAMIGO_STATE_DB": str(Path(state_dir) / "state.db"),
+			"FLORAMIGO_SERIAL_LOCK": str(Path(state_dir) / "serial.lock"),
+			"FLORAMIGO_ALERT_LOG": str(Path(state_dir) / "alert_log.db"),
+			"FLORAMIGO_RATE_LIMIT": "true" if rate_limit else "false",
+		}
+		try:
+			processes.append(
+				subprocess.Popen(
+					[
+						sys.executable, "-m", "benchmarks.fake_llm", "--port", str(llm_port),
+						"--latency-ms", str(llm_latency_ms), "--tokens-per-second", str(llm_tokens_per_second),
+					],
+					cwd=ROOT_DIR,
+					env=env,
+				)
+			)
+			_wait_ready(f"http://127.0.0.1:{llm_port}/v1/models")
+			processes.append(
+				subprocess.Popen(
+					[
+						sys.executable, "-m", "uvicorn", "api.main:app",
+						"--port", str(api_port), "--workers", str(workers), "--log-level", "warning",
+					],
+					cwd=ROOT_DIR,
+					env=env,
+				)
+			)
+			_wait_ready(f"http://127.0.0.1:{api_port}/health")
+			yield f"http://127.0.0.1:{api_port}"
+		finally:
+			for process in reversed(processes):
+				process.terminate()
+				try:
+					process.wait(timeout=10)
+				except subprocess.TimeoutExpired:
+					process.kill()
+
+
+async def _run(args: argparse.Namespace, url: str) -> dict:
+	limits = httpx.Limits(max_connections=max(args.concurrency, 1) * 4)
+	async with httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits) as client:
+		if args.warmup:
+			await run_load(client, parse_mix(args.mix), args.warmup, args.concurrency, None, args.clients, args.seed + 1)
+		return await run_load(client, parse_mix(args.mix), args.duration, args.concurrency, args.rate, args.clients, args.seed)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Load-test the Floramigo API with a mix of ingest, diagnose, and ask requests.")
+	parser.add_argument("--url", default="http://127.0.0.1:8000", help="API to test; ignored with --spawn.")
+	parser.add_argument("--spawn", action="store_true", help="Start the fake LLM and the API for this run.")
+	parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --spawn.")
+	parser.add_argument("--llm-latency-ms", type=float, default=400.0, help="Fake LLM median latency for --spawn.")
+	parser.add_argument("--llm-tokens-per-second", type=float, default=50.0, help="Fake LLM generation speed for --spawn.")
+	parser.add_argument("--rate-limit", action="store_true", help="Keep per-client rate limiting on in the spawned API.")
+	parser.add_argument("--mix", default=DEFAULT_MIX, help="Relative weights, e.g. ingest=6,diagnose=3,ask=1.")
+	parser.add_argument("--duration", type=float, default=20.0, help="Measured seconds.")
+	parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before the run.")
+	parser.add_argument("--concurrency", type=int, default=16, help="Closed-loop workers.")
+	parser.add_argument("--rate", type=float, default=None, help="Open-loop arrival rate in requests per second.")
+	parser.add_argument("--clients", type=int, default=1, help="Distinct X-Client-Key values to rotate through.")
+	parser.add_argument("--timeout", type=float, default=30.0)
+	parser.add_argument("--seed", type=int, default=7)
+	parser.add_argument("--output", type=Path, default=None, help="Also write the JSON report to this file.")
+	args = parser.parse_args()
+	parse_mix(args.mix)
+
+	config = {key: value for key, value in vars(args).items() if key != "output"}
+	if args.spawn:
+		with spawn_stack(args.llm_latency_ms, args.llm_tokens_per_second, args.workers, args.rate_limit) as url:
+			result = asyncio.run(_run(args, url))
+	else:
+		result = asyncio.run(_run(args, args.url))
+
+	output = json.dumps({"config": config, **result}, indent=2)
+	print(output)
+	if args.output:
+		args.output.write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,272 @@
+"""Micro-benchmarks for the telemetry, retrieval, and prompt hot paths, with stored baselines.
+
+	python -m benchmarks.micro
+	python -m benchmarks.micro --save-baseline
+	python -m benchmarks.micro --compare --threshold 0.5
+
+Cases cover ``PlantHealthDaemon.parse_reading``, ``ingest_reading``, ``get_plant_status``
+and ``sensor_context``, ``get_relevant_snippets``, and ``FloramigoOrchestrator._system_prompt``.
+The daemon cases run against synthetic history of several sizes and several devices. The
+daemon tracks one device, so N devices are N daemons with their own state files, called
+round-robin. ``--compare`` reads the baseline file and exits non-zero when any case is
+more than ``--threshold`` slower than its baseline. It compares the fastest batch by
+default (``--metric min_us``), since file writes make medians noisy. Each figure is
+the median over ``--rounds`` passes of the suite. Baselines are only comparable on the
+machine that recorded them; re-record with ``--save-baseline`` after moving hosts.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from itertools import cycle
+from pathlib import Path
+from typing import Callable
+from unittest.mock import patch
+
+from floramigo.core.alert_log import AlertLog
+from floramigo.core.orchestrator import FloramigoOrchestrator
+from floramigo.core.phd import PlantHealthDaemon
+from floramigo.core.rag_pipeline import clear_retrieval_cache
+from floramigo.core.state_store import JsonStateStore, SQLiteStateStore, WriterLock
+from floramigo.pcd.pcd_snippets import get_relevant_snippets
+
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "micro.json"
+HISTORY_SIZES = (0, 240, 1440)
+DEVICE_COUNTS = (1, 8)
+SERIAL_LINE = "TEMP:23.5,HUM:45.0,MOIST:38%,RAW:612,LIGHT:480"
+# Inside every band, so ingesting it raises no alert.
+QUIET_READING = {"temperature": 22.0, "humidity": 50.0, "moisture_pct": 50, "moisture_raw": 520, "light_raw": 600}
+# Critically dry, so every ingest also raises and persists alerts.
+ALERT_READING = {"temperature": 22.0, "humidity": 50.0, "moisture_pct": 8, "moisture_raw": 910, "light_raw": 600}
+QUESTIONS = (
+	"Why are the leaves on my peace lily turning yellow?",
+	"Should I water it today or wait until the soil dries out?",
+	"There are tiny webs under the leaves, what should I do?",
+)
+
+
+def synthetic_reading(rng: random.Random, timestamp: datetime) -> dict:
+	return {
+		"timestamp": timestamp.isoformat(),
+		"temperature": round(rng.uniform(16, 30), 1),
+		"humidity": round(rng.uniform(30, 70), 1),
+		"moisture_pct": rng.randint(25, 70),
+		"moisture_raw": rng.randint(300, 800),
+		"light_raw": rng.randint(100, 900),
+		"status": "ok",
+		"source": "serial",
+	}
+
+
+def build_daemons(directory: Path, history_size: int, devices: int, backend: str, seed: int = 5) -> list[PlantHealthDaemon]:
+	rng = random.Random(seed)
+	start = datetime(2026, 1, 1)
+	daemons = []
+	for device in range(devices):
+		root = directory / f"device-{device}"
+		root.mkdir(parents=True, exist_ok=True)
+		history = [synthetic_reading(rng, start + timedelta(minutes=minute)) for minute in range(history_size)]
+		if backend == "sqlite":
+			store = SQLiteStateStore(root / "state.db")
+			for entry in history:
+				store.append_history(entry, keep=1440, min_interval=0)
+		else:
+			store = JsonStateStore(root / "current.json", root / "history.json", root / "alerts.json")
+			store.save_history(history)
+		daemon = PlantHealthDaemon(
+			plant_name="Peace Lily",
+			store=store,
+			writer_lock=WriterLock(root / "serial.lock"),
+			alert_log=AlertLog(root / "alert_log.db"),
+		)
+		daemon.ingest_reading(synthetic_reading(rng, start + timedelta(minutes=history_size)))
+		# Steady state: the per-minute history append has just happened, so ingest measures the common path.
+		daemon.last_history_save = datetime.now()
+		daemons.append(daemon)
+	return daemons
+
+
+def measure(fn: Callable[[], object], min_time: float = 0.1, repeat: int = 5) -> dict:
+	# Calibrate the batch size so each timed batch runs for at least min_time / repeat.
+	number = 1
+	while True:
+		started = time.perf_counter()
+		for _ in range(number):
+			fn()
+		elapsed = time.perf_counter() - started
+		if elapsed >= min_time / repeat or number >= 1_000_000:
+			break
+		number *= 2 if elapsed == 0 else max(2, min(10, int((min_time / repeat) / elapsed) + 1))
+
+	per_call = []
+	# Like timeit, keep the collector from landing in some batches and not others.
+	gc_was_enabled = gc.isenabled()
+	gc.disable()
+	try:
+		for _ in range(repeat):
+			started = time.perf_counter()
+			for _ in range(number):
+				fn()
+			per_call.append((time.perf_counter() - started) / number * 1e6)
+	finally:
+		if gc_was_enabled:
+			gc.enable()
+	return {
+		"median_us": round(statistics.median(per_call), 3),
+		"min_us": round(min(per_call), 3),
+		"calls": number * repeat,
+	}
+
+
+def case_key(name: str, **params) -> str:
+	if not params:
+		return name
+	return f"{name}[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+
+def run_suite(
+	history_sizes: tuple[int, ...] = HISTORY_SIZES,
+	device_counts: tuple[int, ...] = DEVICE_COUNTS,
+	backend: str = "json",
+	min_time: float = 0.1,
+	repeat: int = 5,
+	only: str | None = None,
+) -> dict[str, dict]:
+	results: dict[str, dict] = {}
+
+	def bench(key: str, fn: Callable[[], object]) -> None:
+		if only and only not in key:
+			return
+		results[key] = measure(fn, min_time, repeat)
+
+	parser_daemon = PlantHealthDaemon(store=JsonStateStore(Path("/nonexistent/c"), Path("/nonexistent/h"), Path("/nonexistent/a")))
+	bench("parse_reading", lambda: parser_daemon.parse_reading(SERIAL_LINE))
+	bench(case_key("parse_reading", line="invalid"), lambda: parser_daemon.parse_reading("BOOT OK"))
+
+	questions = cycle(QUESTIONS)
+	bench("get_relevant_snippets", lambda: get_relevant_snippets(next(questions), "Peace Lily"))
+
+	with tempfile.TemporaryDirectory(prefix="floramigo-micro-") as tmp:
+		for history_size in history_sizes:
+			for devices in device_counts:
+				daemons = build_daemons(Path(tmp) / f"h{history_size}-d{devices}", history_size, devices, backend)
+				params = {"history": history_size, "devices": devices}
+				ring = cycle(daemons)
+				bench(case_key("ingest_reading", **params), lambda: next(ring).ingest_reading(QUIET_READING))
+				bench(case_key("get_plant_status", **params), lambda: next(ring).get_plant_status())
+				bench(case_key("sensor_context", **params), lambda: next(ring).sensor_context())
+
+				orchestrator = FloramigoOrchestrator(tool_calling=False, state_store=daemons[0].store)
+				with ExitStack() as stack:
+					# The prompt reads the module-level daemon; point it at this case's devices instead.
+					stack.enter_context(
+						patch("floramigo.core.orchestrator.format_sensor_context_for_llm", lambda: next(ring).sensor_context())
+					)
+					status = daemons[0].get_plant_status()
+					bench(
+						case_key("system_prompt", cache="warm", **params),
+						lambda: orchestrator._system_prompt("Peace Lily", next(questions), True, status),
+					)
+
+					def cold_prompt() -> str:
+						orchestrator._prefix_cache.clear()
+						clear_retrieval_cache()
+						return orchestrator._system_prompt("Peace Lily", next(questions), True, status)
+
+					bench(case_key("system_prompt", cache="cold", **params), cold_prompt)
+				# Last, since it leaves the devices in an alerting state.
+				bench(case_key("ingest_reading", alerts="yes", **params), lambda: next(ring).ingest_reading(ALERT_READING))
+	return results
+
+
+def merge_rounds(rounds: list[dict[str, dict]]) -> dict[str, dict]:
+	# Median across rounds so one unusually fast or slow round neither sets nor trips a baseline.
+	merged = {}
+	for key in rounds[0]:
+		samples = [round_results[key] for round_results in rounds if key in round_results]
+		merged[key] = {
+			"median_us": round(statistics.median(sample["median_us"] for sample in samples), 3),
+			"min_us": round(statistics.median(sample["min_us"] for sample in samples), 3),
+			"calls": sum(sample["calls"] for sample in samples),
+		}
+	return merged
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float, metric: str = "min_us") -> dict:
+	cases = {}
+	regressions = []
+	for key, result in results.items():
+		reference = baseline.get(key, {}).get(metric)
+		if not reference:
+			cases[key] = {"current_us": result[metric], "baseline_us": None, "ratio": None}
+			continue
+		ratio = result[metric] / reference
+		cases[key] = {"current_us": result[metric], "baseline_us": reference, "ratio": round(ratio, 3)}
+		if ratio > 1 + threshold:
+			regressions.append(key)
+	return {
+		"metric": metric,
+		"threshold": threshold,
+		"regressions": regressions,
+		"missing": sorted(set(baseline) - set(results)),
+		"cases": cases,
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Micro-benchmark Floramigo hot paths.")
+	parser.add_argument("--history", type=int, nargs="+", default=list(HISTORY_SIZES), help="Synthetic history sizes.")
+	parser.add_argument("--devices", type=int, nargs="+", default=list(DEVICE_COUNTS), help="Device counts.")
+	parser.add_argument("--backend", choices=("json", "sqlite"), default="json", help="State store for the daemon cases.")
+	parser.add_argument("--min-time", type=float, default=0.1, help="Seconds to spend per case per round.")
+	parser.add_argument("--repeat", type=int, default=5, help="Timed batches per case.")
+	parser.add_argument("--rounds", type=int, default=3, help="Full passes over the suite; each case reports the median.")
+	parser.add_argument("--only", default=None, help="Run only cases whose key contains this text.")
+	parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+	parser.add_argument("--save-baseline", action="store_true", help="Write the results to the baseline file.")
+	parser.add_argument("--compare", action="store_true", help="Compare against the baseline file.")
+	parser.add_argument("--threshold", type=float, default=0.5, help="Allowed slowdown before a case is flagged.")
+	parser.add_argument("--metric", choices=("min_us", "median_us"), default="min_us", help="Statistic to compare.")
+	parser.add_argument("--output", type=Path, default=None, help="Also write the JSON report to this file.")
+	args = parser.parse_args()
+
+	results = merge_rounds(
+		[
+			run_suite(tuple(args.history), tuple(args.devices), args.backend, args.min_time, args.repeat, args.only)
+			for _ in range(max(1, args.rounds))
+		]
+	)
+	report: dict = {
+		"python": platform.python_version(),
+		"machine": platform.machine(),
+		"backend": args.backend,
+		"results": results,
+	}
+	if args.compare:
+		with open(args.baseline, "r", encoding="utf-8") as handle:
+			report["comparison"] = compare(results, json.load(handle)["results"], args.threshold, args.metric)
+	if args.save_baseline:
+		args.baseline.parent.mkdir(parents=True, exist_ok=True)
+		args.baseline.write_text(json.dumps({key: value for key, value in report.items() if key != "comparison"}, indent=2) + "\n", encoding="utf-8")
+
+	output = json.dumps(report, indent=2)
+	print(output)
+	if args.output:
+		args.output.write_text(output + "\n", encoding="utf-8")
+	if args.compare and report["comparison"]["regressions"]:
+		sys.exit(1)
+
+
+if __name__ == "__main__":
+	main()
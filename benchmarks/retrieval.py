@@ -0,0 +1,170 @@
+"""Compare care-tip retrievers on a labeled query set.
+
+	python -m benchmarks.retrieval --k 5 --synthetic 5000 --output retrieval.json
+
+Backends: ``keyword`` (the original ``get_relevant_snippets`` buckets), ``bm25``, and
+``vector``. Each backend reports recall@k, MRR, and p50/p95/p99 search latency overall
+and per query category, plus the latency ``retrieve_care_tips`` adds to ``/ask``.
+``--synthetic`` pads the corpus with generated documents so latency can be compared at
+larger corpus sizes; quality is always scored on the real documents.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+from unittest.mock import patch
+
+from floramigo.core import rag_pipeline
+from floramigo.core.rag_pipeline import BM25Retriever, VectorRetriever
+from floramigo.core.resilience import percentile
+from floramigo.pcd.corpus import CareDocument, build_care_documents
+from floramigo.pcd.pcd_snippets import get_relevant_snippets
+
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+BACKENDS = ("keyword", "bm25", "vector")
+
+
+class KeywordRetriever:
+	name = "keyword"
+
+	def __init__(self, documents: list[CareDocument]):
+		self.by_text = {document.text: document for document in documents}
+
+	def search(self, query: str, k: int, plant: str | None = None) -> list[CareDocument]:
+		results = [self.by_text[text] for text in get_relevant_snippets(query, plant) if text in self.by_text]
+		return results[:k]
+
+
+def synthetic_documents(count: int, seed: int = 11) -> list[CareDocument]:
+	# Mostly filler vocabulary with a few care terms per document, so postings lists
+	# grow the way they would in a real corpus rather than every term matching every document.
+	rng = random.Random(seed)
+	care_words = (
+		"water soil light humidity leaves roots pot drainage fertilizer repot prune mist bright shade "
+		"window stem growth bloom pest mite aphid yellow brown droop wilt spot sun cold warm dry wet"
+	).split()
+	filler = [f"term{index}" for index in range(max(1000, count))]
+	return [
+		CareDocument(
+			doc_id=f"synthetic:{index}",
+			text=" ".join(rng.choices(filler, k=15) + rng.choices(care_words, k=3)),
+			source="synthetic",
+		)
+		for index in range(count)
+	]
+
+
+def load_queries(path: Path) -> list[dict]:
+	with open(path, "r", encoding="utf-8") as handle:
+		return json.load(handle)
+
+
+def build(backend: str, documents: list[CareDocument]):
+	if backend == "keyword":
+		return KeywordRetriever(documents)
+	if backend == "vector":
+		return VectorRetriever(documents)
+	return BM25Retriever(documents)
+
+
+def latency_summary(samples: list[float]) -> dict:
+	return {
+		"latency_p50_us": round(percentile(samples, 0.5) * 1e6, 1),
+		"latency_p95_us": round(percentile(samples, 0.95) * 1e6, 1),
+		"latency_p99_us": round(percentile(samples, 0.99) * 1e6, 1),
+	}
+
+
+def score(ranked: list[str], relevant: set[str], k: int) -> tuple[float, float]:
+	recall = len(set(ranked[:k]) & relevant) / len(relevant)
+	reciprocal_rank = next((1 / rank for rank, doc_id in enumerate(ranked[:k], start=1) if doc_id in relevant), 0.0)
+	return recall, reciprocal_rank
+
+
+def evaluate(retriever, queries: list[dict], k: int, repeat: int) -> dict:
+	by_category: dict[str, dict[str, list[float]]] = defaultdict(lambda: {"recall": [], "rr": [], "samples": []})
+	misses: list[str] = []
+	for row in queries:
+		ranked = [document.doc_id for document in retriever.search(row["query"], k, plant=row.get("plant"))]
+		recall, reciprocal_rank = score(ranked, set(row["relevant"]), k)
+		bucket = by_category[row.get("category", "uncategorized")]
+		bucket["recall"].append(recall)
+		bucket["rr"].append(reciprocal_rank)
+		if reciprocal_rank == 0:
+			misses.append(row["query"])
+
+	for _ in range(repeat):
+		for row in queries:
+			started = time.perf_counter()
+			retriever.search(row["query"], k, plant=row.get("plant"))
+			by_category[row.get("category", "uncategorized")]["samples"].append(time.perf_counter() - started)
+
+	def summarize(buckets: list[dict[str, list[float]]]) -> dict:
+		recalls = [value for bucket in buckets for value in bucket["recall"]]
+		ranks = [value for bucket in buckets for value in bucket["rr"]]
+		samples = [value for bucket in buckets for value in bucket["samples"]]
+		return {
+			"queries": len(recalls),
+			f"recall@{k}": round(sum(recalls) / len(recalls), 4),
+			"mrr": round(sum(ranks) / len(ranks), 4),
+			**latency_summary(samples),
+		}
+
+	return {
+		**summarize(list(by_category.values())),
+		"categories": {name: summarize([bucket]) for name, bucket in sorted(by_category.items())},
+		"misses": misses,
+	}
+
+
+def pipeline_latency(retriever, queries: list[dict], repeat: int) -> dict:
+	# Times retrieve_care_tips as the orchestrator calls it, with the result cache cold and warm.
+	cold: list[float] = []
+	warm: list[float] = []
+	with patch.object(rag_pipeline, "retriever", retriever), patch.object(rag_pipeline, "refresh_retriever", lambda force=False: False):
+		for _ in range(repeat):
+			for row in queries:
+				rag_pipeline.clear_retrieval_cache()
+				for samples in (cold, warm):
+					started = time.perf_counter()
+					rag_pipeline.retrieve_care_tips(row["query"], row.get("plant"))
+					samples.append(time.perf_counter() - started)
+	rag_pipeline.clear_retrieval_cache()
+	return {"cold": latency_summary(cold), "warm": latency_summary(warm)}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Benchmark care-tip retrievers.")
+	parser.add_argument("--queries", type=Path, default=DATA_DIR / "retrieval_queries.json")
+	parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+	parser.add_argument("--k", type=int, default=5)
+	parser.add_argument("--repeat", type=int, default=50)
+	parser.add_argument("--synthetic", type=int, default=0, help="Extra generated documents to add to the corpus.")
+	parser.add_argument("--output", type=Path, default=None, help="Also write the JSON report to this file.")
+	args = parser.parse_args()
+
+	documents = build_care_documents() + synthetic_documents(args.synthetic)
+	queries = load_queries(args.queries)
+	report = {"corpus_size": len(documents), "queries": len(queries), "k": args.k, "backends": {}}
+	for backend in args.backends:
+		started = time.perf_counter()
+		retriever = build(backend, documents)
+		build_seconds = time.perf_counter() - started
+		result = {"build_ms": round(build_seconds * 1000, 1), **evaluate(retriever, queries, args.k, args.repeat)}
+		if backend != "keyword":
+			result["retrieve_care_tips"] = pipeline_latency(retriever, queries, args.repeat)
+		report["backends"][backend] = result
+
+	output = json.dumps(report, indent=2)
+	print(output)
+	if args.output:
+		args.output.write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+	main()
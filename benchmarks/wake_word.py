@@ -0,0 +1,320 @@
+"""Wake word detector benchmark: false accepts, false rejects, detection latency, and CPU cost.
+
+	python -m benchmarks.wake_word
+	python -m benchmarks.wake_word --fixtures recordings/
+
+With no ``--fixtures`` the clips are synthesized: a small formant synthesizer speaks the wake
+phrase and a set of confusable phrases ("hey google", "flamingo", "amigo", ...) with varied pitch,
+tempo, vocal tract length, and background noise, alongside non-speech noise. A recorded fixture
+directory holds 16 kHz mono 16-bit WAV files in ``enroll/``, ``positive/`` and ``negative/``.
+Enrollment clips build the templates; positives must trigger the detector and negatives must
+not. Every clip is also streamed through ``KeywordSpotter.feed`` in 1024-sample chunks, as the
+voice client does, to measure how long after the phrase ends the detector fires and how much CPU
+each chunk costs.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+from floramigo.voice.wake_word import SAMPLE_RATE, KeywordSpotter
+
+CHUNK = 1024
+WAKE_PHRASE = "h eh iy f l ao r aa m iy g ow"
+CONFUSABLE_PHRASES = {
+	"hey google": "h eh iy g uw g ah l",
+	"hey there": "h eh iy th eh r",
+	"flamingo": "f l ah m ih n g ow",
+	"amigo": "ah m iy g ow",
+	"hello flora": "h ah l ow f l ao r ah",
+	"tomorrow": "t ah m aa r ow",
+	"more water": "m ao r w aa t er",
+	"water the plant": "w aa t er th ah p l ae n t",
+	"is it dry": "ih s ih t d r aa iy",
+	"good morning": "g uh d m ao r n ih ng",
+}
+# Formant targets in Hz, relative voicing, and noise band for fricatives and bursts.
+VOWELS = {
+	"iy": (270, 2290, 3010),
+	"ih": (390, 1990, 2550),
+	"eh": (530, 1840, 2480),
+	"ae": (660, 1720, 2410),
+	"aa": (730, 1090, 2440),
+	"ao": (570, 840, 2410),
+	"ah": (520, 1190, 2390),
+	"uh": (440, 1020, 2240),
+	"uw": (300, 870, 2240),
+	"ow": (450, 900, 2300),
+	"er": (490, 1350, 1690),
+}
+SONORANTS = {
+	"l": ((360, 1300, 2700), 0.6),
+	"r": ((420, 1300, 1600), 0.6),
+	"w": ((300, 700, 2200), 0.5),
+	"m": ((250, 1100, 2200), 0.3),
+	"n": ((250, 1600, 2600), 0.3),
+	"ng": ((250, 2000, 2700), 0.3),
+}
+FRICATIVES = {"h": (400, 4000, 0.25), "f": (1500, 7500, 0.12), "s": (4000, 7800, 0.3), "th": (1400, 7000, 0.08)}
+STOPS = {"p": (500, 3000), "b": (300, 2000), "t": (3000, 7000), "d": (2000, 5000), "k": (1500, 4000), "g": (1000, 3000)}
+DURATIONS = {"vowel": 110, "sonorant": 70, "fricative": 90, "stop": 70}
+
+
+class Voice:
+	def __init__(self, rng: random.Random):
+		self.f0 = rng.uniform(95, 220)
+		self.tract = rng.uniform(0.9, 1.12)
+		self.tempo = rng.uniform(0.9, 1.15)
+
+	def vary(self, rng: random.Random) -> "Voice":
+		# The same speaker on another attempt: small pitch, tempo, and articulation changes.
+		voice = Voice.__new__(Voice)
+		voice.f0 = self.f0 * rng.uniform(0.92, 1.08)
+		voice.tract = self.tract * rng.uniform(0.98, 1.02)
+		voice.tempo = self.tempo * rng.uniform(0.85, 1.15)
+		return voice
+
+
+def _band_noise(length: int, low: float, high: float, rng: np.random.Generator) -> np.ndarray:
+	spectrum = np.fft.rfft(rng.standard_normal(length))
+	freqs = np.fft.rfftfreq(length, 1.0 / SAMPLE_RATE)
+	spectrum[(freqs < low) | (freqs > high)] = 0
+	noise = np.fft.irfft(spectrum, length)
+	return noise / (np.abs(noise).max() + 1e-9)
+
+
+def synthesize(phones: str, voice: Voice, seed: int = 0) -> np.ndarray:
+	rng = random.Random(seed)
+	noise_rng = np.random.default_rng(seed)
+	segments = []
+	for phone in phones.split():
+		kind = "vowel" if phone in VOWELS else "sonorant" if phone in SONORANTS else "fricative" if phone in FRICATIVES else "stop"
+		duration = DURATIONS[kind] * rng.uniform(0.85, 1.15) / voice.tempo
+		segments.append((phone, kind, duration))
+	total_ms = int(sum(duration for _, _, duration in segments)) + 1
+	ms = np.arange(total_ms, dtype=np.float64)
+	centers, formants = [], []
+	voicing = np.zeros(total_ms)
+	noise_parts = []
+	start = 0.0
+	for phone, kind, duration in segments:
+		span = slice(int(start), int(start + duration))
+		if kind in ("vowel", "sonorant"):
+			target, level = (VOWELS[phone], 1.0) if kind == "vowel" else SONORANTS[phone]
+			centers.append(start + duration / 2)
+			formants.append([value * voice.tract * rng.uniform(0.96, 1.04) for value in target])
+			voicing[span] = level
+		elif kind == "fricative":
+			low, high, level = FRICATIVES[phone]
+			noise_parts.append((span, low, high, level))
+			if phone == "h":
+				voicing[span] = 0.05
+		else:
+			low, high = STOPS[phone]
+			# Closure, then a short release burst.
+			burst = slice(int(start + duration * 0.7), int(start + duration))
+			noise_parts.append((burst, low, high, 0.35))
+		start += duration
+	formants = np.asarray(formants)
+	tracks = [np.interp(ms, centers, formants[:, index]) for index in range(3)]
+	kernel = np.ones(12) / 12
+	voicing = np.convolve(voicing, kernel, mode="same")
+
+	length = int(total_ms * SAMPLE_RATE / 1000)
+	t_ms = np.arange(length) * 1000.0 / SAMPLE_RATE
+	f0 = voice.f0 * (1.1 - 0.2 * t_ms / t_ms[-1]) * (1 + 0.01 * np.sin(2 * np.pi * 5 * t_ms / 1000))
+	phase = np.cumsum(2 * np.pi * f0 / SAMPLE_RATE)
+	# Harmonics weighted by a formant envelope evaluated at control rate, then interpolated.
+	f0_ms = np.interp(ms, t_ms, f0)
+	signal = np.zeros(length)
+	for harmonic in range(1, int(5000 / voice.f0) + 1):
+		freq = harmonic * f0_ms
+		envelope = sum(
+			gain * np.exp(-0.5 * ((freq - track) / width) ** 2)
+			for track, gain, width in zip(tracks, (1.0, 0.6, 0.3), (90, 110, 150))
+		)
+		amplitude = np.interp(t_ms, ms, envelope * voicing) / harmonic**0.5
+		signal += amplitude * np.sin(harmonic * phase)
+	signal /= np.abs(signal).max() + 1e-9
+	for span, low, high, level in noise_parts:
+		begin, end = int(span.start * SAMPLE_RATE / 1000), int(span.stop * SAMPLE_RATE / 1000)
+		if end - begin > 16:
+			ramp = np.hanning(end - begin)
+			signal[begin:end] += level * ramp * _band_noise(end - begin, low, high, noise_rng)
+	return (0.3 * signal / (np.abs(signal).max() + 1e-9)).astype(np.float32)
+
+
+def background(seconds: float, level: float, seed: int) -> np.ndarray:
+	rng = np.random.default_rng(seed)
+	length = int(seconds * SAMPLE_RATE)
+	# Pink-ish room noise: white noise with a 1/sqrt(f) spectrum.
+	spectrum = np.fft.rfft(rng.standard_normal(length))
+	spectrum /= np.sqrt(np.maximum(np.fft.rfftfreq(length, 1.0 / SAMPLE_RATE), 20.0))
+	noise = np.fft.irfft(spectrum, length)
+	return (level * noise / (np.sqrt(np.mean(noise**2)) + 1e-12)).astype(np.float32)
+
+
+def place(clip: np.ndarray, lead: float = 0.6, tail: float = 0.8, noise_level: float = 0.003, seed: int = 0) -> tuple[np.ndarray, int]:
+	begin = int(lead * SAMPLE_RATE)
+	audio = background(lead + len(clip) / SAMPLE_RATE + tail, noise_level, seed)
+	audio[begin : begin + len(clip)] += clip
+	return audio, begin + len(clip)
+
+
+def non_speech(kind: str, seed: int) -> np.ndarray:
+	rng = np.random.default_rng(seed)
+	if kind == "knock":
+		clip = np.zeros(int(0.6 * SAMPLE_RATE), dtype=np.float32)
+		for offset in (0.0, 0.2, 0.4):
+			begin = int(offset * SAMPLE_RATE)
+			clip[begin : begin + 800] += 0.4 * np.exp(-np.arange(800) / 120) * rng.standard_normal(800)
+		return clip
+	if kind == "music":
+		t = np.arange(int(1.5 * SAMPLE_RATE)) / SAMPLE_RATE
+		chord = sum(np.sin(2 * np.pi * base * t) for base in rng.choice([220, 277, 330, 392, 440], 3, replace=False))
+		return (0.1 * chord).astype(np.float32)
+	return background(1.2, 0.05, seed)
+
+
+def synthetic_fixtures(seed: int = 7, positives: int = 30, speakers: int = 6) -> dict[str, list]:
+	rng = random.Random(seed)
+	user = Voice(rng)
+	fixtures: dict[str, list] = {"enroll": [], "positive": [], "negative": []}
+	for index in range(3):
+		fixtures["enroll"].append(("enroll", place(synthesize(WAKE_PHRASE, user.vary(rng), seed=index), seed=index)))
+	for index in range(positives):
+		noise = rng.choice((0.002, 0.004, 0.008))
+		audio = place(synthesize(WAKE_PHRASE, user.vary(rng), seed=100 + index), noise_level=noise, seed=100 + index)
+		fixtures["positive"].append(("hey floramigo", audio))
+	voices = [user] + [Voice(rng) for _ in range(speakers - 1)]
+	for name, phones in CONFUSABLE_PHRASES.items():
+		for index, voice in enumerate(voices):
+			audio = place(synthesize(phones, voice.vary(rng), seed=1000 + index), seed=1000 + index)
+			fixtures["negative"].append((name, audio))
+	for index, kind in enumerate(("knock", "music", "noise") * 3):
+		fixtures["negative"].append((kind, place(non_speech(kind, 2000 + index), seed=2000 + index)))
+	return fixtures
+
+
+def read_wav(path: Path) -> np.ndarray:
+	with wave.open(str(path), "rb") as handle:
+		if handle.getframerate() != SAMPLE_RATE or handle.getnchannels() != 1 or handle.getsampwidth() != 2:
+			raise ValueError(f"{path} must be {SAMPLE_RATE} Hz mono 16-bit PCM.")
+		return np.frombuffer(handle.readframes(handle.getnframes()), dtype=np.int16)
+
+
+def recorded_fixtures(directory: Path) -> dict[str, list]:
+	fixtures: dict[str, list] = {}
+	for split in ("enroll", "positive", "negative"):
+		# A recorded clip's phrase end is unknown, so latency is measured from the clip's end.
+		fixtures[split] = [
+			(path.stem, (audio, len(audio)))
+			for path in sorted((directory / split).glob("*.wav"))
+			for audio in [read_wav(path)]
+		]
+	return fixtures
+
+
+def stream(spotter: KeywordSpotter, audio: np.ndarray) -> tuple[int | None, list[float]]:
+	spotter.reset()
+	costs = []
+	hit_at = None
+	for begin in range(0, len(audio), CHUNK):
+		started = time.perf_counter()
+		hit = spotter.feed(audio[begin : begin + CHUNK])
+		costs.append(time.perf_counter() - started)
+		if hit and hit_at is None:
+			hit_at = min(len(audio), begin + CHUNK)
+	if hit_at is None and spotter.flush():
+		hit_at = len(audio)
+	return hit_at, costs
+
+
+def evaluate(fixtures: dict[str, list]) -> dict:
+	spotter = KeywordSpotter()
+	for _, (audio, _) in fixtures["enroll"]:
+		spotter.enroll(audio)
+
+	latencies, chunk_costs = [], []
+	misses = []
+	for name, (audio, phrase_end) in fixtures["positive"]:
+		hit_at, costs = stream(spotter, audio)
+		chunk_costs.extend(costs)
+		if hit_at is None:
+			misses.append(name)
+		else:
+			latencies.append(max(0, hit_at - phrase_end) / SAMPLE_RATE * 1000)
+
+	false_accepts = []
+	negative_seconds = 0.0
+	spotter.stats = dict.fromkeys(spotter.stats, 0)
+	for name, (audio, _) in fixtures["negative"]:
+		negative_seconds += len(audio) / SAMPLE_RATE
+		hit_at, costs = stream(spotter, audio)
+		chunk_costs.extend(costs)
+		if hit_at is not None:
+			false_accepts.append(name)
+
+	silence = background(60.0, 0.003, seed=1)
+	spotter.stats = dict.fromkeys(spotter.stats, 0)
+	_, silence_costs = stream(spotter, silence)
+	silence_stats = dict(spotter.stats)
+
+	chunk_us = sorted(cost * 1e6 for cost in chunk_costs)
+	return {
+		"templates": len(spotter.templates),
+		"threshold": round(spotter.threshold, 4),
+		"positives": len(fixtures["positive"]),
+		"false_rejects": len(misses),
+		"false_reject_rate": round(len(misses) / max(1, len(fixtures["positive"])), 4),
+		"negatives": len(fixtures["negative"]),
+		"false_accepts": len(false_accepts),
+		"false_accept_rate": round(len(false_accepts) / max(1, len(fixtures["negative"])), 4),
+		"false_accepts_per_hour": round(len(false_accepts) / negative_seconds * 3600, 2),
+		"false_accepted": sorted(set(false_accepts)),
+		# Offline clip scores: the gap between these two is the room the threshold has to sit in.
+		"scores": {
+			"worst_positive": round(max(spotter.score(audio) for _, (audio, _) in fixtures["positive"]), 4),
+			"best_negative": round(min(spotter.score(audio) for _, (audio, _) in fixtures["negative"]), 4),
+		},
+		"latency_ms": {
+			"p50": round(statistics.median(latencies), 1) if latencies else None,
+			"max": round(max(latencies), 1) if latencies else None,
+		},
+		"chunk_cost_us": {
+			"p50": round(chunk_us[len(chunk_us) // 2], 1),
+			"p99": round(chunk_us[int(len(chunk_us) * 0.99)], 1),
+			"max": round(chunk_us[-1], 1),
+		},
+		"silence": {
+			"seconds": 60,
+			"evaluations": silence_stats["evaluations"],
+			"chunk_cost_us_mean": round(sum(silence_costs) / len(silence_costs) * 1e6, 1),
+		},
+	}
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Benchmark the on-device wake word detector.")
+	parser.add_argument("--fixtures", type=Path, default=None, help="Directory with enroll/, positive/ and negative/ WAV files.")
+	parser.add_argument("--seed", type=int, default=7, help="Seed for synthesized fixtures.")
+	parser.add_argument("--output", type=Path, default=None, help="Also write the JSON report to this file.")
+	args = parser.parse_args()
+
+	fixtures = recorded_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures(args.seed)
+	report = {"fixtures": str(args.fixtures) if args.fixtures else f"synthetic (seed {args.seed})", **evaluate(fixtures)}
+	output = json.dumps(report, indent=2)
+	print(output)
+	if args.output:
+		args.output.write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+	main()
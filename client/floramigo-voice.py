@@ -3,7 +3,7 @@
 Floramigo Voice Chatbot with Wake Word Detection
 
 Features:
-- Wake word detection ("Hey Floramigo", "Hey Flora")
+- On-device wake word detection ("Hey Floramigo") from enrolled samples
 - Speech-to-text using OpenAI Whisper
 - LLM-powered responses
 - Text-to-speech using OpenAI TTS
@@ -11,6 +11,7 @@ Features:
 - Multi-turn conversation support
 """
 
+import io
 import os
 import sys
 import time
@@ -18,7 +19,6 @@ import wave
 import json
 import pyaudio
 import requests
-import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
@@ -32,9 +32,15 @@ except ImportError:
     print("Run: pip install openai numpy pyaudio")
     sys.exit(1)
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from floramigo.voice.capture import AudioCapture, FileInputDevice, encode_wav
+from floramigo.voice.wake_word import KeywordSpotter, trim_silence
+
+WAKE_TEMPLATES = Path(os.getenv("FLORAMIGO_WAKE_TEMPLATES", Path.home() / ".floramigo" / "wake_word.npz"))
+
 
 class WakeWordDetector:
-    """Detects wake words using fuzzy string matching."""
+    """Detects wake words in transcripts using fuzzy string matching (used until a wake word is enrolled)."""
     
     def __init__(self, wake_words: List[str] = None, threshold: float = 0.75):
         """
@@ -97,88 +103,82 @@ class WakeWordDetector:
 class AudioEngine:
     """Handles audio recording and playback."""
     
-    def __init__(self, sample_rate: int = 16000, chunk_size: int = 1024):
-        """Initialize audio engine."""
+    def __init__(self, sample_rate: int = 16000, chunk_size: int = 1024, device=None,
+                 buffer_seconds: float = 30.0, preroll: float = 0.3):
+        """
+        Initialize audio engine.
+        
+        Args:
+            device: Input stream to capture from (defaults to the microphone)
+            buffer_seconds: Seconds of recent audio kept in memory
+            preroll: Seconds of audio kept from before a recording starts
+        """
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
         self.audio = pyaudio.PyAudio()
         self.is_recording = False
+        # One input stream for the whole session; recordings are cut from its ring buffer
+        self.capture = AudioCapture(
+            device or self.open_input(), sample_rate, chunk_size, buffer_seconds, preroll
+        ).start()
         
         print(f"🎤 Audio engine initialized ({sample_rate}Hz)")
     
-    def record_audio(self, duration: float = 5.0, silence_threshold: int = 500, 
-                    silence_duration: float = 2.0) -> str:
+    def open_input(self):
+        """Open a 16-bit mono microphone stream."""
+        return self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            frames_per_buffer=self.chunk_size
+        )
+    
+    def record_samples(self, duration: float = 5.0, silence_threshold: int = 500,
+                       silence_duration: float = 2.0, start: Optional[int] = None) -> np.ndarray:
         """
-        Record audio to a temporary file.
+        Record audio into memory.
         
         Args:
             duration: Maximum recording duration in seconds
             silence_threshold: Amplitude threshold to detect silence
             silence_duration: Seconds of silence before stopping
+            start: Capture position to record from (defaults to now, with pre-roll)
             
         Returns:
-            Path to recorded WAV file
+            Recorded 16-bit samples
         """
         print(f"🎙️  Recording... (speak now, {duration}s max)")
         
-        stream = self.audio.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=self.sample_rate,
-            input=True,
-            frames_per_buffer=self.chunk_size
-        )
-        
-        frames = []
-        silent_chunks = 0
-        silence_chunks_limit = int((self.sample_rate / self.chunk_size) * silence_duration)
-        max_chunks = int((self.sample_rate / self.chunk_size) * duration)
-        
         self.is_recording = True
-        
         try:
-            for _ in range(max_chunks):
-                if not self.is_recording:
-                    break
-                
-                data = stream.read(self.chunk_size, exception_on_overflow=False)
-                frames.append(data)
-                
-                # Check for silence
-                audio_data = np.frombuffer(data, dtype=np.int16)
-                if np.abs(audio_data).mean() < silence_threshold:
-                    silent_chunks += 1
-                    if silent_chunks > silence_chunks_limit:
-                        print("   (silence detected, stopping)")
-                        break
-                else:
-                    silent_chunks = 0
-        
+            samples = self.capture.record_utterance(
+                start, duration, silence_threshold, silence_duration,
+                preroll=0.0 if start is not None else None
+            )
         finally:
-            stream.stop_stream()
-            stream.close()
             self.is_recording = False
         
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        temp_path = temp_file.name
-        temp_file.close()
-        
-        with wave.open(temp_path, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(b''.join(frames))
+        print(f"✓ Recording complete ({len(samples) / self.sample_rate:.1f}s)")
+        return samples
+    
+    def record_audio(self, duration: float = 5.0, silence_threshold: int = 500, 
+                    silence_duration: float = 2.0, start: Optional[int] = None) -> bytes:
+        """
+        Record audio as an in-memory WAV.
         
-        print(f"✓ Recording complete ({len(frames)} chunks)")
-        return temp_path
+        Returns:
+            WAV file bytes
+        """
+        samples = self.record_samples(duration, silence_threshold, silence_duration, start)
+        return encode_wav(samples, self.sample_rate)
     
-    def play_audio(self, audio_file: str):
-        """Play audio file through speakers."""
+    def play_audio(self, audio: bytes):
+        """Play WAV bytes through speakers."""
         print(f"🔊 Playing audio...")
         
         try:
-            with wave.open(audio_file, 'rb') as wf:
+            with wave.open(io.BytesIO(audio), 'rb') as wf:
                 stream = self.audio.open(
                     format=self.audio.get_format_from_width(wf.getsampwidth()),
                     channels=wf.getnchannels(),
@@ -198,23 +198,33 @@ class AudioEngine:
     
     def cleanup(self):
         """Clean up audio resources."""
+        self.capture.stop()
         self.audio.terminate()
 
 
 class VoiceChatbot:
     """Main voice chatbot orchestrator."""
     
-    def __init__(self, api_url: str = "http://localhost:8000"):
+    def __init__(self, api_url: str = "http://localhost:8000", wake_templates: Path = WAKE_TEMPLATES,
+                 input_device=None):
         """
         Initialize voice chatbot.
         
         Args:
             api_url: Base URL for Floramigo API
+            wake_templates: Enrolled wake word samples for on-device detection
+            input_device: Input stream to use instead of the microphone
         """
         # Initialize components
         self.api_url = api_url
         self.wake_detector = WakeWordDetector()
-        self.audio_engine = AudioEngine()
+        self.audio_engine = AudioEngine(device=input_device)
+        self.wake_templates = Path(wake_templates)
+        self.spotter = KeywordSpotter.load(self.wake_templates) if self.wake_templates.exists() else None
+        if self.spotter:
+            print(f"✓ Wake word templates loaded ({len(self.spotter.templates)} samples)")
+        else:
+            print("⚠️  No wake word enrolled; run with --enroll 3 to detect it on-device")
         
         # OpenAI client
         api_key = os.getenv("OPENAI_API_KEY")
@@ -244,12 +254,12 @@ class VoiceChatbot:
             print(f"Note: Could not fetch sensor data: {e}")
         return None
     
-    def speech_to_text(self, audio_file: str) -> Optional[str]:
+    def speech_to_text(self, audio: bytes) -> Optional[str]:
         """
         Convert speech to text using OpenAI Whisper.
         
         Args:
-            audio_file: Path to audio file
+            audio: WAV file bytes
             
         Returns:
             Transcribed text or None if failed
@@ -260,12 +270,12 @@ class VoiceChatbot:
         
         try:
             print("🔄 Transcribing speech...")
-            with open(audio_file, 'rb') as audio:
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio,
-                    response_format="text"
-                )
+            # Uploaded straight from memory; the filename only tells the API the format
+            transcript = self.client.audio.transcriptions.create(
+                model="whisper-1",
+                file=("speech.wav", audio, "audio/wav"),
+                response_format="text"
+            )
             
             text = transcript.strip() if isinstance(transcript, str) else transcript.text.strip()
             print(f"📝 You said: \"{text}\"")
@@ -326,7 +336,7 @@ class VoiceChatbot:
         
         return "I'm having trouble connecting right now. Please check if the API is running."
     
-    def text_to_speech(self, text: str) -> Optional[str]:
+    def text_to_speech(self, text: str) -> Optional[bytes]:
         """
         Convert text to speech using OpenAI TTS.
         
@@ -334,7 +344,7 @@ class VoiceChatbot:
             text: Text to convert
             
         Returns:
-            Path to audio file or None
+            WAV file bytes or None
         """
         if not self.client:
             return None
@@ -344,22 +354,47 @@ class VoiceChatbot:
             response = self.client.audio.speech.create(
                 model="tts-1",
                 voice="alloy",  # Warm, friendly voice
-                input=text
+                input=text,
+                response_format="wav"  # Plays directly from memory, no decoder needed
             )
             
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
-            temp_path = temp_file.name
-            
-            response.stream_to_file(temp_path)
-            
             print(f"✓ Speech generated")
-            return temp_path
+            return response.content
         
         except Exception as e:
             print(f"Error generating speech: {e}")
             return None
     
+    def enroll_wake_word(self, count: int = 3):
+        """Record samples of the wake phrase and save them as detection templates."""
+        spotter = KeywordSpotter()
+        phrase = self.wake_detector.wake_words[0]
+        for take in range(1, count + 1):
+            input(f"Press Enter, then say '{phrase}' ({take}/{count})...")
+            samples = self.audio_engine.record_samples(duration=2.5, silence_duration=1.0)
+            try:
+                spotter.enroll(samples)
+            except ValueError as e:
+                print(f"   {e} Skipping this take.")
+        if not spotter.templates:
+            print("No usable samples recorded; nothing saved.")
+            return
+        spotter.save(self.wake_templates)
+        self.spotter = spotter
+        print(f"✓ Saved {len(spotter.templates)} samples to {self.wake_templates} (threshold {spotter.threshold:.3f})")
+    
+    def wait_for_wake_word(self) -> Optional[int]:
+        """Feed captured audio through the on-device detector; return the capture position of a hit."""
+        capture = self.audio_engine.capture
+        position = capture.position()
+        self.spotter.reset()
+        while self.is_running and capture.running:
+            samples, position = capture.read_since(position)
+            if len(samples) and self.spotter.feed(samples):
+                print(f"✓ Wake word detected (score {self.spotter.last_score:.3f})")
+                return position
+        return None
+    
     def listen_for_wake_word(self):
         """Continuously listen for wake word."""
         print("\n🌿 Floramigo is ready!")
@@ -368,17 +403,23 @@ class VoiceChatbot:
         
         while self.is_running:
             try:
-                # Record short audio clip
-                audio_file = self.audio_engine.record_audio(duration=3.0)
+                if self.spotter:
+                    # Speech-to-text only runs after a local hit.
+                    hit = self.wait_for_wake_word()
+                    if hit is None:
+                        break
+                    print("\n🌿 Floramigo: I'm listening! What would you like to know?\n")
+                    # Record from the moment the wake word fired, so nothing said since is lost
+                    self.handle_conversation(start=hit)
+                    print(f"\n   Say '{self.wake_detector.wake_words[0]}' when you need me again\n")
+                    continue
                 
+                # No enrolled templates: transcribe short clips, but skip the ones without speech
+                samples = self.audio_engine.record_samples(duration=3.0)
+                if len(trim_silence(samples.astype(np.float32) / 32768.0)) < self.audio_engine.sample_rate // 4:
+                    continue
                 # Transcribe
-                text = self.speech_to_text(audio_file)
-                
-                # Clean up
-                try:
-                    os.unlink(audio_file)
-                except:
-                    pass
+                text = self.speech_to_text(encode_wav(samples, self.audio_engine.sample_rate))
                 
                 if text and self.wake_detector.detect(text):
                     # Wake word detected!
@@ -392,14 +433,13 @@ class VoiceChatbot:
                 print(f"Error: {e}")
                 time.sleep(0.5)
     
-    def handle_conversation(self):
-        """Handle a single conversation turn."""
+    def handle_conversation(self, start: Optional[int] = None):
+        """Handle a single conversation turn, optionally recording from a capture position."""
         # Record user question
-        audio_file = self.audio_engine.record_audio(duration=10.0, silence_duration=2.5)
+        audio = self.audio_engine.record_audio(duration=10.0, silence_duration=2.5, start=start)
         
         # Transcribe
-        user_message = self.speech_to_text(audio_file)
-        os.unlink(audio_file)
+        user_message = self.speech_to_text(audio)
         
         if not user_message or len(user_message.strip()) < 3:
             print("   (no speech detected)")
@@ -411,7 +451,6 @@ class VoiceChatbot:
             farewell_audio = self.text_to_speech("Goodbye! I'll be here if you need me.")
             if farewell_audio:
                 self.audio_engine.play_audio(farewell_audio)
-                os.unlink(farewell_audio)
             return
         
         # Get AI response
@@ -425,10 +464,9 @@ class VoiceChatbot:
         print(f"\n🌿 Floramigo: {ai_response}\n")
         
         # Speak response
-        audio_file = self.text_to_speech(ai_response)
-        if audio_file:
-            self.audio_engine.play_audio(audio_file)
-            os.unlink(audio_file)
+        speech = self.text_to_speech(ai_response)
+        if speech:
+            self.audio_engine.play_audio(speech)
     
     def interactive_mode(self):
         """Run in interactive wake word listening mode."""
@@ -470,8 +508,15 @@ def main():
                        help="Name of your plant")
     parser.add_argument("--test-audio", action="store_true",
                        help="Test audio recording and playback")
+    parser.add_argument("--enroll", type=int, default=0, metavar="N",
+                       help="Record N samples of the wake phrase for on-device detection")
+    parser.add_argument("--wake-templates", type=Path, default=WAKE_TEMPLATES,
+                       help="File holding the enrolled wake word samples")
+    parser.add_argument("--input-wav", type=Path, default=None,
+                       help="Read input from a 16 kHz mono WAV file instead of the microphone")
     
     args = parser.parse_args()
+    input_device = FileInputDevice(args.input_wav) if args.input_wav else None
     
     # Set environment variable
     if args.plant_name:
@@ -480,21 +525,23 @@ def main():
     # Test mode
     if args.test_audio:
         print("🎤 Testing audio system...")
-        engine = AudioEngine()
+        engine = AudioEngine(device=input_device)
         print("   Recording 3 seconds...")
-        audio_file = engine.record_audio(duration=3.0)
+        audio = engine.record_audio(duration=3.0)
         print(f"   Playing back...")
-        engine.play_audio(audio_file)
-        os.unlink(audio_file)
+        engine.play_audio(audio)
         engine.cleanup()
         print("✓ Audio test complete")
         return
     
     # Create chatbot
-    bot = VoiceChatbot(api_url=args.api_url)
+    bot = VoiceChatbot(api_url=args.api_url, wake_templates=args.wake_templates, input_device=input_device)
     
     # Run appropriate mode
-    if args.single:
+    if args.enroll:
+        bot.enroll_wake_word(args.enroll)
+        bot.cleanup()
+    elif args.single:
         bot.single_question_mode()
     else:
         bot.interactive_mode()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import base64
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from floramigo.core.config import settings
+
+
+class InvalidCursor(ValueError):
+	pass
+
+
+def to_epoch(value: str | float | None) -> float | None:
+	# Accepts epoch seconds or an ISO 8601 timestamp, naive timestamps being local time like the alerts themselves.
+	if value is None or value == "":
+		return None
+	try:
+		return float(value)
+	except ValueError:
+		return datetime.fromisoformat(value).timestamp()
+
+
+def encode_cursor(ts: float, row_id: int) -> str:
+	return base64.urlsafe_b64encode(f"{ts!r}:{row_id}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, int]:
+	try:
+		raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+		ts, row_id = raw.split(":")
+		return float(ts), int(row_id)
+	except (ValueError, UnicodeDecodeError) as exc:
+		raise InvalidCursor(f"Invalid cursor: {cursor!r}") from exc
+
+
+class AlertLog:
+	# Append-only alert history. Pages are read newest first by keyset on (ts, id); every filter
+	# has an index that ends in (ts, id), so a page is one index range scan whatever the table size.
+	SCHEMA = (
+		"""CREATE TABLE IF NOT EXISTS alert_log (
+			id INTEGER PRIMARY KEY AUTOINCREMENT,
+			ts REAL NOT NULL,
+			type TEXT NOT NULL,
+			severity TEXT NOT NULL,
+			device TEXT NOT NULL,
+			plant TEXT,
+			message TEXT NOT NULL
+		)""",
+		"CREATE INDEX IF NOT EXISTS alert_log_ts ON alert_log (ts, id)",
+		"CREATE INDEX IF NOT EXISTS alert_log_type_ts ON alert_log (type, ts, id)",
+		"CREATE INDEX IF NOT EXISTS alert_log_severity_ts ON alert_log (severity, ts, id)",
+		"CREATE INDEX IF NOT EXISTS alert_log_device_ts ON alert_log (device, ts, id)",
+	)
+	FILTERS = ("type", "severity", "device")
+
+	def __init__(self, path: Path | None = None, max_rows: int | None = None, timeout: float = 5.0):
+		self.path = Path(path or settings.alert_log_file)
+		self.max_rows = settings.alert_log_max_rows if max_rows is None else max_rows
+		self.timeout = timeout
+		self.local = threading.local()
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		conn = self._conn()
+		for statement in self.SCHEMA:
+			conn.execute(statement)
+
+	def _conn(self) -> sqlite3.Connection:
+		conn = getattr(self.local, "conn", None)
+		if conn is None:
+			conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			self.local.conn = conn
+		return conn
+
+	def append(self, alerts: list[dict], device: str | None = None, plant: str | None = None) -> None:
+		if not alerts:
+			return
+		rows = [
+			(
+				to_epoch(alert.get("timestamp")) or datetime.now().timestamp(),
+				alert["type"],
+				alert["severity"],
+				alert.get("device") or device or settings.device_id,
+				alert.get("plant", plant),
+				alert["message"],
+			)
+			for alert in alerts
+		]
+		conn = self._conn()
+		conn.execute("BEGIN IMMEDIATE")
+		try:
+			conn.executemany(
+				"INSERT INTO alert_log (ts, type, severity, device, plant, message) VALUES (?, ?, ?, ?, ?, ?)", rows
+			)
+			if self.max_rows:
+				# AUTOINCREMENT ids never repeat, so trimming by id keeps the newest max_rows rows.
+				last_id = conn.execute("SELECT MAX(id) FROM alert_log").fetchone()[0]
+				conn.execute("DELETE FROM alert_log WHERE id <= ?", (last_id - self.max_rows,))
+		except BaseException:
+			conn.execute("ROLLBACK")
+			raise
+		conn.execute("COMMIT")
+
+	def query(
+		self,
+		since: float | None = None,
+		type: str | None = None,
+		severity: str | None = None,
+		device: str | None = None,
+		limit: int = 100,
+		cursor: str | None = None,
+	) -> tuple[list[dict], str | None]:
+		clauses: list[str] = []
+		params: list = []
+		for column, value in zip(self.FILTERS, (type, severity, device)):
+			if value is not None:
+				clauses.append(f"{column} = ?")
+				params.append(value)
+		if since is not None:
+			clauses.append("ts >= ?")
+			params.append(since)
+		if cursor:
+			clauses.append("(ts, id) < (?, ?)")
+			params.extend(decode_cursor(cursor))
+		where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+		# One extra row tells whether another page exists without a COUNT over the whole match.
+		rows = self._conn().execute(
+			f"SELECT id, ts, type, severity, device, plant, message FROM alert_log {where} ORDER BY ts DESC, id DESC LIMIT ?",
+			(*params, limit + 1),
+		).fetchall()
+		page = rows[:limit]
+		alerts = [
+			{
+				"id": row_id,
+				"timestamp": datetime.fromtimestamp(ts).isoformat(),
+				"type": alert_type,
+				"severity": alert_severity,
+				"device": alert_device,
+				"plant": plant,
+				"message": message,
+			}
+			for row_id, ts, alert_type, alert_severity, alert_device, plant, message in page
+		]
+		next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(rows) > limit else None
+		return alerts, next_cursor
+
+	def count(self) -> int:
+		return self._conn().execute("SELECT COUNT(*) FROM alert_log").fetchone()[0]
+
+
+_alert_log: AlertLog | None = None
+_alert_log_lock = threading.Lock()
+
+
+def get_alert_log() -> AlertLog:
+	global _alert_log
+	if _alert_log is None:
+		with _alert_log_lock:
+			if _alert_log is None:
+				_alert_log = AlertLog()
+	return _alert_log
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+	"a an and are as at be but by can do does for from has have how i if in is it its me my no not of on or "
+	"our should so than that the their them then there these they this to too up was we what when where "
+	"which while who why will with you your".split()
+)
+
+
+def _stem(word: str) -> str:
+	if len(word) > 5 and word.endswith("ing"):
+		return word[:-3]
+	if len(word) > 4 and word.endswith("ies"):
+		return word[:-3] + "y"
+	if len(word) > 4 and word.endswith("ed"):
+		return word[:-2]
+	if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+		return word[:-1]
+	return word
+
+
+def tokenize(text: str) -> list[str]:
+	return [_stem(word) for word in _TOKEN_RE.findall((text or "").lower()) if word not in STOPWORDS]
+
+
+class BM25Index:
+	def __init__(self, k1: float = 1.5, b: float = 0.75):
+		self.k1 = k1
+		self.b = b
+		self.postings: dict[str, dict[str, int]] = {}
+		self.doc_lengths: dict[str, int] = {}
+		self.doc_terms: dict[str, tuple[str, ...]] = {}
+		self.total_length = 0
+
+	def __len__(self) -> int:
+		return len(self.doc_lengths)
+
+	def __contains__(self, doc_id: str) -> bool:
+		return doc_id in self.doc_lengths
+
+	def add(self, doc_id: str, tokens: list[str]) -> None:
+		if doc_id in self.doc_lengths:
+			self.remove(doc_id)
+		frequencies = Counter(tokens)
+		for term, frequency in frequencies.items():
+			self.postings.setdefault(term, {})[doc_id] = frequency
+		self.doc_terms[doc_id] = tuple(frequencies)
+		self.doc_lengths[doc_id] = len(tokens)
+		self.total_length += len(tokens)
+
+	def remove(self, doc_id: str) -> None:
+		length = self.doc_lengths.pop(doc_id, None)
+		if length is None:
+			return
+		self.total_length -= length
+		for term in self.doc_terms.pop(doc_id, ()):
+			postings = self.postings.get(term)
+			if postings is None:
+				continue
+			postings.pop(doc_id, None)
+			if not postings:
+				del self.postings[term]
+
+	def search(self, query_tokens: list[str], k: int = 5) -> list[tuple[str, float]]:
+		if not self.doc_lengths or k <= 0:
+			return []
+
+		count = len(self.doc_lengths)
+		avg_length = self.total_length / count
+		scores: dict[str, float] = {}
+		# Term-at-a-time scoring only touches postings of the query terms, so cost
+		# grows with matching documents rather than corpus size.
+		for term in set(query_tokens):
+			postings = self.postings.get(term)
+			if not postings:
+				continue
+			idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+			for doc_id, frequency in postings.items():
+				norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+				scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+		return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
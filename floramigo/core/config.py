@@ -15,10 +15,50 @@ DATA_DIR = ROOT_DIR / "data"
 LOG_DIR = ROOT_DIR / "logs"
 
 
+def _env_flag(name: str, default: str) -> bool:
+	return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_path(name: str) -> Path | None:
+	value = os.getenv(name)
+	return Path(value) if value else None
+
+
 @dataclass(frozen=True)
 class Settings:
 	openai_api_key: str | None = os.getenv("OPENAI_API_KEY")
 	openai_model: str = os.getenv("FLORAMIGO_OPENAI_MODEL", "gpt-4o-mini")
+	openai_model_light: str = os.getenv("FLORAMIGO_OPENAI_MODEL_LIGHT") or os.getenv("FLORAMIGO_OPENAI_MODEL", "gpt-4o-mini")
+	openai_model_heavy: str = os.getenv("FLORAMIGO_OPENAI_MODEL_HEAVY") or os.getenv("FLORAMIGO_OPENAI_MODEL", "gpt-4o-mini")
+	llm_light_max_tokens: int = int(os.getenv("FLORAMIGO_LLM_LIGHT_MAX_TOKENS", "150"))
+	llm_standard_max_tokens: int = int(os.getenv("FLORAMIGO_LLM_STANDARD_MAX_TOKENS", "350"))
+	llm_heavy_max_tokens: int = int(os.getenv("FLORAMIGO_LLM_HEAVY_MAX_TOKENS", "700"))
+	llm_light_max_score: int = int(os.getenv("FLORAMIGO_LLM_LIGHT_MAX_SCORE", "1"))
+	llm_heavy_min_score: int = int(os.getenv("FLORAMIGO_LLM_HEAVY_MIN_SCORE", "4"))
+	openai_base_url: str | None = os.getenv("FLORAMIGO_OPENAI_BASE_URL") or None
+	llm_tool_calling: bool = _env_flag("FLORAMIGO_LLM_TOOLS", "false")
+	llm_max_tool_rounds: int = int(os.getenv("FLORAMIGO_LLM_MAX_TOOL_ROUNDS", "3"))
+	llm_timeout: float = float(os.getenv("FLORAMIGO_LLM_TIMEOUT", "20"))
+	llm_max_retries: int = int(os.getenv("FLORAMIGO_LLM_MAX_RETRIES", "1"))
+	llm_max_workers: int = int(os.getenv("FLORAMIGO_LLM_MAX_WORKERS", "16"))
+	llm_hedge: bool = _env_flag("FLORAMIGO_LLM_HEDGE", "false")
+	llm_hedge_delay: float = float(os.getenv("FLORAMIGO_LLM_HEDGE_DELAY", "3"))
+	llm_hedge_min_samples: int = int(os.getenv("FLORAMIGO_LLM_HEDGE_MIN_SAMPLES", "20"))
+	llm_breaker_error_rate: float = float(os.getenv("FLORAMIGO_LLM_BREAKER_ERROR_RATE", "0.5"))
+	llm_breaker_latency: float = float(os.getenv("FLORAMIGO_LLM_BREAKER_LATENCY", "15"))
+	llm_breaker_window: int = int(os.getenv("FLORAMIGO_LLM_BREAKER_WINDOW", "20"))
+	llm_breaker_min_calls: int = int(os.getenv("FLORAMIGO_LLM_BREAKER_MIN_CALLS", "5"))
+	llm_breaker_cooldown: float = float(os.getenv("FLORAMIGO_LLM_BREAKER_COOLDOWN", "30"))
+	rate_limit_enabled: bool = _env_flag("FLORAMIGO_RATE_LIMIT", "true")
+	rate_limit_ask_rate: float = float(os.getenv("FLORAMIGO_RATE_LIMIT_ASK_RATE", "1"))
+	rate_limit_ask_burst: int = int(os.getenv("FLORAMIGO_RATE_LIMIT_ASK_BURST", "20"))
+	rate_limit_ingest_rate: float = float(os.getenv("FLORAMIGO_RATE_LIMIT_INGEST_RATE", "10"))
+	rate_limit_ingest_burst: int = int(os.getenv("FLORAMIGO_RATE_LIMIT_INGEST_BURST", "60"))
+	rate_limit_key_header: str = os.getenv("FLORAMIGO_RATE_LIMIT_KEY_HEADER", "x-client-key").lower()
+	rate_limit_max_clients: int = int(os.getenv("FLORAMIGO_RATE_LIMIT_MAX_CLIENTS", "10000"))
+	metrics_enabled: bool = _env_flag("FLORAMIGO_METRICS", "true")
+	gzip_minimum_size: int = int(os.getenv("FLORAMIGO_GZIP_MINIMUM_SIZE", "500"))
+	max_concurrent_requests: int = int(os.getenv("FLORAMIGO_MAX_CONCURRENT_REQUESTS", "64"))
 	api_host: str = os.getenv("FLORAMIGO_API_HOST", "127.0.0.1")
 	api_port: int = int(os.getenv("FLORAMIGO_API_PORT", "8000"))
 	serial_port: str = os.getenv("FLORAMIGO_SERIAL_PORT", "/dev/ttyUSB0")
@@ -26,6 +66,29 @@ class Settings:
 	sensor_data_file: Path = DATA_DIR / "current_readings.json"
 	sensor_history_file: Path = DATA_DIR / "readings_history.json"
 	alerts_file: Path = DATA_DIR / "alerts.json"
+	state_backend: str = os.getenv("FLORAMIGO_STATE_BACKEND", "json").strip().lower()
+	state_db_file: Path = _env_path("FLORAMIGO_STATE_DB") or DATA_DIR / "floramigo_state.db"
+	serial_lock_file: Path = _env_path("FLORAMIGO_SERIAL_LOCK") or DATA_DIR / "serial_monitor.lock"
+	alert_log_enabled: bool = _env_flag("FLORAMIGO_ALERT_LOG_ENABLED", "true")
+	alert_log_file: Path = _env_path("FLORAMIGO_ALERT_LOG") or DATA_DIR / "alert_log.db"
+	alert_log_max_rows: int = int(os.getenv("FLORAMIGO_ALERT_LOG_MAX_ROWS", "1000000"))
+	device_id: str = os.getenv("FLORAMIGO_DEVICE_ID", "default")
+	plant_profiles_file: Path = ROOT_DIR / "Floramigo_Plant_Profiles.json"
+	plant_name: str | None = os.getenv("FLORAMIGO_PLANT_NAME") or None
+	retrieval_top_k: int = int(os.getenv("FLORAMIGO_RETRIEVAL_TOP_K", "5"))
+	retrieval_cache_size: int = int(os.getenv("FLORAMIGO_RETRIEVAL_CACHE_SIZE", "512"))
+	retrieval_backend: str = os.getenv("FLORAMIGO_RETRIEVAL_BACKEND", "bm25")
+	vector_dim: int = int(os.getenv("FLORAMIGO_VECTOR_DIM", "1024"))
+	vector_index_dir: Path = _env_path("FLORAMIGO_VECTOR_INDEX_DIR") or DATA_DIR / "vector_index"
+	knowledge_dir: Path = _env_path("FLORAMIGO_KNOWLEDGE_DIR") or DATA_DIR / "knowledge"
+	knowledge_index_file: Path = _env_path("FLORAMIGO_KNOWLEDGE_INDEX") or DATA_DIR / "knowledge_index.json"
+	knowledge_reload_interval: float = float(os.getenv("FLORAMIGO_KNOWLEDGE_RELOAD_INTERVAL", "2"))
+	response_cache_enabled: bool = _env_flag("FLORAMIGO_RESPONSE_CACHE", "true")
+	response_cache_size: int = int(os.getenv("FLORAMIGO_RESPONSE_CACHE_SIZE", "256"))
+	response_cache_ttl: float = float(os.getenv("FLORAMIGO_RESPONSE_CACHE_TTL", "900"))
+	response_cache_similarity: float = float(os.getenv("FLORAMIGO_RESPONSE_CACHE_SIMILARITY", "0.85"))
+	response_cache_file: Path | None = _env_path("FLORAMIGO_RESPONSE_CACHE_FILE")
+	response_cache_flush_seconds: float = float(os.getenv("FLORAMIGO_RESPONSE_CACHE_FLUSH", "2.0"))
 
 	@property
 	def api_base_url(self) -> str:
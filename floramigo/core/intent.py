@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+
+
+ADVICE = "advice"
+STATUS = "status"
+MOISTURE = "moisture"
+TEMPERATURE = "temperature"
+HUMIDITY = "humidity"
+LIGHT = "light"
+
+TELEMETRY_INTENTS = (MOISTURE, TEMPERATURE, HUMIDITY, LIGHT, STATUS)
+
+# Anything that asks for a decision, explanation, plan, or what a plant needs goes to the LLM.
+_ADVICE_RE = re.compile(
+	r"\b(should|why|how (do|can|often|long|much)|what (should|can|do)|help|fix|save|tips?|advice|"
+	r"recommend|best|ideal|optimal|prefer(s|red)?|enough|too \w+|water(ing|ed)?|need(s|ed)?|repot|fertili[sz]e|"
+	r"prune|yellow|brown|droop\w*|wilt\w*|spots?|pests?|bugs?|rot|dying|dead|propagat\w*|when)\b"
+)
+# A metric word alone is not enough; the question has to ask for the current reading.
+_CURRENT_RE = re.compile(
+	r"\b(what('?s| is| are) (the|my|our)|(is|are) (it|the|my|our)|"
+	r"how (hot|cold|warm|wet|dry|humid|bright|dark) (is|are)|"
+	r"current(ly)?|(right )?now|reading|level|check|tell me|show)\b"
+)
+# "How much light does it get?" asks for a reading even though "how much" usually asks for advice.
+_RECEIVED_RE = re.compile(
+	r"\bhow much \w+ (does|do|is|are) (it|they|(my|the|our) \w+( \w+)?) (get(s|ting)?|receiv(e|es|ing))\b"
+)
+_METRIC_PATTERNS = (
+	(MOISTURE, re.compile(r"\b(soil|moisture|moist|wet|dry)\b")),
+	(TEMPERATURE, re.compile(r"\b(temp|temperature|hot|cold|warm|degrees?)\b")),
+	(HUMIDITY, re.compile(r"\b(humidity|humid)\b")),
+	(LIGHT, re.compile(r"\b(light|bright|dark|lux|sun(light)?)\b")),
+)
+_STATUS_RE = re.compile(
+	r"\b(how('?s| is| are) (my|the|our) \w+( \w+)?( doing)?|(is|are) (my|the|our) \w+( \w+)? "
+	r"(ok(ay)?|healthy|alright|fine|good)|plant status|status|health|overview|check on)\b"
+)
+
+_READINGS = {
+	MOISTURE: ("moisture", "Soil moisture is {}%"),
+	TEMPERATURE: ("temperature", "Temperature is {}°C"),
+	HUMIDITY: ("humidity", "Air humidity is {}%"),
+}
+
+_METRIC_KEYWORDS = {
+	MOISTURE: "soil",
+	TEMPERATURE: "temperature",
+	HUMIDITY: "humidity",
+	LIGHT: "light",
+}
+
+
+def classify_intent(message: str) -> str:
+	text = (message or "").lower().replace("\u2019", "'")
+	received = _RECEIVED_RE.search(text) is not None
+	if _ADVICE_RE.search(_RECEIVED_RE.sub(" ", text)):
+		return ADVICE
+
+	metrics = [intent for intent, pattern in _METRIC_PATTERNS if pattern.search(text)]
+	asked = received or _CURRENT_RE.search(text) is not None
+	if len(metrics) == 1 and asked:
+		return metrics[0]
+	if not metrics and _STATUS_RE.search(text):
+		return STATUS
+	if len(metrics) > 1 and asked:
+		return STATUS
+	return ADVICE
+
+
+def telemetry_answer(intent: str, status: dict) -> str | None:
+	if intent not in TELEMETRY_INTENTS:
+		return None
+	if status["status"] == "unavailable" or not status.get("data"):
+		return status["summary"]
+
+	data = status["data"]
+	if intent == STATUS:
+		return f"{status['summary']} Last reading: {data['timestamp']}."
+
+	keyword = _METRIC_KEYWORDS[intent]
+	observations = status["issues"] + status["good_points"]
+	line = next((item for item in observations if keyword in item.lower()), None)
+	if intent == LIGHT:
+		line = f"{line or 'Light level reading'} (raw light level {data['light']})"
+	elif line is None:
+		field, template = _READINGS[intent]
+		line = template.format(data.get(field))
+	return f"{line}. Last reading: {data['timestamp']}."
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Any
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from threading import Lock
+from typing import Any, Callable
 
 from floramigo.core.config import settings
+from floramigo.core.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from floramigo.core.resilience import CircuitBreaker, LatencyTracker
 
 try:
 	from openai import OpenAI
@@ -10,11 +15,63 @@ except ImportError:
 	OpenAI = None
 
 
+# OpenAI-compatible local servers (e.g. benchmarks/fake_llm.py) ignore the key,
+# but the SDK still requires one to be set.
+LOCAL_API_KEY = "floramigo-local"
+
+
+class LLMUnavailableError(RuntimeError):
+	"""Raised when the model cannot answer in time and callers should fall back."""
+
+
 class FloramigoLLMClient:
-	def __init__(self, api_key: str | None = None, model: str | None = None):
-		self.api_key = api_key or settings.openai_api_key
+	def __init__(
+		self,
+		api_key: str | None = None,
+		model: str | None = None,
+		base_url: str | None = None,
+		*,
+		timeout: float | None = None,
+		hedge: bool | None = None,
+		hedge_delay: float | None = None,
+		breaker: CircuitBreaker | None = None,
+	):
+		self.base_url = base_url or settings.openai_base_url
+		self.api_key = api_key or settings.openai_api_key or (LOCAL_API_KEY if self.base_url else None)
 		self.model = model or settings.openai_model
-		self._client = OpenAI(api_key=self.api_key) if OpenAI and self.api_key else None
+		self.timeout = timeout if timeout is not None else settings.llm_timeout
+		self.hedge = hedge if hedge is not None else settings.llm_hedge
+		self.hedge_delay = hedge_delay if hedge_delay is not None else settings.llm_hedge_delay
+		self.breaker = breaker or CircuitBreaker(
+			error_rate_threshold=settings.llm_breaker_error_rate,
+			latency_threshold=settings.llm_breaker_latency,
+			window=settings.llm_breaker_window,
+			min_calls=settings.llm_breaker_min_calls,
+			cooldown=settings.llm_breaker_cooldown,
+		)
+		self.latency = LatencyTracker()
+		self._client = (
+			OpenAI(
+				api_key=self.api_key,
+				base_url=self.base_url,
+				timeout=self.timeout,
+				max_retries=settings.llm_max_retries,
+			)
+			if OpenAI and self.api_key
+			else None
+		)
+		self._executor = ThreadPoolExecutor(max_workers=settings.llm_max_workers, thread_name_prefix="floramigo-llm")
+		self._stats_lock = Lock()
+		self.counters = {
+			"calls": 0,
+			"successes": 0,
+			"failures": 0,
+			"timeouts": 0,
+			"short_circuited": 0,
+			"hedges_launched": 0,
+			"hedges_won": 0,
+			"tool_calls": 0,
+		}
 
 	@property
 	def available(self) -> bool:
@@ -28,19 +85,158 @@ class FloramigoLLMClient:
 		max_tokens: int = 500,
 		model: str | None = None,
 	) -> str:
+		response = self._complete(
+			{
+				"model": model or self.model,
+				"messages": messages,
+				"temperature": temperature,
+				"max_tokens": max_tokens,
+			}
+		)
+		message = response.choices[0].message.content
+		return message.strip() if isinstance(message, str) else ""
+
+	def chat_with_tools(
+		self,
+		messages: list[dict[str, Any]],
+		tools: list[dict[str, Any]],
+		run_tool: Callable[[str, str | None], str],
+		*,
+		temperature: float = 0.7,
+		max_tokens: int = 500,
+		model: str | None = None,
+		max_rounds: int | None = None,
+	) -> str:
+		conversation = list(messages)
+		rounds = max_rounds if max_rounds is not None else settings.llm_max_tool_rounds
+		# One deadline for the whole loop: every round and tool run spends from the same budget.
+		deadline = time.perf_counter() + self.timeout
+		for round_index in range(rounds + 1):
+			if time.perf_counter() >= deadline:
+				self._count("timeouts")
+				raise LLMUnavailableError("LLM tool loop ran out of time.")
+			request = {
+				"model": model or self.model,
+				"messages": conversation,
+				"temperature": temperature,
+				"max_tokens": max_tokens,
+			}
+			# The last round withholds tools so the model has to answer with what it has.
+			if round_index < rounds:
+				request["tools"] = tools
+			message = self._complete(request, deadline).choices[0].message
+			tool_calls = getattr(message, "tool_calls", None) or []
+			if not tool_calls:
+				return message.content.strip() if isinstance(message.content, str) else ""
+
+			self._count("tool_calls", len(tool_calls))
+			conversation.append(
+				{
+					"role": "assistant",
+					"content": message.content or "",
+					"tool_calls": [
+						{
+							"id": call.id,
+							"type": "function",
+							"function": {"name": call.function.name, "arguments": call.function.arguments},
+						}
+						for call in tool_calls
+					],
+				}
+			)
+			for call in tool_calls:
+				conversation.append(
+					{
+						"role": "tool",
+						"tool_call_id": call.id,
+						"content": run_tool(call.function.name, call.function.arguments),
+					}
+				)
+		return ""
+
+	def _complete(self, request: dict, deadline: float | None = None) -> Any:
 		if not self._client:
 			raise RuntimeError(
 				"OpenAI client is unavailable. Set OPENAI_API_KEY and install `openai`."
 			)
 
-		response = self._client.chat.completions.create(
-			model=model or self.model,
-			messages=messages,
-			temperature=temperature,
-			max_tokens=max_tokens,
-		)
-		message = response.choices[0].message.content
-		return message.strip() if isinstance(message, str) else ""
+		if not self.breaker.allow():
+			self._count("short_circuited")
+			raise LLMUnavailableError("LLM circuit breaker is open.")
+
+		self._count("calls")
+		model = request.get("model", self.model)
+		started = time.perf_counter()
+		try:
+			response = self._call_with_deadline(request, deadline if deadline is not None else started + self.timeout)
+		except Exception as exc:
+			elapsed = time.perf_counter() - started
+			self.breaker.record_failure(elapsed)
+			outcome = "timeouts" if isinstance(exc, TimeoutError) else "failures"
+			self._count(outcome)
+			LLM_REQUEST_SECONDS.labels(model, outcome).observe(elapsed)
+			raise LLMUnavailableError(f"LLM request failed: {exc}") from exc
+
+		elapsed = time.perf_counter() - started
+		self.breaker.record_success(elapsed)
+		self.latency.record(elapsed)
+		self._count("successes")
+		LLM_REQUEST_SECONDS.labels(model, "successes").observe(elapsed)
+		usage = getattr(response, "usage", None)
+		if usage is not None:
+			LLM_TOKENS.labels(model, "prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+			LLM_TOKENS.labels(model, "completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+		return response
+
+	def _create(self, request: dict) -> Any:
+		return self._client.chat.completions.create(**request)
+
+	def _hedge_delay(self) -> float:
+		if self.latency.count() >= settings.llm_hedge_min_samples:
+			return self.latency.percentile(0.95)
+		return self.hedge_delay
+
+	def _call_with_deadline(self, request: dict, deadline: float) -> Any:
+		primary = self._executor.submit(self._create, request)
+		pending: set[Future] = {primary}
+
+		if self.hedge:
+			done, _ = wait(pending, timeout=min(self._hedge_delay(), max(0.0, deadline - time.perf_counter())))
+			if not done and time.perf_counter() < deadline:
+				self._count("hedges_launched")
+				pending.add(self._executor.submit(self._create, request))
+
+		last_error: BaseException | None = None
+		while pending:
+			remaining = deadline - time.perf_counter()
+			if remaining <= 0:
+				break
+			done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+			for future in done:
+				if future.exception() is None:
+					if future is not primary:
+						self._count("hedges_won")
+					return future.result()
+				last_error = future.exception()
+
+		if pending or last_error is None:
+			raise TimeoutError(f"LLM request exceeded the {self.timeout:.1f}s deadline.")
+		raise last_error
+
+	def _count(self, name: str, amount: int = 1) -> None:
+		with self._stats_lock:
+			self.counters[name] += amount
+
+	def stats(self) -> dict:
+		with self._stats_lock:
+			counters = dict(self.counters)
+		return {
+			**counters,
+			"latency_p50_seconds": round(self.latency.percentile(0.5), 3),
+			"latency_p95_seconds": round(self.latency.percentile(0.95), 3),
+			"hedge_delay_seconds": round(self._hedge_delay(), 3) if self.hedge else None,
+			"breaker": self.breaker.stats(),
+		}
 
 
 def build_message(role: str, content: Any) -> dict[str, str]:
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable
+
+from floramigo.core.resilience import percentile
+
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def _format_value(value: float) -> str:
+	if value == math.inf:
+		return "+Inf"
+	if float(value).is_integer():
+		return str(int(value))
+	return repr(float(value))
+
+
+def _escape(value: str) -> str:
+	return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+	pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+	if extra:
+		pairs.append(extra)
+	return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+	kind = "untyped"
+
+	def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+		self.name = name
+		self.documentation = documentation
+		self.labelnames = tuple(labelnames)
+		self.lock = Lock()
+		self.children: dict[tuple[str, ...], object] = {}
+
+	@abstractmethod
+	def _new_child(self):
+		...
+
+	def labels(self, *values: str):
+		key = tuple(str(value) for value in values)
+		child = self.children.get(key)
+		if child is None:
+			if len(key) != len(self.labelnames):
+				raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}.")
+			with self.lock:
+				child = self.children.setdefault(key, self._new_child())
+		return child
+
+	@abstractmethod
+	def _samples(self) -> list[str]:
+		...
+
+	def render(self) -> str:
+		lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+		lines.extend(self._samples())
+		return "\n".join(lines)
+
+
+class _CounterChild:
+	__slots__ = ("value", "lock")
+
+	def __init__(self):
+		self.value = 0.0
+		self.lock = Lock()
+
+	def inc(self, amount: float = 1.0) -> None:
+		with self.lock:
+			self.value += amount
+
+
+class Counter(_Metric):
+	kind = "counter"
+
+	def _new_child(self):
+		return _CounterChild()
+
+	def inc(self, amount: float = 1.0) -> None:
+		self.labels().inc(amount)
+
+	def value(self, *values: str) -> float:
+		return self.labels(*values).value
+
+	def _samples(self) -> list[str]:
+		return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(child.value)}" for key, child in list(self.children.items())]
+
+
+class _GaugeChild(_CounterChild):
+	__slots__ = ()
+
+	def set(self, value: float) -> None:
+		self.value = value
+
+
+class Gauge(_Metric):
+	kind = "gauge"
+
+	def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), function: Callable[[], dict] | None = None):
+		super().__init__(name, documentation, labelnames)
+		# A function gauge is read at scrape time and returns {label values tuple: value}.
+		self.function = function
+
+	def _new_child(self):
+		return _GaugeChild()
+
+	def set(self, value: float) -> None:
+		self.labels().set(value)
+
+	def inc(self, amount: float = 1.0) -> None:
+		self.labels().inc(amount)
+
+	def _samples(self) -> list[str]:
+		if self.function is not None:
+			try:
+				values = self.function()
+			except Exception:
+				values = {}
+			return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(value)}" for key, value in values.items()]
+		return [f"{self.name}{_label_text(self.labelnames, key)} {_format_value(child.value)}" for key, child in list(self.children.items())]
+
+
+class _HistogramChild:
+	__slots__ = ("buckets", "counts", "sum", "count", "lock")
+
+	def __init__(self, buckets: tuple[float, ...]):
+		self.buckets = buckets
+		self.counts = [0] * (len(buckets) + 1)
+		self.sum = 0.0
+		self.count = 0
+		self.lock = Lock()
+
+	def observe(self, value: float) -> None:
+		# Per-bucket counts are cumulated at scrape time, so an observation is one bisect and three adds.
+		index = bisect_left(self.buckets, value)
+		with self.lock:
+			self.counts[index] += 1
+			self.sum += value
+			self.count += 1
+
+	@contextmanager
+	def time(self):
+		started = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+	kind = "histogram"
+
+	def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+		super().__init__(name, documentation, labelnames)
+		self.buckets = tuple(sorted(buckets))
+
+	def _new_child(self):
+		return _HistogramChild(self.buckets)
+
+	def observe(self, value: float) -> None:
+		self.labels().observe(value)
+
+	def time(self):
+		return self.labels().time()
+
+	def _samples(self) -> list[str]:
+		lines: list[str] = []
+		for key, child in list(self.children.items()):
+			with child.lock:
+				counts, total, count = list(child.counts), child.sum, child.count
+			cumulative = 0
+			for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+				cumulative += bucket_count
+				le = 'le="' + _format_value(bound) + '"'
+				lines.append(f"{self.name}_bucket{_label_text(self.labelnames, key, le)} {cumulative}")
+			lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {_format_value(total)}")
+			lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {count}")
+		return lines
+
+
+class _SummaryChild:
+	__slots__ = ("samples", "sum", "count", "lock")
+
+	def __init__(self, window: int):
+		self.samples: deque[float] = deque(maxlen=window)
+		self.sum = 0.0
+		self.count = 0
+		self.lock = Lock()
+
+	def observe(self, value: float) -> None:
+		with self.lock:
+			self.samples.append(value)
+			self.sum += value
+			self.count += 1
+
+	def quantile(self, q: float) -> float:
+		with self.lock:
+			samples = list(self.samples)
+		return percentile(samples, q)
+
+
+class Summary(_Metric):
+	kind = "summary"
+
+	def __init__(
+		self,
+		name: str,
+		documentation: str,
+		labelnames: tuple[str, ...] = (),
+		quantiles: tuple[float, ...] = SUMMARY_QUANTILES,
+		window: int = 1024,
+	):
+		super().__init__(name, documentation, labelnames)
+		# Quantiles cover the most recent `window` observations; sum and count cover the whole run.
+		self.quantiles = quantiles
+		self.window = window
+
+	def _new_child(self):
+		return _SummaryChild(self.window)
+
+	def observe(self, value: float) -> None:
+		self.labels().observe(value)
+
+	def _samples(self) -> list[str]:
+		lines: list[str] = []
+		for key, child in list(self.children.items()):
+			with child.lock:
+				samples, total, count = sorted(child.samples), child.sum, child.count
+			for q in self.quantiles:
+				quantile = 'quantile="' + _format_value(q) + '"'
+				lines.append(f"{self.name}{_label_text(self.labelnames, key, quantile)} {_format_value(percentile(samples, q))}")
+			lines.append(f"{self.name}_sum{_label_text(self.labelnames, key)} {_format_value(total)}")
+			lines.append(f"{self.name}_count{_label_text(self.labelnames, key)} {count}")
+		return lines
+
+
+class Registry:
+	def __init__(self):
+		self.metrics: dict[str, _Metric] = {}
+		self.lock = Lock()
+
+	def _get_or_create(self, cls, name: str, *args, **kwargs):
+		with self.lock:
+			metric = self.metrics.get(name)
+			if metric is None:
+				metric = cls(name, *args, **kwargs)
+				self.metrics[name] = metric
+			elif not isinstance(metric, cls):
+				raise ValueError(f"Metric {name} is already registered as a {metric.kind}.")
+			return metric
+
+	def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+		return self._get_or_create(Counter, name, documentation, labelnames)
+
+	def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), function: Callable[[], dict] | None = None) -> Gauge:
+		return self._get_or_create(Gauge, name, documentation, labelnames, function=function)
+
+	def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+		return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+	def summary(
+		self,
+		name: str,
+		documentation: str,
+		labelnames: tuple[str, ...] = (),
+		quantiles: tuple[float, ...] = SUMMARY_QUANTILES,
+		window: int = 1024,
+	) -> Summary:
+		return self._get_or_create(Summary, name, documentation, labelnames, quantiles=quantiles, window=window)
+
+	def render(self) -> str:
+		with self.lock:
+			metrics = list(self.metrics.values())
+		return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = Registry()
+
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+	"floramigo_http_request_seconds", "HTTP request latency by route.", ("method", "route", "status")
+)
+READINGS_INGESTED = registry.counter("floramigo_readings_ingested_total", "Sensor readings ingested.", ("source",))
+STATE_WRITE_SECONDS = registry.histogram(
+	"floramigo_state_write_seconds", "Time spent persisting plant state.", ("target",), buckets=FAST_BUCKETS + (0.1, 0.5)
+)
+ALERTS_RAISED = registry.counter("floramigo_alerts_total", "Alerts raised by type and severity.", ("type", "severity"))
+LLM_REQUEST_SECONDS = registry.histogram(
+	"floramigo_llm_request_seconds", "Model request latency by outcome.", ("model", "outcome"), buckets=LLM_BUCKETS
+)
+LLM_TOKENS = registry.counter("floramigo_llm_tokens_total", "Model tokens used.", ("model", "kind"))
+RETRIEVAL_SECONDS = registry.histogram(
+	"floramigo_retrieval_seconds", "Care-tip retrieval time for cache misses.", ("backend",), buckets=FAST_BUCKETS
+)
+SERIAL_LINES = registry.counter("floramigo_serial_lines_total", "Lines read from the serial port.", ("result",))
+ASK_STAGE_SECONDS = registry.summary("floramigo_ask_stage_seconds", "Time spent in each /ask stage.", ("stage",))
+
+
+class StageTimer:
+	# Wall time per named stage of one request. Stages do not nest, so they add up to at most the total.
+	def __init__(self):
+		self.started = time.perf_counter()
+		self.stages: dict[str, float] = {}
+
+	@contextmanager
+	def stage(self, name: str):
+		started = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+	def total(self) -> float:
+		return time.perf_counter() - self.started
+
+	def milliseconds(self) -> dict[str, float]:
+		timings = {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()}
+		timings["total"] = round(self.total() * 1000, 3)
+		return timings
+
+	def record(self, summary: Summary = ASK_STAGE_SECONDS) -> None:
+		for name, seconds in self.stages.items():
+			summary.labels(name).observe(seconds)
+		summary.labels("total").observe(self.total())
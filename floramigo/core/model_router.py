@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from threading import Lock
+
+from floramigo.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+_SYMPTOM_RE = re.compile(
+	r"\b(yellow\w*|brown\w*|black|spots?|droop\w*|wilt\w*|curl\w*|crisp\w*|mushy|soft|rot\w*|mold|mould|"
+	r"fungus|pests?|bugs?|mites?|aphids?|mealybugs?|scale|gnats?|whiteflies|burn\w*|stunted|leggy|"
+	r"falling|dropping|dying|dead)\b"
+)
+_GREETING_RE = re.compile(r"^\W*(hi|hello|hey|thanks|thank you|good (morning|evening|night)|bye)\b[\w\s!,.]*$")
+
+
+@dataclass(frozen=True)
+class ModelTier:
+	name: str
+	model: str
+	max_tokens: int
+
+
+def score_complexity(message: str, status: dict | None = None) -> int:
+	text = (message or "").lower()
+	if _GREETING_RE.match(text) and len(text.split()) <= 6:
+		return 0
+
+	words = len(text.split())
+	score = 1
+	if words >= 40:
+		score += 2
+	elif words >= 15:
+		score += 1
+
+	symptoms = {match.group(0) for match in _SYMPTOM_RE.finditer(text)}
+	score += min(len(symptoms), 3)
+	if status:
+		score += min(len(status.get("issues", [])), 3)
+	return score
+
+
+class ModelRouter:
+	def __init__(self, tiers: dict[str, ModelTier] | None = None, light_max_score: int | None = None, heavy_min_score: int | None = None):
+		self.tiers = tiers or {
+			"light": ModelTier("light", settings.openai_model_light, settings.llm_light_max_tokens),
+			"standard": ModelTier("standard", settings.openai_model, settings.llm_standard_max_tokens),
+			"heavy": ModelTier("heavy", settings.openai_model_heavy, settings.llm_heavy_max_tokens),
+		}
+		self.light_max_score = light_max_score if light_max_score is not None else settings.llm_light_max_score
+		self.heavy_min_score = heavy_min_score if heavy_min_score is not None else settings.llm_heavy_min_score
+		self.lock = Lock()
+		self.counts = {name: 0 for name in self.tiers}
+
+	def select(self, message: str, status: dict | None = None) -> ModelTier:
+		score = score_complexity(message, status)
+		if score <= self.light_max_score:
+			tier = self.tiers["light"]
+		elif score >= self.heavy_min_score:
+			tier = self.tiers["heavy"]
+		else:
+			tier = self.tiers["standard"]
+
+		with self.lock:
+			self.counts[tier.name] += 1
+		logger.info(
+			"model route tier=%s model=%s max_tokens=%d score=%d",
+			tier.name,
+			tier.model,
+			tier.max_tokens,
+			score,
+		)
+		return tier
+
+	def stats(self) -> dict:
+		with self.lock:
+			return {
+				"tiers": {name: {"model": tier.model, "max_tokens": tier.max_tokens} for name, tier in self.tiers.items()},
+				"routed": dict(self.counts),
+			}
@@ -1,57 +1,225 @@
 from __future__ import annotations
 
-from floramigo.core.llm_client import FloramigoLLMClient, build_message
-from floramigo.core.phd import format_sensor_context_for_llm, get_plant_status
-from floramigo.core.rag_pipeline import retrieve_care_tips
+import logging
+import time
+
+from floramigo.core.config import settings
+from floramigo.core.intent import ADVICE, classify_intent, telemetry_answer
+from floramigo.core.llm_client import FloramigoLLMClient, LLMUnavailableError, build_message
+from floramigo.core.metrics import StageTimer
+from floramigo.core.model_router import ModelRouter
+from floramigo.core.phd import format_sensor_context_for_llm, get_plant_status, plant_health_daemon
+from floramigo.core.rag_pipeline import clear_retrieval_cache, retrieve_care_tips
+from floramigo.core.response_cache import ResponseCache
+from floramigo.core.singleflight import SingleFlight, prompt_key
+from floramigo.core.tools import TOOL_SPECS, run_tool
+from floramigo.pcd.profiles import format_profile_for_llm, get_profile
+
+
+logger = logging.getLogger(__name__)
+
+PROMPT_INTRO = (
+	"You are Floramigo, a warm and practical plant-care assistant.",
+	"Give clear, encouraging advice and prefer specific next steps over generic commentary.",
+	"Use live plant telemetry naturally when it is available.",
+)
+TOOL_INSTRUCTIONS = (
+	"Call the available tools for sensor history, rolling statistics, alerts, plant profiles, "
+	"or care tips when the question needs more detail."
+)
+PREFIX_CACHE_SIZE = 128
 
 
 class FloramigoOrchestrator:
-	def __init__(self, llm_client: FloramigoLLMClient | None = None):
+	def __init__(
+		self,
+		llm_client: FloramigoLLMClient | None = None,
+		response_cache: ResponseCache | None = None,
+		model_router: ModelRouter | None = None,
+		tool_calling: bool | None = None,
+		state_store=None,
+	):
 		self.llm_client = llm_client or FloramigoLLMClient()
+		self.model_router = model_router or ModelRouter()
 		self.history: list[dict[str, str]] = []
+		if response_cache is None and settings.response_cache_enabled:
+			response_cache = ResponseCache()
+		self.response_cache = response_cache
+		self.inflight = SingleFlight()
+		self.tool_calling = settings.llm_tool_calling if tool_calling is None else tool_calling
+		self._prefix_cache: dict[str, str] = {}
+		# A shared store keeps chat history consistent across API workers.
+		self.state_store = state_store or plant_health_daemon.store
 
-	def _system_prompt(self, plant_name: str | None, user_message: str, include_sensor_context: bool) -> str:
-		sections = [
-			"You are Floramigo, a warm and practical plant-care assistant.",
-			"Give clear, encouraging advice and prefer specific next steps over generic commentary.",
-			"Use live plant telemetry naturally when it is available.",
-		]
+	def _prompt_prefix(self, plant_name: str | None) -> str:
+		# Everything before the per-question tips is fixed for a given plant, so it is assembled
+		# once and reused byte-for-byte, which also lets upstream prompt caching match the prefix.
+		key = plant_name.strip().lower() if plant_name else ""
+		prefix = self._prefix_cache.get(key)
+		if prefix is not None:
+			return prefix
 
+		sections = list(PROMPT_INTRO)
+		if self.tool_calling:
+			sections.append(TOOL_INSTRUCTIONS)
+		profile = get_profile(plant_name)
+		if profile:
+			plant_name = profile[0]
 		if plant_name:
 			sections.append(f"The user is asking about a {plant_name.strip()}.")
+		if profile and not self.tool_calling:
+			sections.append(format_profile_for_llm(*profile))
 
-		if include_sensor_context:
-			sections.append(format_sensor_context_for_llm())
+		prefix = "\n\n".join(sections)
+		if len(self._prefix_cache) >= PREFIX_CACHE_SIZE:
+			self._prefix_cache.clear()
+		self._prefix_cache[key] = prefix
+		return prefix
+
+	def _recent_history(self, limit: int) -> list[dict[str, str]]:
+		if self.state_store.shared:
+			return self.state_store.recent_chat(limit)
+		return self.history[-limit:]
+
+	def _remember(self, *messages: dict[str, str]) -> None:
+		if self.state_store.shared:
+			self.state_store.append_chat(list(messages), keep=20)
+			return
+		self.history.extend(messages)
+		self.history = self.history[-20:]
+
+	def invalidate_prompt_cache(self) -> None:
+		self._prefix_cache.clear()
+		clear_retrieval_cache()
+
+	def _system_prompt(
+		self,
+		plant_name: str | None,
+		user_message: str,
+		include_sensor_context: bool,
+		sensor_status: dict | None = None,
+		timer: StageTimer | None = None,
+	) -> str:
+		timer = timer or StageTimer()
+		# Sections run from most to least stable: static prefix, then tips, then live sensor data last.
+		with timer.stage("prompt"):
+			sections = [self._prompt_prefix(plant_name)]
 
-		tips = retrieve_care_tips(user_message, plant_name)
+		if self.tool_calling:
+			# Tool mode keeps the prompt to a one-line status; history, stats, alerts,
+			# profiles, and tips are fetched through tools only when the question needs them.
+			if include_sensor_context and sensor_status:
+				sections.append(f"Current plant status: {sensor_status['status'].upper()} - {sensor_status['summary']}")
+			return "\n\n".join(sections)
+
+		with timer.stage("retrieval"):
+			profile = get_profile(plant_name)
+			tips = retrieve_care_tips(user_message, profile[0] if profile else plant_name)
 		if tips:
 			sections.append("Helpful care tips:\n- " + "\n- ".join(tips))
 
+		if include_sensor_context:
+			with timer.stage("sensor_context"):
+				sections.append(format_sensor_context_for_llm())
+
 		return "\n\n".join(sections)
 
-	def chat(self, user_message: str, plant_name: str | None = None, include_sensor_context: bool = True) -> dict:
-		messages = [build_message("system", self._system_prompt(plant_name, user_message, include_sensor_context))]
-		messages.extend(self.history[-12:])
-		messages.append(build_message("user", user_message))
+	def _ask_llm(
+		self,
+		user_message: str,
+		plant_name: str | None,
+		include_sensor_context: bool,
+		sensor_status: dict,
+		timer: StageTimer | None = None,
+	) -> str:
+		timer = timer or StageTimer()
+		context_status = sensor_status if include_sensor_context else None
+		if self.response_cache is not None:
+			with timer.stage("cache"):
+				cached = self.response_cache.get(user_message, plant_name, context_status)
+			if cached is not None:
+				return cached
 
-		sensor_status = get_plant_status()
+		system_prompt = self._system_prompt(plant_name, user_message, include_sensor_context, sensor_status, timer)
+		with timer.stage("history"):
+			messages = [build_message("system", system_prompt)]
+			messages.extend(self._recent_history(12))
+			messages.append(build_message("user", user_message))
 
-		if not self.llm_client.available:
+		with timer.stage("routing"):
+			tier = self.model_router.select(user_message, context_status)
+		# Concurrent identical questions share one upstream call; the key leaves out
+		# chat history so bursts from different sessions still coalesce.
+		key = prompt_key(tier.model, str(tier.max_tokens), system_prompt, user_message.strip())
+		if self.tool_calling:
+			call = lambda: self.llm_client.chat_with_tools(
+				messages, TOOL_SPECS, run_tool, model=tier.model, max_tokens=tier.max_tokens
+			)
+		else:
+			call = lambda: self.llm_client.chat(messages, model=tier.model, max_tokens=tier.max_tokens)
+		started = time.perf_counter()
+		with timer.stage("llm"):
+			response_text, shared = self.inflight.do(key, call)
+		logger.info(
+			"llm answer tier=%s model=%s latency_ms=%.0f prompt_chars=%d chars=%d shared=%s tools=%s",
+			tier.name,
+			tier.model,
+			(time.perf_counter() - started) * 1000,
+			len(system_prompt),
+			len(response_text),
+			shared,
+			self.tool_calling,
+		)
+		if self.response_cache is not None and response_text and not shared:
+			with timer.stage("cache"):
+				self.response_cache.put(
+					user_message,
+					plant_name,
+					context_status,
+					response_text,
+					latency=time.perf_counter() - started,
+				)
+		return response_text
+
+	def chat(self, user_message: str, plant_name: str | None = None, include_sensor_context: bool = True) -> dict:
+		timer = StageTimer()
+		# Resolve free-text names ("snake plnt", "Sansevieria") so prompts and cache keys use the canonical profile.
+		with timer.stage("profile"):
+			profile = get_profile(plant_name)
+		if profile:
+			plant_name = profile[0]
+		with timer.stage("status"):
+			sensor_status = get_plant_status()
+		# Factual telemetry questions are answered from the status template; the LLM is kept for advice.
+		with timer.stage("intent"):
+			intent = classify_intent(user_message) if include_sensor_context else ADVICE
+
+		if intent != ADVICE:
+			with timer.stage("telemetry"):
+				response_text = telemetry_answer(intent, sensor_status)
+		elif not self.llm_client.available:
 			response_text = sensor_status["summary"]
 			if sensor_status["status"] != "unavailable":
 				response_text += " I can give deeper conversational guidance once OPENAI_API_KEY is configured."
 		else:
-			response_text = self.llm_client.chat(messages)
+			try:
+				response_text = self._ask_llm(user_message, plant_name, include_sensor_context, sensor_status, timer)
+			except LLMUnavailableError:
+				response_text = sensor_status["summary"]
+				if sensor_status["status"] != "unavailable":
+					response_text += " I couldn't reach my plant-care model just now, so this answer is based on live sensor readings."
 
-		self.history.append(build_message("user", user_message))
-		self.history.append(build_message("assistant", response_text))
-		self.history = self.history[-20:]
+		with timer.stage("history"):
+			self._remember(build_message("user", user_message), build_message("assistant", response_text))
+		timer.record()
 
 		return {
 			"response": response_text,
 			"sensor_status": sensor_status["status"],
 			"sensor_summary": sensor_status["summary"],
 			"plant_status": sensor_status,
+			"intent": intent,
+			"timings": timer.milliseconds(),
 		}
 
 
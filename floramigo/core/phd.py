@@ -1,33 +1,53 @@
 from __future__ import annotations
 
-import json
+import logging
+import os
 import time
+import uuid
 from datetime import datetime
 from threading import Lock, Thread
 from typing import Callable
 
+from floramigo.core.alert_log import AlertLog, get_alert_log
 from floramigo.core.config import settings
+from floramigo.core.metrics import ALERTS_RAISED, READINGS_INGESTED, SERIAL_LINES
+from floramigo.core.state_store import WriterLock, build_state_store
+from floramigo.pcd.thresholds import plant_thresholds
 
 try:
 	import serial
 except ImportError:
 	serial = None
 
+logger = logging.getLogger(__name__)
+
 
 THRESHOLDS = {
 	"temperature_low": 15.0,
 	"temperature_high": 35.0,
+	"temperature_critical": 5.0,
 	"humidity_low": 20.0,
 	"humidity_high": 80.0,
 	"moisture_low": 20.0,
 	"moisture_critical": 10.0,
+	"moisture_high": 80.0,
 	"light_low": 50,
 	"drop_threshold": 20.0,
 }
 
 
 class PlantHealthDaemon:
-	def __init__(self, port: str | None = None, baud_rate: int | None = None):
+	def __init__(
+		self,
+		port: str | None = None,
+		baud_rate: int | None = None,
+		plant_name: str | None = None,
+		store=None,
+		writer_lock: WriterLock | None = None,
+		alert_log: AlertLog | None = None,
+		device_id: str | None = None,
+		shared_alert_log: bool = False,
+	):
 		self.port = port or settings.serial_port
 		self.baud_rate = baud_rate or settings.serial_baud_rate
 		self.serial_conn = None
@@ -44,22 +64,78 @@ class PlantHealthDaemon:
 			"status": "disconnected",
 			"source": "unknown",
 		}
-		self.history = self._load_json(settings.sensor_history_file, default=[])
+		self.store = store or build_state_store()
+		self.writer_lock = writer_lock or WriterLock()
+		# Only the process-wide daemon falls back to the global log, resolved on its first alert;
+		# a daemon built around its own store logs nowhere unless it is handed a log.
+		self.alert_log = alert_log
+		self.shared_alert_log = shared_alert_log
+		self.device_id = device_id or settings.device_id
 		self.max_history = 1440
+		self.max_alerts = 50
+		# A shared store's history arrives through _sync() below, which also sets the cursor.
+		self.history = [] if self.store.shared else self.store.load_history(self.max_history)
 		self.last_history_save: datetime | None = None
-		self.alerts = self._load_json(settings.alerts_file, default=[])
+		self.alerts = self.store.load_alerts(self.max_alerts)
 		self.alert_callbacks: list[Callable[[dict], None]] = []
-
-	def _load_json(self, path, default):
+		# Bumped on every change that can alter plant status; the boot id keeps tags unique across restarts.
+		self.version = 0
+		self.boot_id = uuid.uuid4().hex[:8]
+		self.store_version: int | None = None
+		self.history_cursor = 0
+		shared_plant = self.store.plant_name() if self.store.shared else None
+		self._apply_plant(plant_name or shared_plant or settings.plant_name)
+		self._sync()
+
+	def _apply_plant(self, plant_name: str | None) -> str | None:
+		# Bands are compiled once per plant so evaluating a reading stays a handful of dict lookups.
+		self.plant_name, self.thresholds = plant_thresholds(plant_name, THRESHOLDS)
+		self.version += 1
+		return self.plant_name
+
+	def assign_plant(self, plant_name: str | None) -> str | None:
+		name = self._apply_plant(plant_name)
+		if self.store.shared:
+			self.store.set_plant_name(name)
+		return name
+
+	def _sync(self) -> None:
+		# With a shared store, other workers may have written since this one last looked.
+		# Reading the version is one indexed lookup; the state itself is only reloaded when it moved.
+		if not self.store.shared:
+			return
+		version = self.store.version()
+		if version == self.store_version:
+			return
+		current = self.store.load_current()
+		alerts = self.store.load_alerts(self.max_alerts)
+		rows, cursor = self.store.history_since(self.history_cursor)
+		plant_name = self.store.plant_name()
+		with self.lock:
+			if current:
+				self.current_data = current
+			self.alerts = alerts
+			if rows:
+				self.history = (self.history + rows)[-self.max_history :]
+			self.history_cursor = cursor
+			self.store_version = version
+		if plant_name != self.plant_name:
+			self._apply_plant(plant_name)
+
+	def state_tag(self) -> str:
+		if self.store.shared:
+			self._sync()
+			return f"{self.store.store_id}-{self.store_version}-{self.plant_name}"
+		with self.lock:
+			tag = f"{self.boot_id}-{self.version}"
+			live = self.current_data["status"] == "ok"
+		if live:
+			return tag
+		# Without a live reading, status comes from the shared readings file, so its mtime is part of the tag.
 		try:
-			with open(path, "r", encoding="utf-8") as handle:
-				return json.load(handle)
-		except (FileNotFoundError, json.JSONDecodeError):
-			return default
-
-	def _save_json(self, path, payload) -> None:
-		with open(path, "w", encoding="utf-8") as handle:
-			json.dump(payload, handle, indent=2)
+			return f"{tag}-{os.stat(self.store.current_file).st_mtime_ns}"
+		except OSError:
+			return tag
 
 	def connect(self) -> bool:
 		if serial is None:
@@ -71,10 +147,12 @@ class PlantHealthDaemon:
 			time.sleep(2)
 			self.serial_conn.reset_input_buffer()
 			self.current_data["status"] = "connected"
+			self.version += 1
 			return True
 		except Exception:
 			self.current_data["status"] = "disconnected"
 			self.serial_conn = None
+			self.version += 1
 			return False
 
 	def disconnect(self) -> None:
@@ -82,6 +160,7 @@ class PlantHealthDaemon:
 			self.serial_conn.close()
 			self.serial_conn = None
 		self.current_data["status"] = "disconnected"
+		self.version += 1
 
 	def parse_reading(self, line: str) -> dict | None:
 		try:
@@ -117,8 +196,20 @@ class PlantHealthDaemon:
 		return normalized
 
 	def _update_reading(self, data: dict) -> None:
+		READINGS_INGESTED.labels(data.get("source", "serial")).inc()
+		if self.store.shared:
+			self.store.save_current(data)
+			self.store.append_history(data, self.max_history, min_interval=60)
+			with self.lock:
+				self.current_data = data
+				self.version += 1
+			self._sync()
+			self._check_alerts(data)
+			return
+
 		with self.lock:
 			self.current_data = data
+			self.version += 1
 			now = datetime.now()
 			should_save_history = (
 				self.last_history_save is None
@@ -129,32 +220,35 @@ class PlantHealthDaemon:
 				self.last_history_save = now
 				if len(self.history) > self.max_history:
 					self.history = self.history[-self.max_history :]
-				self._save_json(settings.sensor_history_file, self.history)
+				self.store.save_history(self.history)
 
-		self._save_json(settings.sensor_data_file, self.current_data)
+		self.store.save_current(self.current_data)
 		self._check_alerts(data)
 
 	def _check_alerts(self, data: dict) -> None:
+		thresholds = self.thresholds
 		new_alerts: list[dict] = []
 
-		if data["temperature"] < THRESHOLDS["temperature_low"]:
+		if data["temperature"] < thresholds["temperature_critical"]:
+			new_alerts.append(self._build_alert("temperature_critical", "critical", f"🚨 Temperature is dangerously low ({data['temperature']}°C)."))
+		elif data["temperature"] < thresholds["temperature_low"]:
 			new_alerts.append(self._build_alert("temperature_low", "warning", f"🥶 Temperature is low ({data['temperature']}°C)."))
-		elif data["temperature"] > THRESHOLDS["temperature_high"]:
+		elif data["temperature"] > thresholds["temperature_high"]:
 			new_alerts.append(self._build_alert("temperature_high", "warning", f"🥵 Temperature is high ({data['temperature']}°C)."))
 
-		if data["moisture_pct"] < THRESHOLDS["moisture_critical"]:
+		if data["moisture_pct"] < thresholds["moisture_critical"]:
 			new_alerts.append(self._build_alert("moisture_critical", "critical", f"🚨 Soil is critically dry ({data['moisture_pct']}%). Water urgently."))
-		elif data["moisture_pct"] < THRESHOLDS["moisture_low"]:
+		elif data["moisture_pct"] < thresholds["moisture_low"]:
 			new_alerts.append(self._build_alert("moisture_low", "warning", f"💧 Soil moisture is low ({data['moisture_pct']}%)."))
 
-		if data["humidity"] < THRESHOLDS["humidity_low"]:
+		if data["humidity"] < thresholds["humidity_low"]:
 			new_alerts.append(self._build_alert("humidity_low", "info", f"🏜️ Air humidity is low ({data['humidity']}%)."))
-		elif data["humidity"] > THRESHOLDS["humidity_high"]:
+		elif data["humidity"] > thresholds["humidity_high"]:
 			new_alerts.append(self._build_alert("humidity_high", "info", f"💦 Air humidity is high ({data['humidity']}%)."))
 
 		if len(self.history) >= 5:
 			recent_avg = sum(entry["moisture_pct"] for entry in self.history[-5:]) / 5
-			if recent_avg - data["moisture_pct"] > THRESHOLDS["drop_threshold"]:
+			if recent_avg - data["moisture_pct"] > thresholds["drop_threshold"]:
 				new_alerts.append(
 					self._build_alert(
 						"moisture_drop",
@@ -165,19 +259,35 @@ class PlantHealthDaemon:
 
 		if not new_alerts:
 			return
+		for alert in new_alerts:
+			ALERTS_RAISED.labels(alert["type"], alert["severity"]).inc()
 
 		with self.lock:
+			self.version += 1
 			for alert in new_alerts:
 				self.alerts.append(alert)
-				if len(self.alerts) > 50:
-					self.alerts = self.alerts[-50:]
+				if len(self.alerts) > self.max_alerts:
+					self.alerts = self.alerts[-self.max_alerts :]
 				for callback in self.alert_callbacks:
 					try:
 						callback(alert)
 					except Exception:
 						continue
 
-		self._save_json(settings.alerts_file, self.alerts)
+		if self.store.shared:
+			self.store.append_alerts(new_alerts, self.max_alerts)
+			self._sync()
+		else:
+			self.store.save_alerts(self.alerts)
+		# The recent-alerts list above stays bounded for status and prompts; the log keeps the full history.
+		if self.alert_log is None and self.shared_alert_log and settings.alert_log_enabled:
+			self.alert_log = get_alert_log()
+		if self.alert_log is not None:
+			# The reading and recent alerts are already stored; a log failure must not fail the ingest.
+			try:
+				self.alert_log.append(new_alerts, device=self.device_id, plant=self.plant_name)
+			except Exception:
+				logger.exception("Could not append %d alert(s) to %s", len(new_alerts), self.alert_log.path)
 
 	def _build_alert(self, alert_type: str, severity: str, message: str) -> dict:
 		return {
@@ -188,11 +298,12 @@ class PlantHealthDaemon:
 		}
 
 	def get_plant_status(self) -> dict:
+		self._sync()
 		with self.lock:
 			data = dict(self.current_data)
 
 		if data["status"] != "ok" or data["temperature"] is None:
-			file_data = self._load_json(settings.sensor_data_file, default={})
+			file_data = self.store.load_current() or {}
 			if file_data.get("status") == "ok":
 				data = file_data
 			else:
@@ -203,36 +314,40 @@ class PlantHealthDaemon:
 					"data": None,
 					"issues": [],
 					"good_points": [],
+					"plant": self.plant_name,
 					"recent_alerts": self.alerts[-5:],
 				}
 
+		thresholds = self.thresholds
 		issues: list[str] = []
 		good_points: list[str] = []
 
-		if data["temperature"] < THRESHOLDS["temperature_low"]:
+		if data["temperature"] < thresholds["temperature_critical"]:
+			issues.append(f"Temperature is critically low at {data['temperature']}°C")
+		elif data["temperature"] < thresholds["temperature_low"]:
 			issues.append(f"Temperature is low at {data['temperature']}°C")
-		elif data["temperature"] > THRESHOLDS["temperature_high"]:
+		elif data["temperature"] > thresholds["temperature_high"]:
 			issues.append(f"Temperature is high at {data['temperature']}°C")
 		else:
 			good_points.append(f"Temperature is comfortable at {data['temperature']}°C")
 
-		if data["moisture_pct"] < THRESHOLDS["moisture_critical"]:
+		if data["moisture_pct"] < thresholds["moisture_critical"]:
 			issues.append(f"Soil is critically dry at {data['moisture_pct']}%")
-		elif data["moisture_pct"] < THRESHOLDS["moisture_low"]:
+		elif data["moisture_pct"] < thresholds["moisture_low"]:
 			issues.append(f"Soil moisture is low at {data['moisture_pct']}%")
-		elif data["moisture_pct"] > 80:
+		elif data["moisture_pct"] > thresholds["moisture_high"]:
 			issues.append(f"Soil is very wet at {data['moisture_pct']}%")
 		else:
 			good_points.append(f"Soil moisture is healthy at {data['moisture_pct']}%")
 
-		if data["humidity"] < THRESHOLDS["humidity_low"]:
+		if data["humidity"] < thresholds["humidity_low"]:
 			issues.append(f"Air humidity is low at {data['humidity']}%")
-		elif data["humidity"] > THRESHOLDS["humidity_high"]:
+		elif data["humidity"] > thresholds["humidity_high"]:
 			issues.append(f"Air humidity is high at {data['humidity']}%")
 		else:
 			good_points.append(f"Air humidity is comfortable at {data['humidity']}%")
 
-		if data["light_raw"] < THRESHOLDS["light_low"]:
+		if data["light_raw"] < thresholds["light_low"]:
 			issues.append("Light is low and the plant may need a brighter spot")
 		else:
 			good_points.append("Light levels look usable")
@@ -263,17 +378,45 @@ class PlantHealthDaemon:
 				"timestamp": data["timestamp"],
 				"source": data.get("source", "unknown"),
 			},
+			"plant": self.plant_name,
 			"recent_alerts": self.alerts[-5:],
 		}
 
 	def get_current_readings(self) -> dict:
+		self._sync()
 		with self.lock:
 			return dict(self.current_data)
 
 	def get_alerts(self) -> list[dict]:
+		self._sync()
 		with self.lock:
 			return list(self.alerts)
 
+	def get_history(self, limit: int = 60) -> list[dict]:
+		self._sync()
+		with self.lock:
+			return list(self.history[-limit:]) if limit > 0 else []
+
+	def rolling_stats(self, window: int = 60) -> dict:
+		history = self.get_history(window)
+		stats: dict = {"samples": len(history)}
+		if not history:
+			return stats
+
+		stats["from"] = history[0]["timestamp"]
+		stats["to"] = history[-1]["timestamp"]
+		for field in ("temperature", "humidity", "moisture_pct", "light_raw"):
+			values = [entry[field] for entry in history if entry.get(field) is not None]
+			if not values:
+				continue
+			stats[field] = {
+				"min": min(values),
+				"max": max(values),
+				"mean": round(sum(values) / len(values), 2),
+				"change": round(values[-1] - values[0], 2),
+			}
+		return stats
+
 	def sensor_context(self) -> str:
 		status = self.get_plant_status()
 		if status["status"] == "unavailable":
@@ -315,6 +458,7 @@ class PlantHealthDaemon:
 				if self.serial_conn and self.serial_conn.in_waiting > 0:
 					line = self.serial_conn.readline().decode("utf-8", errors="ignore").strip()
 					data = self.parse_reading(line)
+					SERIAL_LINES.labels("parsed" if data else "rejected").inc()
 					if data:
 						self._update_reading(data)
 			except Exception:
@@ -326,6 +470,9 @@ class PlantHealthDaemon:
 	def start(self) -> bool:
 		if self.running:
 			return True
+		# Only one worker may own the serial port; the others keep serving readings from the shared store.
+		if not self.writer_lock.acquire():
+			return False
 		self.running = True
 		self.thread = Thread(target=self._monitor_loop, daemon=True)
 		self.thread.start()
@@ -334,9 +481,10 @@ class PlantHealthDaemon:
 	def stop(self) -> None:
 		self.running = False
 		self.disconnect()
+		self.writer_lock.release()
 
 
-plant_health_daemon = PlantHealthDaemon()
+plant_health_daemon = PlantHealthDaemon(shared_alert_log=True)
 
 
 def get_plant_status() -> dict:
@@ -347,9 +495,21 @@ def get_current_readings() -> dict:
 	return plant_health_daemon.get_current_readings()
 
 
+def get_state_tag() -> str:
+	return plant_health_daemon.state_tag()
+
+
 def get_alerts() -> list[dict]:
 	return plant_health_daemon.get_alerts()
 
 
+def get_history(limit: int = 60) -> list[dict]:
+	return plant_health_daemon.get_history(limit)
+
+
+def get_rolling_stats(window: int = 60) -> dict:
+	return plant_health_daemon.rolling_stats(window)
+
+
 def format_sensor_context_for_llm() -> str:
 	return plant_health_daemon.sensor_context()
@@ -1,7 +1,164 @@
 from __future__ import annotations
 
-from floramigo.pcd.pcd_snippets import get_relevant_snippets
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from threading import Lock
+
+from floramigo.core.bm25 import BM25Index, tokenize
+from floramigo.core.config import settings
+from floramigo.core.metrics import RETRIEVAL_SECONDS
+from floramigo.core.response_cache import normalize_question
+from floramigo.core.vector_index import META_FILE, VectorIndex, corpus_fingerprint, np
+from floramigo.pcd.corpus import CareDocument, build_care_documents
+from floramigo.pcd.knowledge import KnowledgeBase
+from floramigo.pcd.pcd_snippets import DEFAULT_SNIPPETS
+
+
+class Retriever(ABC):
+	name = "base"
+
+	def __init__(self, documents: list[CareDocument]):
+		self.documents = {document.doc_id: document for document in documents}
+
+	@abstractmethod
+	def _ranked(self, query: str, k: int) -> list[str]:
+		...
+
+	def search(self, query: str, k: int, plant: str | None = None) -> list[CareDocument]:
+		# Over-fetch so that filtering out other plants' profile entries still leaves k results.
+		results: list[CareDocument] = []
+		for doc_id in self._ranked(query, k * 3 if plant else k):
+			document = self.documents[doc_id]
+			if plant and document.plant and document.plant.lower() != plant.lower():
+				continue
+			results.append(document)
+			if len(results) == k:
+				break
+		return results
+
+
+class BM25Retriever(Retriever):
+	name = "bm25"
+
+	def __init__(self, documents: list[CareDocument], index: BM25Index | None = None):
+		super().__init__(documents)
+		# A prebuilt index (such as a loaded knowledge base) only needs the documents it is missing.
+		self.index = index if index is not None else BM25Index()
+		for document in documents:
+			if document.doc_id not in self.index:
+				self.index.add(document.doc_id, tokenize(document.text))
+
+	def _ranked(self, query: str, k: int) -> list[str]:
+		return [doc_id for doc_id, _ in self.index.search(tokenize(query), k)]
+
+
+class VectorRetriever(Retriever):
+	name = "vector"
+
+	def __init__(self, documents: list[CareDocument], index_dir: Path | None = None, dim: int | None = None):
+		super().__init__(documents)
+		doc_ids = [document.doc_id for document in documents]
+		texts = [document.text for document in documents]
+		self.index = None
+		if index_dir is not None and (index_dir / META_FILE).exists():
+			try:
+				loaded = VectorIndex.load(index_dir)
+				if loaded.fingerprint == corpus_fingerprint(doc_ids, texts):
+					self.index = loaded
+			except (OSError, ValueError):
+				self.index = None
+		if self.index is None:
+			self.index = VectorIndex.build(doc_ids, texts, dim or settings.vector_dim)
+			if index_dir is not None:
+				self.index.save(index_dir)
+
+	def _ranked(self, query: str, k: int) -> list[str]:
+		return [doc_id for doc_id, _ in self.index.search(query, k)]
+
+
+def build_retriever(documents: list[CareDocument], backend: str | None = None, index: BM25Index | None = None) -> Retriever:
+	backend = backend or settings.retrieval_backend
+	if backend == "vector" and np is not None:
+		return VectorRetriever(documents, settings.vector_index_dir)
+	return BM25Retriever(documents, index)
+
+
+def load_retriever(index_file: Path | None = None, backend: str | None = None) -> Retriever:
+	knowledge = KnowledgeBase.load(index_file or settings.knowledge_index_file)
+	documents = build_care_documents() + list(knowledge.documents.values())
+	return build_retriever(documents, backend, knowledge.index)
+
+
+def _index_mtime(path: Path) -> int | None:
+	try:
+		return path.stat().st_mtime_ns
+	except OSError:
+		return None
+
+
+_reload_lock = Lock()
+_index_mtime_ns = _index_mtime(settings.knowledge_index_file)
+_next_check = 0.0
+retriever = load_retriever()
+
+
+def refresh_retriever(force: bool = False) -> bool:
+	global retriever, _index_mtime_ns, _next_check
+	now = time.monotonic()
+	if not force and now < _next_check:
+		return False
+	_next_check = now + settings.knowledge_reload_interval
+	mtime = _index_mtime(settings.knowledge_index_file)
+	if not force and mtime == _index_mtime_ns:
+		return False
+
+	with _reload_lock:
+		if not force and mtime == _index_mtime_ns:
+			return False
+		# Requests keep searching the old retriever until the new one is fully built.
+		fresh = load_retriever()
+		retriever = fresh
+		_index_mtime_ns = mtime
+		_cached_tips.cache_clear()
+	return True
+
+
+@lru_cache(maxsize=settings.retrieval_cache_size)
+def _cached_tips(query: str, plant: str | None) -> tuple[str, ...]:
+	limit = settings.retrieval_top_k - 1 if plant else settings.retrieval_top_k
+	active = retriever
+	with RETRIEVAL_SECONDS.labels(active.name).time():
+		tips = [document.text for document in active.search(f"{query} {plant}" if plant else query, limit, plant=plant)]
+	for tip in DEFAULT_SNIPPETS["general"]:
+		if len(tips) >= limit:
+			break
+		if tip not in tips:
+			tips.append(tip)
+
+	if plant:
+		tips.append(f"Tailor advice for {plant} and keep recommendations practical for a home grower.")
+	return tuple(tips)
+
+
+def clear_retrieval_cache() -> None:
+	_cached_tips.cache_clear()
+
+
+def retrieval_cache_stats() -> dict:
+	info = _cached_tips.cache_info()
+	lookups = info.hits + info.misses
+	return {
+		"hits": info.hits,
+		"misses": info.misses,
+		"size": info.currsize,
+		"max_size": info.maxsize,
+		"hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+	}
 
 
 def retrieve_care_tips(message: str, plant_name: str | None = None) -> list[str]:
-	return get_relevant_snippets(message, plant_name)
+	refresh_retriever()
+	# Tokenization ignores case and punctuation, so the normalized question retrieves the same tips.
+	return list(_cached_tips(normalize_question(message), plant_name.strip() if plant_name else None))
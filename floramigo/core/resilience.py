@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from threading import Lock
+
+
+def percentile(values: list[float], q: float) -> float:
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+	return ordered[index]
+
+
+class LatencyTracker:
+	def __init__(self, window: int = 200):
+		self.lock = Lock()
+		self._samples: deque[float] = deque(maxlen=window)
+
+	def record(self, seconds: float) -> None:
+		with self.lock:
+			self._samples.append(seconds)
+
+	def count(self) -> int:
+		with self.lock:
+			return len(self._samples)
+
+	def percentile(self, q: float) -> float:
+		with self.lock:
+			samples = list(self._samples)
+		return percentile(samples, q)
+
+
+class CircuitBreaker:
+	CLOSED = "closed"
+	OPEN = "open"
+	HALF_OPEN = "half_open"
+
+	def __init__(
+		self,
+		error_rate_threshold: float = 0.5,
+		latency_threshold: float = 15.0,
+		window: int = 20,
+		min_calls: int = 5,
+		cooldown: float = 30.0,
+	):
+		self.error_rate_threshold = error_rate_threshold
+		self.latency_threshold = latency_threshold
+		self.min_calls = min_calls
+		self.cooldown = cooldown
+		self.lock = Lock()
+		self.state = self.CLOSED
+		self.opened_at = 0.0
+		self.times_opened = 0
+		self._probe_in_flight = False
+		self._outcomes: deque[tuple[bool, float]] = deque(maxlen=window)
+
+	def allow(self) -> bool:
+		with self.lock:
+			if self.state == self.CLOSED:
+				return True
+			if self.state == self.OPEN:
+				if time.monotonic() - self.opened_at < self.cooldown:
+					return False
+				self.state = self.HALF_OPEN
+			# Half-open lets a single probe through; its outcome decides the next state.
+			if self._probe_in_flight:
+				return False
+			self._probe_in_flight = True
+			return True
+
+	def record_success(self, latency: float) -> None:
+		self._record(True, latency)
+
+	def record_failure(self, latency: float) -> None:
+		self._record(False, latency)
+
+	def _record(self, ok: bool, latency: float) -> None:
+		with self.lock:
+			if self.state == self.HALF_OPEN:
+				self._probe_in_flight = False
+				if ok and latency < self.latency_threshold:
+					self.state = self.CLOSED
+					self._outcomes.clear()
+				else:
+					self._trip()
+				return
+
+			self._outcomes.append((ok, latency))
+			if len(self._outcomes) < self.min_calls:
+				return
+			errors = sum(1 for outcome, _ in self._outcomes if not outcome)
+			p95 = percentile([seconds for _, seconds in self._outcomes], 0.95)
+			if errors / len(self._outcomes) >= self.error_rate_threshold or p95 >= self.latency_threshold:
+				self._trip()
+
+	def _trip(self) -> None:
+		self.state = self.OPEN
+		self.opened_at = time.monotonic()
+		self.times_opened += 1
+		self._outcomes.clear()
+
+	def stats(self) -> dict:
+		with self.lock:
+			window = len(self._outcomes)
+			errors = sum(1 for outcome, _ in self._outcomes if not outcome)
+			return {
+				"state": self.state,
+				"times_opened": self.times_opened,
+				"window_calls": window,
+				"window_error_rate": errors / window if window else 0.0,
+			}
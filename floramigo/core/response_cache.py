@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock, Timer, current_thread
+
+from floramigo.core.config import settings
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Words that can differ between two phrasings of the same question. Negations, numbers and
+# question words are deliberately absent, so they always have to match.
+_FILLER_WORDS = frozenset(
+	"a an the i me my we our you your it its is am are was be do does did should shall can could would will "
+	"to of for in on at this that so please just really now today currently right hey hi".split()
+)
+
+
+def normalize_question(text: str) -> str:
+	return " ".join(_WORD_RE.findall((text or "").lower()))
+
+
+def sensor_bucket(status: dict | None) -> str:
+	if not status:
+		return "none"
+	data = status.get("data")
+	if not data:
+		return str(status.get("status", "unavailable"))
+	return "|".join(
+		[
+			str(status.get("status")),
+			f"m{int(data['moisture'] // 10) * 10}",
+			f"t{int(data['temperature'] // 2) * 2}",
+			f"h{int(data['humidity'] // 10) * 10}",
+		]
+	)
+
+
+def _trigrams(text: str) -> frozenset[str]:
+	padded = f"  {text} "
+	return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _content_words(text: str) -> frozenset[str]:
+	return frozenset(word for word in text.split() if word not in _FILLER_WORDS)
+
+
+def _jaccard(left: frozenset[str], right: frozenset[str]) -> float:
+	if not left or not right:
+		return 0.0
+	return len(left & right) / len(left | right)
+
+
+@dataclass
+class CacheEntry:
+	question: str
+	plant: str
+	bucket: str
+	response: str
+	created_at: float
+	latency: float
+
+
+class ResponseCache:
+	def __init__(
+		self,
+		max_entries: int | None = None,
+		ttl_seconds: float | None = None,
+		similarity_threshold: float | None = None,
+		path: Path | None = None,
+		flush_interval: float | None = None,
+	):
+		self.max_entries = max_entries or settings.response_cache_size
+		self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.response_cache_ttl
+		self.similarity_threshold = (
+			similarity_threshold if similarity_threshold is not None else settings.response_cache_similarity
+		)
+		self.path = path if path is not None else settings.response_cache_file
+		self.flush_interval = flush_interval if flush_interval is not None else settings.response_cache_flush_seconds
+		self.lock = Lock()
+		# Serializes snapshots to disk so an older snapshot never replaces a newer one.
+		self.write_lock = Lock()
+		self._entries: OrderedDict[tuple[str, str, str], CacheEntry] = OrderedDict()
+		self._partitions: dict[tuple[str, str], dict[tuple[str, str, str], tuple[frozenset[str], frozenset[str]]]] = {}
+		# Puts only mark the cache dirty; one snapshot per flush interval is written off the request thread.
+		self._dirty = False
+		self._timer: Timer | None = None
+		self.hits = 0
+		self.near_hits = 0
+		self.misses = 0
+		self.saved_latency = 0.0
+		self._load()
+		if self.path:
+			atexit.register(self.flush)
+
+	def _key(self, question: str, plant_name: str | None, status: dict | None) -> tuple[str, str, str]:
+		plant = normalize_question(plant_name or "")
+		return (normalize_question(question), plant, sensor_bucket(status))
+
+	def get(self, question: str, plant_name: str | None, status: dict | None) -> str | None:
+		key = self._key(question, plant_name, status)
+		now = time.time()
+		with self.lock:
+			entry = self._entries.get(key)
+			if entry is not None and self._expired(entry, now):
+				self._evict(key)
+				entry = None
+
+			if entry is None:
+				match = self._nearest(key, now)
+				if match is None:
+					self.misses += 1
+					return None
+				key, entry = match
+				self.near_hits += 1
+			else:
+				self.hits += 1
+
+			self._entries.move_to_end(key)
+			self.saved_latency += entry.latency
+			return entry.response
+
+	def put(
+		self,
+		question: str,
+		plant_name: str | None,
+		status: dict | None,
+		response: str,
+		latency: float = 0.0,
+	) -> None:
+		key = self._key(question, plant_name, status)
+		entry = CacheEntry(
+			question=key[0],
+			plant=key[1],
+			bucket=key[2],
+			response=response,
+			created_at=time.time(),
+			latency=latency,
+		)
+		with self.lock:
+			self._insert(key, entry)
+			while len(self._entries) > self.max_entries:
+				self._evict(next(iter(self._entries)))
+		self._schedule_flush()
+
+	def clear(self) -> None:
+		with self.lock:
+			self._entries.clear()
+			self._partitions.clear()
+		self._schedule_flush()
+
+	def stats(self) -> dict:
+		with self.lock:
+			lookups = self.hits + self.near_hits + self.misses
+			return {
+				"entries": len(self._entries),
+				"hits": self.hits,
+				"near_hits": self.near_hits,
+				"misses": self.misses,
+				"hit_rate": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+				"saved_latency_seconds": round(self.saved_latency, 3),
+			}
+
+	def _expired(self, entry: CacheEntry, now: float) -> bool:
+		return self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds
+
+	def _nearest(self, key: tuple[str, str, str], now: float) -> tuple[tuple[str, str, str], CacheEntry] | None:
+		if self.similarity_threshold >= 1.0:
+			return None
+		candidates = self._partitions.get((key[1], key[2]))
+		if not candidates:
+			return None
+
+		grams = _trigrams(key[0])
+		words = _content_words(key[0])
+		best_key = None
+		best_score = self.similarity_threshold
+		for candidate_key, (candidate_grams, candidate_words) in list(candidates.items()):
+			if self._expired(self._entries[candidate_key], now):
+				self._evict(candidate_key)
+				continue
+			# Trigram overlap stays high for long questions that differ by a "not" or a number.
+			if words != candidate_words:
+				continue
+			score = _jaccard(grams, candidate_grams)
+			if score >= best_score:
+				best_key, best_score = candidate_key, score
+
+		if best_key is None:
+			return None
+		return best_key, self._entries[best_key]
+
+	def _insert(self, key: tuple[str, str, str], entry: CacheEntry) -> None:
+		self._entries[key] = entry
+		self._entries.move_to_end(key)
+		self._partitions.setdefault((key[1], key[2]), {})[key] = (_trigrams(key[0]), _content_words(key[0]))
+
+	def _evict(self, key: tuple[str, str, str]) -> None:
+		self._entries.pop(key, None)
+		partition = self._partitions.get((key[1], key[2]))
+		if partition is not None:
+			partition.pop(key, None)
+			if not partition:
+				del self._partitions[(key[1], key[2])]
+
+	def _load(self) -> None:
+		if not self.path:
+			return
+		try:
+			with open(self.path, "r", encoding="utf-8") as handle:
+				rows = json.load(handle)
+		except (FileNotFoundError, json.JSONDecodeError):
+			return
+		if not isinstance(rows, list):
+			return
+
+		now = time.time()
+		for row in rows[-self.max_entries :]:
+			# A hand-edited or truncated row is dropped rather than taking the whole cache down.
+			try:
+				entry = CacheEntry(**row)
+				if not self._expired(entry, now):
+					self._insert((entry.question, entry.plant, entry.bucket), entry)
+			except (TypeError, ValueError):
+				continue
+
+	def _schedule_flush(self) -> None:
+		if not self.path:
+			return
+		if self.flush_interval <= 0:
+			with self.lock:
+				self._dirty = True
+			self.flush()
+			return
+		with self.lock:
+			self._dirty = True
+			if self._timer is not None:
+				return
+			self._timer = Timer(self.flush_interval, self.flush)
+			self._timer.daemon = True
+			self._timer.start()
+
+	def flush(self) -> None:
+		if not self.path:
+			return
+		with self.write_lock:
+			with self.lock:
+				timer, self._timer = self._timer, None
+				if not self._dirty:
+					return
+				self._dirty = False
+				rows = [asdict(entry) for entry in self._entries.values()]
+			if timer is not None and timer is not current_thread():
+				timer.cancel()
+			path = Path(self.path)
+			with tempfile.NamedTemporaryFile(
+				"w", encoding="utf-8", dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+			) as handle:
+				tmp_path = handle.name
+				json.dump(rows, handle)
+			try:
+				os.replace(tmp_path, path)
+			except OSError:
+				os.unlink(tmp_path)
+				raise
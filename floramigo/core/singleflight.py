@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+from threading import Event, Lock
+from typing import Any, Callable
+
+
+class _Call:
+	def __init__(self):
+		self.done = Event()
+		self.result: Any = None
+		self.error: BaseException | None = None
+		self.waiters = 0
+
+
+class SingleFlight:
+	def __init__(self):
+		self.lock = Lock()
+		self._calls: dict[str, _Call] = {}
+		self.leaders = 0
+		self.coalesced = 0
+
+	def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+		with self.lock:
+			call = self._calls.get(key)
+			if call is not None:
+				call.waiters += 1
+				self.coalesced += 1
+				leader = False
+			else:
+				call = _Call()
+				self._calls[key] = call
+				self.leaders += 1
+				leader = True
+
+		if not leader:
+			call.done.wait()
+			if call.error is not None:
+				raise call.error
+			return call.result, True
+
+		try:
+			call.result = fn()
+		except BaseException as exc:
+			call.error = exc
+			raise
+		finally:
+			with self.lock:
+				self._calls.pop(key, None)
+			call.done.set()
+		return call.result, False
+
+	def in_flight(self) -> int:
+		with self.lock:
+			return len(self._calls)
+
+	def stats(self) -> dict:
+		with self.lock:
+			return {
+				"in_flight": len(self._calls),
+				"upstream_calls": self.leaders,
+				"coalesced": self.coalesced,
+			}
+
+
+def prompt_key(*parts: str) -> str:
+	digest = hashlib.sha256()
+	for part in parts:
+		digest.update(part.encode("utf-8"))
+		digest.update(b"\x00")
+	return digest.hexdigest()
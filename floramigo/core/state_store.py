@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from floramigo.core.config import settings
+from floramigo.core.metrics import STATE_WRITE_SECONDS
+
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
+
+
+class JsonStateStore:
+	# Per-process JSON files: the original single-worker layout.
+	shared = False
+
+	def __init__(self, current_file: Path | None = None, history_file: Path | None = None, alerts_file: Path | None = None):
+		self.current_file = current_file or settings.sensor_data_file
+		self.history_file = history_file or settings.sensor_history_file
+		self.alerts_file = alerts_file or settings.alerts_file
+
+	def _load_json(self, path: Path, default):
+		try:
+			with open(path, "r", encoding="utf-8") as handle:
+				return json.load(handle)
+		except (FileNotFoundError, json.JSONDecodeError):
+			return default
+
+	def _save_json(self, path: Path, payload) -> None:
+		with STATE_WRITE_SECONDS.labels(path.stem).time():
+			with open(path, "w", encoding="utf-8") as handle:
+				json.dump(payload, handle, indent=2)
+
+	def load_current(self) -> dict | None:
+		return self._load_json(self.current_file, default=None)
+
+	def save_current(self, data: dict) -> None:
+		self._save_json(self.current_file, data)
+
+	def load_history(self, limit: int) -> list[dict]:
+		return self._load_json(self.history_file, default=[])[-limit:]
+
+	def save_history(self, history: list[dict]) -> None:
+		self._save_json(self.history_file, history)
+
+	def load_alerts(self, limit: int) -> list[dict]:
+		return self._load_json(self.alerts_file, default=[])[-limit:]
+
+	def save_alerts(self, alerts: list[dict]) -> None:
+		self._save_json(self.alerts_file, alerts)
+
+
+class SQLiteStateStore:
+	# One WAL-mode database shared by every worker; each write bumps a shared version counter
+	# so readers can tell cheaply whether anything changed since their last sync.
+	shared = True
+
+	SCHEMA = (
+		"CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)",
+		"CREATE TABLE IF NOT EXISTS current_reading (id INTEGER PRIMARY KEY CHECK (id = 1), payload TEXT NOT NULL)",
+		"CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY AUTOINCREMENT, saved_at REAL NOT NULL, payload TEXT NOT NULL)",
+		"CREATE TABLE IF NOT EXISTS alerts (id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL)",
+		"CREATE TABLE IF NOT EXISTS chat_history (id INTEGER PRIMARY KEY AUTOINCREMENT, role TEXT NOT NULL, content TEXT NOT NULL)",
+	)
+
+	def __init__(self, path: Path | None = None, timeout: float = 5.0):
+		self.path = Path(path or settings.state_db_file)
+		self.timeout = timeout
+		self.local = threading.local()
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		with self._transaction() as conn:
+			for statement in self.SCHEMA:
+				conn.execute(statement)
+			conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+			conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('store_id', ?)", (uuid.uuid4().hex[:8],))
+		self.store_id = self._meta("store_id")
+
+	def _conn(self) -> sqlite3.Connection:
+		# sqlite3 connections are not shared between threads, so each thread opens its own.
+		conn = getattr(self.local, "conn", None)
+		if conn is None:
+			conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+			conn.execute("PRAGMA journal_mode=WAL")
+			conn.execute("PRAGMA synchronous=NORMAL")
+			self.local.conn = conn
+		return conn
+
+	@contextmanager
+	def _transaction(self):
+		conn = self._conn()
+		started = time.perf_counter()
+		conn.execute("BEGIN IMMEDIATE")
+		try:
+			yield conn
+		except BaseException:
+			conn.execute("ROLLBACK")
+			raise
+		conn.execute("COMMIT")
+		STATE_WRITE_SECONDS.labels("sqlite").observe(time.perf_counter() - started)
+
+	def _bump(self, conn: sqlite3.Connection) -> None:
+		conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+
+	def _meta(self, key: str):
+		row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+		return row[0] if row else None
+
+	def version(self) -> int:
+		return int(self._meta("version") or 0)
+
+	def tag(self) -> str:
+		return f"{self.store_id}-{self.version()}"
+
+	def load_current(self) -> dict | None:
+		row = self._conn().execute("SELECT payload FROM current_reading WHERE id = 1").fetchone()
+		return json.loads(row[0]) if row else None
+
+	def save_current(self, data: dict) -> None:
+		with self._transaction() as conn:
+			conn.execute("INSERT OR REPLACE INTO current_reading (id, payload) VALUES (1, ?)", (json.dumps(data),))
+			self._bump(conn)
+
+	def append_history(self, entry: dict, keep: int, min_interval: float = 60.0) -> bool:
+		# The interval check runs inside the write transaction so that several workers
+		# ingesting at once still record at most one history row per interval.
+		now = time.time()
+		with self._transaction() as conn:
+			last = conn.execute("SELECT saved_at FROM history ORDER BY id DESC LIMIT 1").fetchone()
+			if last and now - last[0] < min_interval:
+				return False
+			cursor = conn.execute("INSERT INTO history (saved_at, payload) VALUES (?, ?)", (now, json.dumps(entry)))
+			conn.execute("DELETE FROM history WHERE id <= ?", (cursor.lastrowid - keep,))
+			self._bump(conn)
+		return True
+
+	def load_history(self, limit: int) -> list[dict]:
+		rows = self._conn().execute("SELECT payload FROM history ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+		return [json.loads(payload) for (payload,) in reversed(rows)]
+
+	def history_since(self, cursor: int) -> tuple[list[dict], int]:
+		rows = self._conn().execute("SELECT id, payload FROM history WHERE id > ? ORDER BY id", (cursor,)).fetchall()
+		return [json.loads(payload) for _, payload in rows], rows[-1][0] if rows else cursor
+
+	def append_alerts(self, alerts: list[dict], keep: int) -> None:
+		with self._transaction() as conn:
+			conn.executemany("INSERT INTO alerts (payload) VALUES (?)", [(json.dumps(alert),) for alert in alerts])
+			last_id = conn.execute("SELECT MAX(id) FROM alerts").fetchone()[0]
+			conn.execute("DELETE FROM alerts WHERE id <= ?", (last_id - keep,))
+			self._bump(conn)
+
+	def load_alerts(self, limit: int) -> list[dict]:
+		rows = self._conn().execute("SELECT payload FROM alerts ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+		return [json.loads(payload) for (payload,) in reversed(rows)]
+
+	def plant_name(self) -> str | None:
+		return self._meta("plant_name")
+
+	def set_plant_name(self, plant_name: str | None) -> None:
+		with self._transaction() as conn:
+			conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('plant_name', ?)", (plant_name,))
+			self._bump(conn)
+
+	def append_chat(self, messages: list[dict[str, str]], keep: int) -> None:
+		with self._transaction() as conn:
+			conn.executemany(
+				"INSERT INTO chat_history (role, content) VALUES (?, ?)",
+				[(message["role"], message["content"]) for message in messages],
+			)
+			last_id = conn.execute("SELECT MAX(id) FROM chat_history").fetchone()[0]
+			conn.execute("DELETE FROM chat_history WHERE id <= ?", (last_id - keep,))
+
+	def recent_chat(self, limit: int) -> list[dict[str, str]]:
+		rows = self._conn().execute("SELECT role, content FROM chat_history ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+		return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+
+class WriterLock:
+	# Advisory file lock that lets exactly one worker own the serial port.
+	def __init__(self, path: Path | None = None):
+		self.path = Path(path or settings.serial_lock_file)
+		self.handle = None
+
+	@property
+	def held(self) -> bool:
+		return self.handle is not None
+
+	def acquire(self) -> bool:
+		if self.handle is not None:
+			return True
+		if fcntl is None:
+			# No flock on this platform; run single-worker there.
+			self.handle = True
+			return True
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		handle = open(self.path, "a+")
+		try:
+			fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+		except OSError:
+			handle.close()
+			return False
+		self.handle = handle
+		return True
+
+	def release(self) -> None:
+		if self.handle is None:
+			return
+		if fcntl is not None:
+			fcntl.flock(self.handle, fcntl.LOCK_UN)
+			self.handle.close()
+		self.handle = None
+
+
+def build_state_store(backend: str | None = None):
+	if (backend or settings.state_backend) == "sqlite":
+		return SQLiteStateStore()
+	return JsonStateStore()
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from floramigo.core.phd import get_alerts, get_history, get_rolling_stats
+from floramigo.core.rag_pipeline import retrieve_care_tips
+from floramigo.pcd.profiles import get_profile, load_profiles
+
+
+TOOL_SPECS: list[dict[str, Any]] = [
+	{
+		"type": "function",
+		"function": {
+			"name": "get_recent_history",
+			"description": "Minute-level sensor readings (temperature °C, humidity %, soil moisture %, raw light), oldest first.",
+			"parameters": {
+				"type": "object",
+				"properties": {
+					"limit": {"type": "integer", "description": "Number of most recent readings (1-240).", "default": 30},
+				},
+			},
+		},
+	},
+	{
+		"type": "function",
+		"function": {
+			"name": "get_rolling_stats",
+			"description": "Min, max, mean, and change for each sensor over the most recent readings.",
+			"parameters": {
+				"type": "object",
+				"properties": {
+					"window": {"type": "integer", "description": "Number of recent minute-level readings (1-1440).", "default": 60},
+				},
+			},
+		},
+	},
+	{
+		"type": "function",
+		"function": {
+			"name": "get_recent_alerts",
+			"description": "Recent threshold alerts raised by the plant health daemon, newest last.",
+			"parameters": {
+				"type": "object",
+				"properties": {
+					"limit": {"type": "integer", "description": "Maximum alerts to return (1-50).", "default": 10},
+					"severity": {"type": "string", "enum": ["info", "warning", "critical"]},
+				},
+			},
+		},
+	},
+	{
+		"type": "function",
+		"function": {
+			"name": "get_plant_profile",
+			"description": "Care profile and common issues for a plant species.",
+			"parameters": {
+				"type": "object",
+				"properties": {
+					"plant_name": {"type": "string", "description": "Plant name, e.g. 'Snake Plant'."},
+				},
+				"required": ["plant_name"],
+			},
+		},
+	},
+	{
+		"type": "function",
+		"function": {
+			"name": "get_care_tips",
+			"description": "Short plant-care tips relevant to a topic such as watering, light, or humidity.",
+			"parameters": {
+				"type": "object",
+				"properties": {
+					"topic": {"type": "string"},
+					"plant_name": {"type": "string"},
+				},
+				"required": ["topic"],
+			},
+		},
+	},
+]
+
+
+def _clamp(value: Any, default: int, low: int, high: int) -> int:
+	try:
+		return max(low, min(high, int(value)))
+	except (TypeError, ValueError):
+		return default
+
+
+def _recent_history(limit: int = 30) -> list[dict]:
+	return [
+		{key: entry.get(key) for key in ("timestamp", "temperature", "humidity", "moisture_pct", "light_raw")}
+		for entry in get_history(_clamp(limit, 30, 1, 240))
+	]
+
+
+def _rolling_stats(window: int = 60) -> dict:
+	return get_rolling_stats(_clamp(window, 60, 1, 1440))
+
+
+def _recent_alerts(limit: int = 10, severity: str | None = None) -> list[dict]:
+	alerts = get_alerts()
+	if severity:
+		alerts = [alert for alert in alerts if alert.get("severity") == severity]
+	return alerts[-_clamp(limit, 10, 1, 50) :]
+
+
+def _plant_profile(plant_name: str = "") -> dict:
+	match = get_profile(plant_name)
+	if match is None:
+		return {"error": f"No profile for {plant_name!r}.", "known_plants": sorted(load_profiles())}
+	name, profile = match
+	return {"name": name, **profile}
+
+
+def _care_tips(topic: str = "", plant_name: str | None = None) -> list[str]:
+	return retrieve_care_tips(topic, plant_name)
+
+
+TOOL_HANDLERS: dict[str, Callable[..., Any]] = {
+	"get_recent_history": _recent_history,
+	"get_rolling_stats": _rolling_stats,
+	"get_recent_alerts": _recent_alerts,
+	"get_plant_profile": _plant_profile,
+	"get_care_tips": _care_tips,
+}
+
+
+def run_tool(name: str, arguments: str | None) -> str:
+	handler = TOOL_HANDLERS.get(name)
+	if handler is None:
+		return json.dumps({"error": f"Unknown tool {name!r}."})
+	try:
+		kwargs = json.loads(arguments or "{}")
+		if not isinstance(kwargs, dict):
+			raise ValueError("arguments must be a JSON object")
+		return json.dumps(handler(**kwargs), ensure_ascii=False)
+	except (TypeError, ValueError) as exc:
+		return json.dumps({"error": f"Invalid arguments for {name}: {exc}"})
+	except Exception as exc:
+		# A failing tool is reported to the model like bad arguments, never surfaced as a 500.
+		return json.dumps({"error": f"{name} failed: {exc}"})
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import zlib
+from collections import Counter
+from pathlib import Path
+
+from floramigo.core.bm25 import tokenize
+
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+
+MATRIX_FILE = "vectors.npy"
+IDF_FILE = "idf.npy"
+META_FILE = "meta.json"
+
+
+def _require_numpy() -> None:
+	if np is None:
+		raise RuntimeError("The vector index requires `numpy`. Install it or use the bm25 backend.")
+
+
+def corpus_fingerprint(doc_ids: list[str], texts: list[str]) -> str:
+	digest = hashlib.sha256()
+	for doc_id, text in zip(doc_ids, texts):
+		digest.update(doc_id.encode("utf-8"))
+		digest.update(b"\x00")
+		digest.update(text.encode("utf-8"))
+		digest.update(b"\x00")
+	return digest.hexdigest()
+
+
+class HashingVectorizer:
+	def __init__(self, dim: int = 1024):
+		_require_numpy()
+		self.dim = dim
+
+	def _features(self, text: str) -> Counter:
+		tokens = tokenize(text)
+		features = Counter(tokens)
+		features.update(f"{left}_{right}" for left, right in zip(tokens, tokens[1:]))
+		return features
+
+	def _hash(self, feature: str) -> tuple[int, float]:
+		# crc32 is stable across processes, unlike hash(), so persisted vectors stay valid.
+		value = zlib.crc32(feature.encode("utf-8"))
+		return value % self.dim, 1.0 if value & 0x80000000 else -1.0
+
+	def term_frequencies(self, texts: list[str]) -> np.ndarray:
+		matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+		for row, text in enumerate(texts):
+			for feature, count in self._features(text).items():
+				column, sign = self._hash(feature)
+				matrix[row, column] += sign * (1.0 + math.log(count))
+		return matrix
+
+	@staticmethod
+	def normalize(matrix: np.ndarray) -> np.ndarray:
+		norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+		norms[norms == 0] = 1.0
+		return matrix / norms
+
+
+class VectorIndex:
+	def __init__(self, doc_ids: list[str], matrix: np.ndarray, idf: np.ndarray, vectorizer: HashingVectorizer, fingerprint: str = ""):
+		self.doc_ids = doc_ids
+		self.matrix = matrix
+		self.idf = idf
+		self.vectorizer = vectorizer
+		self.fingerprint = fingerprint
+
+	def __len__(self) -> int:
+		return len(self.doc_ids)
+
+	@classmethod
+	def build(cls, doc_ids: list[str], texts: list[str], dim: int = 1024) -> VectorIndex:
+		vectorizer = HashingVectorizer(dim)
+		tf = vectorizer.term_frequencies(texts)
+		document_frequency = np.count_nonzero(tf, axis=0)
+		idf = np.log((1 + len(texts)) / (1 + document_frequency)).astype(np.float32) + 1.0
+		matrix = np.ascontiguousarray(vectorizer.normalize(tf * idf), dtype=np.float32)
+		return cls(list(doc_ids), matrix, idf, vectorizer, corpus_fingerprint(list(doc_ids), texts))
+
+	def save(self, directory: Path) -> None:
+		directory.mkdir(parents=True, exist_ok=True)
+		# Write to temporary names and swap them in so readers never see a half-written index.
+		for name, array in ((MATRIX_FILE, self.matrix), (IDF_FILE, self.idf)):
+			tmp_path = directory / f"{name}.tmp"
+			with open(tmp_path, "wb") as handle:
+				np.save(handle, array)
+			os.replace(tmp_path, directory / name)
+		meta_tmp = directory / f"{META_FILE}.tmp"
+		with open(meta_tmp, "w", encoding="utf-8") as handle:
+			json.dump({"dim": self.vectorizer.dim, "fingerprint": self.fingerprint, "doc_ids": self.doc_ids}, handle)
+		os.replace(meta_tmp, directory / META_FILE)
+
+	@classmethod
+	def load(cls, directory: Path, mmap: bool = True) -> VectorIndex:
+		_require_numpy()
+		with open(directory / META_FILE, "r", encoding="utf-8") as handle:
+			meta = json.load(handle)
+		matrix = np.load(directory / MATRIX_FILE, mmap_mode="r" if mmap else None)
+		idf = np.load(directory / IDF_FILE)
+		if matrix.shape != (len(meta["doc_ids"]), meta["dim"]):
+			raise ValueError(f"Vector index in {directory} does not match its metadata.")
+		return cls(meta["doc_ids"], matrix, idf, HashingVectorizer(meta["dim"]), meta.get("fingerprint", ""))
+
+	def embed_query(self, query: str) -> np.ndarray:
+		return self.vectorizer.normalize(self.vectorizer.term_frequencies([query]) * self.idf)[0]
+
+	def search(self, query: str, k: int = 5) -> list[tuple[str, float]]:
+		if not self.doc_ids or k <= 0:
+			return []
+		scores = self.matrix @ self.embed_query(query)
+		if k < len(scores):
+			top = np.argpartition(-scores, k)[:k]
+		else:
+			top = np.arange(len(scores))
+		top = top[np.argsort(-scores[top])]
+		return [(self.doc_ids[index], float(scores[index])) for index in top if scores[index] > 0]
@@ -0,0 +1,69 @@
+"""Care-knowledge documents built from the snippet library and plant profiles."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from floramigo.pcd.pcd_snippets import DEFAULT_SNIPPETS
+from floramigo.pcd.profiles import load_profiles
+
+
+@dataclass(frozen=True)
+class CareDocument:
+	doc_id: str
+	text: str
+	source: str
+	topic: str | None = None
+	plant: str | None = None
+
+
+def snippet_documents() -> list[CareDocument]:
+	return [
+		CareDocument(doc_id=f"snippet:{topic}:{index}", text=text, source="snippets", topic=topic)
+		for topic, snippets in DEFAULT_SNIPPETS.items()
+		for index, text in enumerate(snippets)
+	]
+
+
+def profile_documents(profiles: dict[str, dict] | None = None) -> list[CareDocument]:
+	documents: list[CareDocument] = []
+	for plant, profile in (profiles if profiles is not None else load_profiles()).items():
+		slug = plant.lower().replace(" ", "-")
+		plant_type = profile.get("Plant Type")
+		if plant_type:
+			documents.append(
+				CareDocument(
+					doc_id=f"profile:{slug}:type",
+					text=f"{plant} is a {plant_type.lower()} plant.",
+					source="profiles",
+					topic="general",
+					plant=plant,
+				)
+			)
+		for field, value in profile.get("Care Profile", {}).items():
+			name, _, unit = field.partition(" (")
+			label = f"{name.lower()} in {unit.rstrip(')')}" if unit else name.lower()
+			documents.append(
+				CareDocument(
+					doc_id=f"profile:{slug}:{name.lower().replace(' ', '-')}",
+					text=f"{plant} {label}: {value}.",
+					source="profiles",
+					topic=name.lower(),
+					plant=plant,
+				)
+			)
+		for index, issue in enumerate(profile.get("Common Issues", [])):
+			cause, _, signs = issue.partition(" → ")
+			documents.append(
+				CareDocument(
+					doc_id=f"profile:{slug}:issue:{index}",
+					text=f"{plant} common issue: {cause} ({signs})." if signs else f"{plant} common issue: {cause}.",
+					source="profiles",
+					topic="issues",
+					plant=plant,
+				)
+			)
+	return documents
+
+
+def build_care_documents() -> list[CareDocument]:
+	return snippet_documents() + profile_documents()
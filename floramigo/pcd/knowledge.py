@@ -0,0 +1,272 @@
+"""Incremental ingestion of markdown, text, and JSON care documents into an on-disk BM25 index."""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from floramigo.core.bm25 import BM25Index, tokenize
+from floramigo.core.config import settings
+from floramigo.pcd.corpus import CareDocument
+
+
+INDEX_VERSION = 1
+SUPPORTED_SUFFIXES = (".md", ".markdown", ".txt", ".json")
+MAX_CHUNK_WORDS = 120
+
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.*)$")
+
+
+def content_hash(text: str) -> str:
+	return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(paragraphs: list[str], max_words: int) -> list[str]:
+	chunks: list[str] = []
+	current: list[str] = []
+	count = 0
+	for paragraph in paragraphs:
+		words = paragraph.split()
+		# Paragraphs longer than a chunk are split on word boundaries.
+		while len(words) > max_words:
+			if current:
+				chunks.append(" ".join(current))
+				current, count = [], 0
+			chunks.append(" ".join(words[:max_words]))
+			words = words[max_words:]
+		if count + len(words) > max_words and current:
+			chunks.append(" ".join(current))
+			current, count = [], 0
+		if words:
+			current.append(" ".join(words))
+			count += len(words)
+	if current:
+		chunks.append(" ".join(current))
+	return chunks
+
+
+def chunk_text(text: str, max_words: int = MAX_CHUNK_WORDS) -> list[tuple[str | None, str]]:
+	# Markdown headings start a new section and become the topic of its chunks.
+	sections: list[tuple[str | None, list[str]]] = [(None, [])]
+	paragraph: list[str] = []
+
+	def flush() -> None:
+		if paragraph:
+			sections[-1][1].append(" ".join(paragraph))
+			paragraph.clear()
+
+	for line in text.splitlines():
+		stripped = line.strip()
+		heading = _HEADING_RE.match(stripped)
+		if heading:
+			flush()
+			sections.append((heading.group(1).strip().lower() or None, []))
+		elif not stripped:
+			flush()
+		else:
+			paragraph.append(stripped.lstrip("-*• ").strip() if stripped[:2] in ("- ", "* ", "• ") else stripped)
+	flush()
+	return [(topic, chunk) for topic, paragraphs in sections for chunk in _pack(paragraphs, max_words)]
+
+
+def _json_entries(payload) -> list[tuple[str | None, str | None, str]]:
+	# Accepts ["tip", ...], {"topic": ["tip", ...]}, or [{"text": ..., "topic": ..., "plant": ...}, ...].
+	if isinstance(payload, dict):
+		return [
+			(topic, None, text)
+			for topic, texts in payload.items()
+			for text in (texts if isinstance(texts, list) else [texts])
+			if isinstance(text, str)
+		]
+	entries = []
+	for item in payload if isinstance(payload, list) else []:
+		if isinstance(item, str):
+			entries.append((None, None, item))
+		elif isinstance(item, dict) and isinstance(item.get("text"), str):
+			entries.append((item.get("topic"), item.get("plant"), item["text"]))
+	return entries
+
+
+def chunk_file(path: Path, relative: str, max_words: int = MAX_CHUNK_WORDS) -> list[CareDocument]:
+	text = path.read_text(encoding="utf-8")
+	if path.suffix == ".json":
+		entries = [
+			(topic, plant, chunk)
+			for topic, plant, body in _json_entries(json.loads(text))
+			for _, chunk in chunk_text(body, max_words)
+		]
+	else:
+		entries = [(topic, None, chunk) for topic, chunk in chunk_text(text, max_words)]
+
+	documents: list[CareDocument] = []
+	seen: set[str] = set()
+	for topic, plant, chunk in entries:
+		# Ids come from content so unchanged chunks keep their id when neighbours are edited.
+		doc_id = f"kb:{relative}#{content_hash(chunk)[:16]}"
+		if doc_id in seen:
+			continue
+		seen.add(doc_id)
+		documents.append(CareDocument(doc_id=doc_id, text=chunk, source=relative, topic=topic, plant=plant))
+	return documents
+
+
+@dataclass
+class IngestReport:
+	files_scanned: int = 0
+	files_changed: int = 0
+	files_removed: int = 0
+	chunks_added: int = 0
+	chunks_removed: int = 0
+	chunks_unchanged: int = 0
+	seconds: float = 0.0
+	errors: dict[str, str] = field(default_factory=dict)
+
+
+class KnowledgeBase:
+	def __init__(self):
+		self.documents: dict[str, CareDocument] = {}
+		self.files: dict[str, dict] = {}
+		self.index = BM25Index()
+
+	def __len__(self) -> int:
+		return len(self.documents)
+
+	def _remove_file(self, relative: str) -> int:
+		entry = self.files.pop(relative, None)
+		if not entry:
+			return 0
+		for doc_id in entry["chunks"]:
+			self.documents.pop(doc_id, None)
+			self.index.remove(doc_id)
+		return len(entry["chunks"])
+
+	def ingest(self, source_dir: Path, max_words: int = MAX_CHUNK_WORDS) -> IngestReport:
+		# A missing directory would otherwise read as every indexed file deleted.
+		if not source_dir.is_dir():
+			raise FileNotFoundError(f"Knowledge directory not found: {source_dir}")
+		started = time.perf_counter()
+		report = IngestReport()
+		present: set[str] = set()
+		paths = sorted(path for path in source_dir.rglob("*") if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES)
+
+		for path in paths:
+			relative = path.relative_to(source_dir).as_posix()
+			present.add(relative)
+			report.files_scanned += 1
+			stat = path.stat()
+			entry = self.files.get(relative)
+			# Unchanged size and mtime means the file is not even read.
+			if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+				report.chunks_unchanged += len(entry["chunks"])
+				continue
+			try:
+				chunks = chunk_file(path, relative, max_words)
+			except (OSError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+				report.errors[relative] = str(exc)
+				continue
+
+			report.files_changed += 1
+			old_ids = set(entry["chunks"]) if entry else set()
+			new_ids = {document.doc_id for document in chunks}
+			for doc_id in old_ids - new_ids:
+				self.documents.pop(doc_id, None)
+				self.index.remove(doc_id)
+			for document in chunks:
+				if document.doc_id not in old_ids:
+					self.index.add(document.doc_id, tokenize(document.text))
+				self.documents[document.doc_id] = document
+			report.chunks_added += len(new_ids - old_ids)
+			report.chunks_removed += len(old_ids - new_ids)
+			report.chunks_unchanged += len(new_ids & old_ids)
+			self.files[relative] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "chunks": [document.doc_id for document in chunks]}
+
+		for relative in set(self.files) - present:
+			report.chunks_removed += self._remove_file(relative)
+			report.files_removed += 1
+
+		report.seconds = round(time.perf_counter() - started, 4)
+		return report
+
+	def to_payload(self) -> dict:
+		return {
+			"version": INDEX_VERSION,
+			"files": self.files,
+			"documents": [asdict(document) for document in self.documents.values()],
+			"bm25": {
+				"doc_terms": {doc_id: list(terms) for doc_id, terms in self.index.doc_terms.items()},
+				"postings": self.index.postings,
+				"doc_lengths": self.index.doc_lengths,
+			},
+		}
+
+	def save(self, path: Path) -> None:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = path.with_name(f"{path.name}.tmp")
+		with open(tmp_path, "w", encoding="utf-8") as handle:
+			json.dump(self.to_payload(), handle, ensure_ascii=False, separators=(",", ":"))
+		# Readers either see the old index or the new one, never a partial write.
+		os.replace(tmp_path, path)
+
+	@classmethod
+	def load(cls, path: Path) -> KnowledgeBase:
+		knowledge = cls()
+		try:
+			with open(path, "r", encoding="utf-8") as handle:
+				payload = json.load(handle)
+		except (FileNotFoundError, json.JSONDecodeError):
+			return knowledge
+		# A damaged index reads as empty, so the next ingest rebuilds it instead of failing at import.
+		try:
+			if payload.get("version") != INDEX_VERSION:
+				return knowledge
+
+			knowledge.files = payload["files"]
+			knowledge.documents = {row["doc_id"]: CareDocument(**row) for row in payload["documents"]}
+			bm25 = payload["bm25"]
+			# Postings are restored as stored so loading does not re-tokenize the corpus.
+			knowledge.index.postings = bm25["postings"]
+			knowledge.index.doc_lengths = bm25["doc_lengths"]
+			knowledge.index.doc_terms = {doc_id: tuple(terms) for doc_id, terms in bm25["doc_terms"].items()}
+			knowledge.index.total_length = sum(knowledge.index.doc_lengths.values())
+		except (AttributeError, KeyError, TypeError, ValueError):
+			return cls()
+		return knowledge
+
+
+def ingest_directory(
+	source_dir: Path | None = None,
+	index_file: Path | None = None,
+	rebuild: bool = False,
+	max_words: int = MAX_CHUNK_WORDS,
+) -> IngestReport:
+	source_dir = source_dir or settings.knowledge_dir
+	index_file = index_file or settings.knowledge_index_file
+	knowledge = KnowledgeBase() if rebuild else KnowledgeBase.load(index_file)
+	report = knowledge.ingest(source_dir, max_words)
+	if rebuild or report.files_changed or report.files_removed or not index_file.exists():
+		knowledge.save(index_file)
+	return report
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description="Ingest care documents into the Floramigo knowledge index.")
+	parser.add_argument("source", nargs="?", type=Path, default=None, help="Directory of .md, .txt, and .json files.")
+	parser.add_argument("--index", type=Path, default=None, help="Index file to update.")
+	parser.add_argument("--rebuild", action="store_true", help="Ignore the existing index and re-chunk every file.")
+	parser.add_argument("--max-words", type=int, default=MAX_CHUNK_WORDS)
+	args = parser.parse_args()
+
+	try:
+		report = ingest_directory(args.source, args.index, args.rebuild, args.max_words)
+	except FileNotFoundError as exc:
+		parser.exit(1, f"{exc}\n")
+	print(json.dumps(asdict(report), indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,133 @@
+"""Plant care profiles loaded from Floramigo_Plant_Profiles.json."""
+from __future__ import annotations
+
+import json
+import re
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from floramigo.core.config import settings
+
+
+ALIASES = {
+	"Snake Plant": [
+		"sansevieria",
+		"sansevieria trifasciata",
+		"dracaena trifasciata",
+		"mother in law's tongue",
+		"mother in laws tongue",
+		"viper's bowstring hemp",
+	],
+	"Spider Plant": ["chlorophytum", "chlorophytum comosum", "airplane plant", "spider ivy", "ribbon plant"],
+	"Peace Lily": ["spathiphyllum", "spath", "spathe flower", "white sails"],
+}
+
+MIN_SIMILARITY = 0.5
+# Words shared by many plant names; ignored when fuzzy matching so "rubber plant" does not match "spider plant".
+GENERIC_WORDS = {"plant", "plants", "my", "the", "a", "an"}
+RESOLUTION_CACHE_SIZE = 1024
+
+
+def normalize_name(name: str) -> str:
+	return " ".join(re.sub(r"[^a-z0-9' ]+", " ", name.lower()).replace("'", "").split())
+
+
+def _distinctive(key: str) -> str:
+	return " ".join(word for word in key.split() if word not in GENERIC_WORDS) or key
+
+
+def _trigrams(text: str) -> set[str]:
+	padded = f"  {text} "
+	return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=4)
+def load_profiles(path: Path | None = None) -> dict[str, dict]:
+	try:
+		with open(path or settings.plant_profiles_file, "r", encoding="utf-8") as handle:
+			return json.load(handle)
+	except (FileNotFoundError, json.JSONDecodeError):
+		return {}
+
+
+class ProfileIndex:
+	def __init__(self, profiles: dict[str, dict], aliases: dict[str, list[str]] | None = None):
+		self.profiles = profiles
+		# Every canonical name and alias maps to its canonical profile name.
+		self.names: dict[str, str] = {}
+		for name in profiles:
+			self.names[normalize_name(name)] = name
+		for name, alias_list in (ALIASES if aliases is None else aliases).items():
+			if name in profiles:
+				for alias in alias_list:
+					self.names.setdefault(normalize_name(alias), name)
+		self.grams = {key: _trigrams(_distinctive(key)) for key in self.names}
+		self.postings: dict[str, list[str]] = defaultdict(list)
+		for key, grams in self.grams.items():
+			for gram in grams:
+				self.postings[gram].append(key)
+		self._cache: dict[str, str | None] = {}
+
+	def _match(self, key: str) -> str | None:
+		if key in self.names:
+			return self.names[key]
+
+		# "my snake plant" or "snake plant leaves" contain a known name outright.
+		padded = f" {key} "
+		contained = [known for known in self.names if f" {known} " in padded]
+		if contained:
+			return self.names[max(contained, key=len)]
+
+		grams = _trigrams(_distinctive(key))
+		overlap: dict[str, int] = defaultdict(int)
+		for gram in grams:
+			for known in self.postings.get(gram, ()):
+				overlap[known] += 1
+		best, best_score = None, MIN_SIMILARITY
+		for known, shared in overlap.items():
+			score = 2 * shared / (len(grams) + len(self.grams[known]))
+			if score > best_score:
+				best, best_score = known, score
+		return self.names[best] if best else None
+
+	def resolve(self, plant_name: str | None) -> str | None:
+		if not plant_name:
+			return None
+		key = normalize_name(plant_name)
+		if not key:
+			return None
+		if key not in self._cache:
+			if len(self._cache) >= RESOLUTION_CACHE_SIZE:
+				self._cache.clear()
+			self._cache[key] = self._match(key)
+		return self._cache[key]
+
+	def get(self, plant_name: str | None) -> tuple[str, dict] | None:
+		name = self.resolve(plant_name)
+		return (name, self.profiles[name]) if name else None
+
+
+@lru_cache(maxsize=4)
+def get_profile_index(path: Path | None = None) -> ProfileIndex:
+	return ProfileIndex(load_profiles(path))
+
+
+def resolve_plant_name(plant_name: str | None) -> str | None:
+	return get_profile_index().resolve(plant_name)
+
+
+def get_profile(plant_name: str | None) -> tuple[str, dict] | None:
+	return get_profile_index().get(plant_name)
+
+
+def format_profile_for_llm(name: str, profile: dict) -> str:
+	lines = [f"Care profile for {name}:"]
+	if profile.get("Plant Type"):
+		lines.append(f"- Plant type: {profile['Plant Type']}")
+	lines.extend(f"- {field}: {value}" for field, value in profile.get("Care Profile", {}).items())
+	issues = profile.get("Common Issues", [])
+	if issues:
+		lines.append("Common issues:")
+		lines.extend(f"- {issue}" for issue in issues)
+	return "\n".join(lines)
@@ -0,0 +1,80 @@
+"""Numeric per-plant sensor thresholds compiled from plant profile care ranges."""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+from floramigo.pcd.profiles import get_profile
+
+
+RANGE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*[–-]\s*(\d+(?:\.\d+)?)\s*%?\s*(\+)?")
+AVOID_BELOW_PATTERN = re.compile(r"avoid below\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+# Soil moisture is described in words, so phrases map to moisture bands (low, critical, high).
+MOISTURE_BANDS = (
+	(("dry thoroughly", "dry out", "dry completely"), (10.0, 5.0, 60.0)),
+	(("consistently moist", "evenly moist", "keep moist"), (35.0, 20.0, 85.0)),
+	(("lightly moist", "slightly moist", "top inch"), (20.0, 10.0, 80.0)),
+)
+LOW_LIGHT_TOLERANT_FACTOR = 0.5
+
+
+def fahrenheit_to_celsius(value: float) -> float:
+	return round((value - 32) * 5 / 9, 1)
+
+
+def parse_range(text: str) -> tuple[float, float | None] | None:
+	match = RANGE_PATTERN.search(text)
+	if not match:
+		return None
+	low, high, open_ended = match.groups()
+	return float(low), None if open_ended else float(high)
+
+
+def compile_thresholds(profile: dict, defaults: Mapping[str, float]) -> dict[str, float]:
+	thresholds = dict(defaults)
+	care = profile.get("Care Profile", {})
+	for field, text in care.items():
+		name, _, unit = field.partition(" (")
+		name = name.lower()
+		if name == "temperature":
+			convert = fahrenheit_to_celsius if "°F" in unit else float
+			band = parse_range(text)
+			if band:
+				thresholds["temperature_low"] = convert(band[0])
+				if band[1] is not None:
+					thresholds["temperature_high"] = convert(band[1])
+			avoid = AVOID_BELOW_PATTERN.search(text)
+			if avoid:
+				thresholds["temperature_critical"] = convert(float(avoid.group(1)))
+		elif name == "humidity":
+			band = parse_range(text)
+			if band:
+				thresholds["humidity_low"] = band[0]
+				if band[1] is not None:
+					thresholds["humidity_high"] = band[1]
+		elif name == "soil moisture":
+			lowered = text.lower()
+			for phrases, (low, critical, high) in MOISTURE_BANDS:
+				if any(phrase in lowered for phrase in phrases):
+					thresholds.update(moisture_low=low, moisture_critical=critical, moisture_high=high)
+					break
+		elif name == "light" and "tolerates low light" in text.lower():
+			thresholds["light_low"] = defaults["light_low"] * LOW_LIGHT_TOLERANT_FACTOR
+	return thresholds
+
+
+@lru_cache(maxsize=64)
+def _compiled(plant_name: str, defaults: tuple[tuple[str, float], ...]) -> Mapping[str, float]:
+	match = get_profile(plant_name)
+	compiled = compile_thresholds(match[1], dict(defaults)) if match else dict(defaults)
+	return MappingProxyType(compiled)
+
+
+def plant_thresholds(plant_name: str | None, defaults: Mapping[str, float]) -> tuple[str | None, Mapping[str, float]]:
+	match = get_profile(plant_name)
+	if not match:
+		return None, MappingProxyType(dict(defaults))
+	return match[0], _compiled(match[0], tuple(sorted(defaults.items())))
@@ -0,0 +1,250 @@
+# Continuous microphone capture module
+
+from __future__ import annotations
+
+import io
+import time
+import wave
+from pathlib import Path
+from threading import Condition, Thread
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 1024
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return buffer.getvalue()
+
+
+def decode_wav(source: bytes | str | Path) -> tuple[np.ndarray, int]:
+    handle = wave.open(io.BytesIO(source) if isinstance(source, bytes) else str(source), "rb")
+    with handle:
+        if handle.getnchannels() != 1 or handle.getsampwidth() != 2:
+            raise ValueError("Expected mono 16-bit PCM audio.")
+        return np.frombuffer(handle.readframes(handle.getnframes()), dtype=np.int16), handle.getframerate()
+
+
+class RingBuffer:
+    # Fixed-size sample store addressed by absolute sample index, so a position handed out
+    # earlier stays meaningful after the buffer wraps, until it is overwritten.
+    def __init__(self, capacity: int, dtype=np.int16):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=dtype)
+        self.total = 0
+
+    @property
+    def oldest(self) -> int:
+        return max(0, self.total - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        count = len(samples)
+        samples = samples[-self.capacity :]
+        begin = (self.total + count - len(samples)) % self.capacity
+        first = min(len(samples), self.capacity - begin)
+        self.data[begin : begin + first] = samples[:first]
+        self.data[: len(samples) - first] = samples[first:]
+        self.total += count
+
+    def read(self, start: int, end: int | None = None) -> np.ndarray:
+        # Positions that have been overwritten are clamped to the oldest sample still held.
+        end = self.total if end is None else min(end, self.total)
+        start = max(start, self.oldest)
+        if end <= start:
+            return self.data[:0].copy()
+        begin = start % self.capacity
+        length = end - start
+        if begin + length <= self.capacity:
+            return self.data[begin : begin + length].copy()
+        return np.concatenate([self.data[begin:], self.data[: begin + length - self.capacity]])
+
+
+class AudioCapture:
+    # One input stream for the whole session. A thread copies every chunk into the ring buffer
+    # and stamps it with the monotonic clock; callers pull audio by sample position or timestamp.
+    def __init__(
+        self,
+        device,
+        sample_rate: int = SAMPLE_RATE,
+        chunk_size: int = CHUNK_SIZE,
+        buffer_seconds: float = 30.0,
+        preroll: float = 0.3,
+    ):
+        self.device = device
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.preroll = preroll
+        self.ring = RingBuffer(int(buffer_seconds * sample_rate))
+        self.changed = Condition()
+        self.anchor = (0, time.monotonic())
+        self.running = False
+        self.error: BaseException | None = None
+        self.thread: Thread | None = None
+
+    def start(self) -> "AudioCapture":
+        if self.running:
+            return self
+        self.running = True
+        self.anchor = (self.ring.total, time.monotonic())
+        self.thread = Thread(target=self._run, name="audio-capture", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        try:
+            self.device.stop_stream()
+            self.device.close()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "AudioCapture":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        try:
+            while self.running:
+                data = self.device.read(self.chunk_size, exception_on_overflow=False)
+                samples = np.frombuffer(data, dtype=np.int16)
+                with self.changed:
+                    self.ring.write(samples)
+                    self.anchor = (self.ring.total, time.monotonic())
+                    self.changed.notify_all()
+        except BaseException as exc:
+            self.error = exc
+        finally:
+            self.running = False
+            with self.changed:
+                self.changed.notify_all()
+
+    def position(self) -> int:
+        with self.changed:
+            return self.ring.total
+
+    def sample_at(self, timestamp: float) -> int:
+        # Maps a time.monotonic() reading onto the sample stream using the latest chunk's arrival.
+        with self.changed:
+            index, stamped = self.anchor
+        return max(0, index - int(round((stamped - timestamp) * self.sample_rate)))
+
+    def wait(self, position: int, timeout: float | None = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.changed:
+            while self.ring.total < position:
+                if not self.running:
+                    if self.error is not None:
+                        raise RuntimeError("Audio capture stopped") from self.error
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self.changed.wait(remaining)
+            return self.ring.total
+
+    def read(self, start: int, end: int | None = None) -> np.ndarray:
+        with self.changed:
+            return self.ring.read(start, end)
+
+    def read_since(self, position: int, timeout: float | None = 1.0) -> tuple[np.ndarray, int]:
+        # Blocks for at least one new chunk; a reader that fell a whole buffer behind resumes at the oldest sample.
+        total = self.wait(position + 1, timeout)
+        with self.changed:
+            start = max(position, self.ring.oldest)
+            return self.ring.read(start, total), total
+
+    def extract(self, start_time: float, end_time: float | None = None, preroll: float | None = None) -> np.ndarray:
+        preroll = self.preroll if preroll is None else preroll
+        start = self.sample_at(start_time - preroll)
+        end = None if end_time is None else self.sample_at(end_time)
+        if end is not None:
+            self.wait(end, timeout=max(0.0, end_time - time.monotonic()) + 1.0)
+        return self.read(start, end)
+
+    def record_utterance(
+        self,
+        start: int | None = None,
+        max_duration: float = 5.0,
+        silence_threshold: int = 500,
+        silence_duration: float = 2.0,
+        preroll: float | None = None,
+    ) -> np.ndarray:
+        # Same stopping rule as a fresh recording, but on audio already flowing: from `start`
+        # (default now), plus `preroll` seconds from before it, until enough quiet chunks in a row.
+        preroll = self.preroll if preroll is None else preroll
+        start = self.position() if start is None else start
+        limit = int(self.sample_rate / self.chunk_size * silence_duration)
+        end = start + int(max_duration * self.sample_rate)
+        cursor = start
+        silent_chunks = 0
+        while cursor < end:
+            target = min(end, cursor + self.chunk_size)
+            total = self.wait(target, timeout=1.0)
+            chunk = self.read(cursor, min(total, target))
+            cursor += len(chunk)
+            if total < target and not self.running:
+                break
+            if not len(chunk):
+                continue
+            if np.abs(chunk.astype(np.int32)).mean() < silence_threshold:
+                silent_chunks += 1
+                if silent_chunks > limit:
+                    break
+            else:
+                silent_chunks = 0
+        return self.read(start - int(preroll * self.sample_rate), cursor)
+
+
+class FileInputDevice:
+    # Stands in for a PyAudio input stream: plays a 16-bit mono WAV (path or bytes) at `speed`
+    # times real time (0 for as fast as it is read), then returns silence like an idle microphone.
+    def __init__(self, source: bytes | str | Path, speed: float = 1.0, loop: bool = False):
+        self.samples, self.sample_rate = decode_wav(source)
+        self.speed = speed
+        self.loop = loop
+        self.offset = 0
+        self.reads = 0
+        self.active = True
+        self.started = time.monotonic()
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.loop and self.offset >= len(self.samples)
+
+    def read(self, frames: int, exception_on_overflow: bool = True) -> bytes:
+        if not self.active:
+            raise OSError("Stream closed")
+        self.reads += 1
+        if self.loop and len(self.samples):
+            indexes = (self.offset + np.arange(frames)) % len(self.samples)
+            chunk = self.samples[indexes]
+        else:
+            chunk = self.samples[self.offset : self.offset + frames]
+            chunk = np.pad(chunk, (0, frames - len(chunk)))
+        self.offset += frames
+        if self.speed:
+            delay = self.started + self.offset / self.sample_rate / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return chunk.tobytes()
+
+    def stop_stream(self) -> None:
+        self.active = False
+
+    def close(self) -> None:
+        self.active = False
+
+    def is_active(self) -> bool:
+        return self.active
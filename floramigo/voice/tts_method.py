@@ -1,21 +1,21 @@
 # Text-to-Speech adapter module
 
+import io
+
 from gtts import gTTS
-import os
-import uuid
 import pygame
 
 def speak(text):
-    tts = gTTS(text)
-    filename = f"temp_audio_{uuid.uuid4().hex}.mp3"
-    tts.save(filename)
+    # Synthesize and play from memory; nothing is written to disk
+    buffer = io.BytesIO()
+    gTTS(text).write_to_fp(buffer)
+    buffer.seek(0)
 
     pygame.mixer.init()
-    pygame.mixer.music.load(filename)
+    pygame.mixer.music.load(buffer, "mp3")
     pygame.mixer.music.play()
 
     while pygame.mixer.music.get_busy():
-        continue
+        pygame.time.wait(20)
 
     pygame.mixer.quit()
-    os.remove(filename)
@@ -0,0 +1,292 @@
+# On-device wake word detection module
+
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400  # 25 ms analysis window
+HOP_LENGTH = 160  # 10 ms between frames, also the energy gate's step
+N_FFT = 512
+N_MELS = 26
+N_MFCC = 13
+
+
+def to_float(samples) -> np.ndarray:
+    samples = np.asarray(samples)
+    if samples.dtype == np.int16:
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32, copy=False)
+
+
+def frame_rms(samples: np.ndarray, hop: int = HOP_LENGTH) -> np.ndarray:
+    usable = len(samples) - len(samples) % hop
+    frames = samples[:usable].reshape(-1, hop)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+@lru_cache(maxsize=4)
+def mel_filterbank(sample_rate: int = SAMPLE_RATE, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    edges = to_hz(np.linspace(to_mel(20.0), to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def dct_matrix(n_mfcc: int = N_MFCC, n_mels: int = N_MELS) -> np.ndarray:
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    return (np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)).astype(np.float32)
+
+
+def mfcc(samples, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    signal = to_float(samples)
+    if len(signal) < FRAME_LENGTH:
+        signal = np.pad(signal, (0, FRAME_LENGTH - len(signal)))
+    emphasized = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+    count = 1 + (len(emphasized) - FRAME_LENGTH) // HOP_LENGTH
+    frames = np.lib.stride_tricks.sliding_window_view(emphasized, FRAME_LENGTH)[::HOP_LENGTH][:count]
+    spectrum = np.abs(np.fft.rfft(frames * np.hamming(FRAME_LENGTH).astype(np.float32), N_FFT)) ** 2
+    mel_energy = np.log(spectrum @ mel_filterbank(sample_rate).T + 1e-10)
+    # c0 tracks loudness, so it is dropped; mean removal cancels the microphone's fixed colouring.
+    cepstra = (mel_energy @ dct_matrix().T)[:, 1:]
+    return (cepstra - cepstra.mean(axis=0)).astype(np.float32)
+
+
+def cosine_cost(template: np.ndarray, query: np.ndarray) -> np.ndarray:
+    a = template / (np.linalg.norm(template, axis=1, keepdims=True) + 1e-9)
+    b = query / (np.linalg.norm(query, axis=1, keepdims=True) + 1e-9)
+    return 1.0 - a @ b.T
+
+
+def subsequence_dtw(template: np.ndarray, query: np.ndarray) -> float:
+    # Best match of the whole template against any stretch of the query, as mean cosine distance
+    # per template frame. Steps are limited to slopes between 1/2 and 2, so each template row
+    # depends only on the two rows before it and a row is one vectorised update over the query.
+    cost = cosine_cost(template, query)
+    rows, cols = cost.shape
+    if rows < 2 or cols < 2:
+        return float("inf")
+    inf = np.full(2, np.inf, dtype=cost.dtype)
+    before = np.concatenate([inf, np.full(cols, np.inf, dtype=cost.dtype)])
+    previous = np.concatenate([inf, cost[0]])  # free start anywhere in the query
+    for row in range(1, rows):
+        current_cost = cost[row]
+        shifted_cost = np.concatenate([inf[:1], current_cost[:-1]])
+        diagonal = previous[1:-1] + current_cost
+        faster = previous[:-2] + (shifted_cost + current_cost) / 2
+        slower = before[1:-1] + cost[row - 1] + current_cost
+        before, previous = previous, np.concatenate([inf, np.minimum(np.minimum(diagonal, faster), slower)])
+    return float(previous[2:].min() / rows)
+
+
+class EnergyGate:
+    # Frame-level voice activity by loudness over an adaptive noise floor.
+    def __init__(self, ratio: float = 3.0, min_rms: float = 0.004, adapt: float = 0.05):
+        self.ratio = ratio
+        self.min_rms = min_rms
+        self.adapt = adapt
+        self.floor: float | None = None
+
+    def threshold(self) -> float:
+        return max(self.min_rms, (self.floor or 0.0) * self.ratio)
+
+    def speech(self, rms: np.ndarray) -> np.ndarray:
+        active = np.empty(len(rms), dtype=bool)
+        for index, level in enumerate(rms):
+            if self.floor is None:
+                self.floor = float(level)
+            active[index] = level > self.threshold()
+            # Rise slowly even through "speech" so a fan switching on stops holding the gate open.
+            rate = self.adapt if not active[index] else self.adapt / 50
+            self.floor += rate * (float(level) - self.floor)
+        return active
+
+
+def trim_silence(samples: np.ndarray, ratio: float = 3.0, min_rms: float = 0.004, pad_frames: int = 3) -> np.ndarray:
+    rms = frame_rms(samples)
+    if not len(rms):
+        return samples
+    floor = float(np.percentile(rms, 10))
+    speech = np.flatnonzero(rms > max(min_rms, floor * ratio))
+    if not len(speech):
+        return samples[:0]
+    start = max(0, speech[0] - pad_frames) * HOP_LENGTH
+    end = min(len(rms), speech[-1] + 1 + pad_frames) * HOP_LENGTH
+    return samples[start:end]
+
+
+class KeywordSpotter:
+    # Streaming wake word detector. The energy gate segments the input into utterances, and only
+    # an utterance long enough to hold the phrase is turned into MFCCs and matched against the
+    # enrolled templates, so silence and short noises cost a few vector operations per chunk.
+    def __init__(
+        self,
+        templates: list[np.ndarray] | None = None,
+        threshold: float | None = None,
+        sample_rate: int = SAMPLE_RATE,
+        gate: EnergyGate | None = None,
+        preroll_ms: int = 200,
+        hangover_ms: int = 250,
+        min_speech_ms: int = 300,
+        max_utterance_ms: int = 3000,
+        cooldown_ms: int = 1500,
+        margin: float = 2.0,
+        min_threshold: float = 0.15,
+    ):
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(f"KeywordSpotter expects {SAMPLE_RATE} Hz audio, got {sample_rate}.")
+        self.templates: list[np.ndarray] = list(templates or [])
+        self.margin = margin
+        self.min_threshold = min_threshold
+        self.threshold = threshold
+        self.gate = gate or EnergyGate()
+        self.preroll_frames = preroll_ms // 10
+        self.hangover_frames = hangover_ms // 10
+        self.min_speech_frames = min_speech_ms // 10
+        self.max_frames = max_utterance_ms // 10
+        self.cooldown_frames = cooldown_ms // 10
+        self.last_score: float | None = None
+        self.stats = {"frames": 0, "utterances": 0, "evaluations": 0, "hits": 0}
+        self.reset()
+        if threshold is None and self.templates:
+            self.calibrate()
+
+    def reset(self) -> None:
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.preroll: deque[np.ndarray] = deque(maxlen=self.preroll_frames)
+        self.utterance: list[np.ndarray] = []
+        self.speech_frames = 0
+        self.silent_frames = 0
+        self.cooldown = 0
+
+    def enroll(self, samples) -> np.ndarray:
+        voiced = trim_silence(to_float(samples))
+        if len(voiced) < self.min_speech_frames * HOP_LENGTH:
+            raise ValueError("No speech found in the enrollment sample.")
+        template = mfcc(voiced)
+        self.templates.append(template)
+        self.calibrate()
+        return template
+
+    def calibrate(self) -> float:
+        # Leave-one-out: the worst distance from a template to its nearest sibling, times a margin.
+        # A few enrollment takes in one sitting vary less than later attempts, hence the floor.
+        nearest = [
+            min(subsequence_dtw(template, other) for j, other in enumerate(self.templates) if j != i)
+            for i, template in enumerate(self.templates)
+            if len(self.templates) > 1
+        ]
+        self.threshold = max([self.min_threshold] + [distance * self.margin for distance in nearest])
+        return self.threshold
+
+    def score(self, samples) -> float:
+        voiced = trim_silence(to_float(samples))
+        if not self.templates or len(voiced) < self.min_speech_frames * HOP_LENGTH:
+            return float("inf")
+        return self._match(mfcc(voiced))
+
+    def _match(self, features: np.ndarray) -> float:
+        return min(subsequence_dtw(template, features) for template in self.templates)
+
+    def feed(self, chunk) -> bool:
+        if not self.templates or self.threshold is None:
+            return False
+        samples = np.concatenate([self.pending, to_float(chunk)])
+        usable = len(samples) - len(samples) % HOP_LENGTH
+        self.pending = samples[usable:]
+        frames = samples[:usable].reshape(-1, HOP_LENGTH)
+        if not len(frames):
+            return False
+        self.stats["frames"] += len(frames)
+        active = self.gate.speech(np.sqrt(np.mean(frames * frames, axis=1)))
+        hit = False
+        for frame, speech in zip(frames, active):
+            if self.cooldown:
+                self.cooldown -= 1
+                continue
+            if self._step(frame, speech):
+                hit = True
+                self.cooldown = self.cooldown_frames
+                self.utterance, self.speech_frames, self.silent_frames = [], 0, 0
+                self.preroll.clear()
+        return hit
+
+    def flush(self) -> bool:
+        # Treats the end of the input as the end of the current utterance.
+        if not self.utterance or self.cooldown:
+            return False
+        return self._close()
+
+    def detect(self, samples) -> bool:
+        self.reset()
+        hit = self.feed(samples) or self.flush()
+        self.reset()
+        return hit
+
+    def _step(self, frame: np.ndarray, speech: bool) -> bool:
+        if not self.utterance:
+            if not speech:
+                self.preroll.append(frame)
+                return False
+            self.utterance = list(self.preroll)
+            self.preroll.clear()
+            self.stats["utterances"] += 1
+        self.utterance.append(frame)
+        if speech:
+            self.speech_frames += 1
+            self.silent_frames = 0
+        else:
+            self.silent_frames += 1
+        if self.silent_frames >= self.hangover_frames:
+            return self._close()
+        if len(self.utterance) >= self.max_frames:
+            # Long run-on speech: match what we have, then keep enough overlap for a phrase
+            # that straddles the boundary.
+            hit = self._evaluate(self.utterance)
+            keep = self.max_frames // 2
+            self.utterance = self.utterance[-keep:]
+            return hit
+        return False
+
+    def _close(self) -> bool:
+        utterance = self.utterance[: len(self.utterance) - self.silent_frames + self.preroll_frames // 2]
+        hit = self.speech_frames >= self.min_speech_frames and self._evaluate(utterance)
+        self.utterance, self.speech_frames, self.silent_frames = [], 0, 0
+        return hit
+
+    def _evaluate(self, frames: list[np.ndarray]) -> bool:
+        self.stats["evaluations"] += 1
+        self.last_score = self._match(mfcc(np.concatenate(frames)))
+        if self.last_score <= self.threshold:
+            self.stats["hits"] += 1
+            return True
+        return False
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {f"template_{index}": template for index, template in enumerate(self.templates)}
+        np.savez(path, threshold=np.float64(self.threshold if self.threshold is not None else np.nan), **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path, **kwargs) -> "KeywordSpotter":
+        with np.load(Path(path)) as data:
+            names = sorted((name for name in data.files if name.startswith("template_")), key=lambda name: int(name.split("_")[1]))
+            templates = [data[name] for name in names]
+            threshold = float(data["threshold"])
+        kwargs.setdefault("threshold", None if np.isnan(threshold) else threshold)
+        return cls(templates=templates, **kwargs)
@@ -0,0 +1,164 @@
+"""
+Persistent alert log and GET /alerts tests.
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from floramigo.core.alert_log import AlertLog, InvalidCursor, decode_cursor, encode_cursor, to_epoch
+from floramigo.core.phd import PlantHealthDaemon
+from floramigo.core.state_store import JsonStateStore, WriterLock
+
+
+def alert(alert_type, severity, timestamp, device=None):
+    payload = {"type": alert_type, "severity": severity, "message": f"{alert_type} alert", "timestamp": timestamp}
+    if device:
+        payload["device"] = device
+    return payload
+
+
+@pytest.fixture
+def log(tmp_path):
+    log = AlertLog(tmp_path / "alerts.db", max_rows=0)
+    kinds = [("moisture_low", "warning"), ("moisture_critical", "critical"), ("humidity_low", "info")]
+    # Pairs of alerts share a timestamp so paging has to break ties on id.
+    log.append([alert(*kinds[i % 3], 1_700_000_000 + i // 2, device=f"dev-{i % 2}") for i in range(30)])
+    return log
+
+
+def walk(log, **filters):
+    seen, cursor = [], None
+    while True:
+        page, cursor = log.query(limit=4, cursor=cursor, **filters)
+        seen.extend(page)
+        if cursor is None:
+            return seen
+
+
+class TestAlertLog:
+    """Test storage, filtering, and keyset pagination."""
+
+    def test_pages_cover_everything_once_newest_first(self, log):
+        """Walking the cursor should return every alert exactly once in descending time."""
+        alerts = walk(log)
+        assert len(alerts) == 30
+        assert len({entry["id"] for entry in alerts}) == 30
+        assert [entry["id"] for entry in alerts] == sorted((entry["id"] for entry in alerts), reverse=True)
+
+    def test_filters(self, log):
+        """Type, severity, device, and since should narrow the results."""
+        assert {entry["type"] for entry in walk(log, type="moisture_low")} == {"moisture_low"}
+        assert len(walk(log, severity="critical")) == 10
+        assert {entry["device"] for entry in walk(log, device="dev-1")} == {"dev-1"}
+        assert len(walk(log, since=1_700_000_010)) == 10
+        assert walk(log, type="moisture_low", severity="critical") == []
+
+    def test_retention_keeps_newest_rows(self, tmp_path):
+        """max_rows should drop the oldest alerts."""
+        log = AlertLog(tmp_path / "alerts.db", max_rows=5)
+        log.append([alert("moisture_low", "warning", 1_700_000_000 + i) for i in range(8)])
+        assert log.count() == 5
+        oldest = log.query(limit=10)[0][-1]
+        assert to_epoch(oldest["timestamp"]) == 1_700_000_003
+
+    def test_cursor_round_trip_and_rejects_garbage(self):
+        """Cursors should decode to what was encoded and reject anything else."""
+        assert decode_cursor(encode_cursor(1700000000.25, 42)) == (1700000000.25, 42)
+        with pytest.raises(InvalidCursor):
+            decode_cursor("not-a-cursor")
+
+    def test_since_accepts_epoch_and_iso(self):
+        """since may be epoch seconds or an ISO timestamp."""
+        assert to_epoch("1700000000") == 1700000000.0
+        assert to_epoch("2026-01-01T00:00:00") == to_epoch(to_epoch("2026-01-01T00:00:00"))
+        with pytest.raises(ValueError):
+            to_epoch("yesterday")
+
+    @pytest.mark.parametrize(
+        "where, index",
+        [
+            ("type = ? AND ts >= ?", "alert_log_type_ts"),
+            ("severity = ? AND ts >= ?", "alert_log_severity_ts"),
+            ("device = ? AND ts >= ?", "alert_log_device_ts"),
+            ("ts >= ? AND (ts, id) < (?, ?)", "alert_log_ts"),
+        ],
+    )
+    def test_queries_use_an_index_without_sorting(self, log, where, index):
+        """Each filter should be an index range scan with no separate sort."""
+        plan = " ".join(
+            row[-1]
+            for row in log._conn().execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM alert_log WHERE {where} ORDER BY ts DESC, id DESC LIMIT 10",
+                (1,) * where.count("?"),
+            )
+        )
+        assert index in plan
+        assert "TEMP B-TREE" not in plan
+
+
+class TestDaemonHook:
+    """Test that raised alerts reach the log."""
+
+    def test_alerts_are_logged_with_device_and_plant(self, tmp_path):
+        """Alerts beyond the in-memory window should still be queryable."""
+        log = AlertLog(tmp_path / "alerts.db")
+        store = JsonStateStore(tmp_path / "current.json", tmp_path / "history.json", tmp_path / "alerts.json")
+        daemon = PlantHealthDaemon(
+            plant_name="Peace Lily", store=store, writer_lock=WriterLock(tmp_path / "serial.lock"), alert_log=log, device_id="shelf-2"
+        )
+        for _ in range(60):
+            daemon.ingest_reading({"temperature": 22, "humidity": 50, "moisture_pct": 5, "light_raw": 600})
+        assert len(daemon.alerts) == daemon.max_alerts
+        logged, _ = log.query(type="moisture_critical", limit=100)
+        assert len(logged) == 60
+        assert logged[0]["device"] == "shelf-2"
+        assert logged[0]["plant"] == "Peace Lily"
+
+    def test_injected_store_does_not_use_global_log(self, tmp_path):
+        """A daemon built around its own store should leave the global log alone."""
+        store = JsonStateStore(tmp_path / "current.json", tmp_path / "history.json", tmp_path / "alerts.json")
+        daemon = PlantHealthDaemon(plant_name="Peace Lily", store=store, writer_lock=WriterLock(tmp_path / "serial.lock"))
+        with patch("floramigo.core.phd.get_alert_log") as global_log:
+            daemon.ingest_reading({"temperature": 22, "humidity": 50, "moisture_pct": 5, "light_raw": 600})
+        global_log.assert_not_called()
+        assert daemon.alert_log is None and daemon.alerts
+
+    def test_log_failure_does_not_fail_ingest(self, tmp_path):
+        """A broken log should be reported, not raised out of ingest."""
+        log = AlertLog(tmp_path / "alerts.db")
+        store = JsonStateStore(tmp_path / "current.json", tmp_path / "history.json", tmp_path / "alerts.json")
+        daemon = PlantHealthDaemon(
+            plant_name="Peace Lily", store=store, writer_lock=WriterLock(tmp_path / "serial.lock"), alert_log=log
+        )
+        with patch.object(log, "append", side_effect=sqlite3.OperationalError("database is locked")):
+            daemon.ingest_reading({"temperature": 22, "humidity": 50, "moisture_pct": 5, "light_raw": 600})
+        assert daemon.alerts[-1]["type"] == "moisture_critical"
+
+
+class TestAlertsEndpoint:
+    """Test GET /alerts."""
+
+    def test_paginates_with_filters(self, log):
+        """Should return a page plus a cursor that fetches the next one."""
+        client = TestClient(app)
+        with patch("api.routers.alerts.get_alert_log", return_value=log):
+            first = client.get("/alerts", params={"severity": "warning", "limit": 6}).json()
+            second = client.get("/alerts", params={"severity": "warning", "limit": 6, "cursor": first["next_cursor"]}).json()
+        assert len(first["alerts"]) == 6 and len(second["alerts"]) == 4
+        assert second["next_cursor"] is None
+        assert all(entry["severity"] == "warning" for entry in first["alerts"] + second["alerts"])
+
+    def test_bad_parameters_are_rejected(self, log):
+        """Malformed cursors and timestamps should be client errors."""
+        client = TestClient(app)
+        with patch("api.routers.alerts.get_alert_log", return_value=log):
+            assert client.get("/alerts", params={"cursor": "garbage"}).status_code == 400
+            assert client.get("/alerts", params={"since": "last week"}).status_code == 400
+            assert client.get("/alerts", params={"limit": 0}).status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,161 @@
+"""
+Continuous ring-buffer audio capture tests.
+"""
+
+import time
+import wave
+
+import numpy as np
+import pytest
+from floramigo.voice.capture import AudioCapture, FileInputDevice, RingBuffer, decode_wav, encode_wav
+
+RATE = 16000
+
+
+def write_wav(path, samples):
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(RATE)
+        handle.writeframes(samples.astype(np.int16).tobytes())
+    return path
+
+
+def tone(seconds, amplitude=8000):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.cos(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.int16)
+
+
+class BrokenDevice:
+    def read(self, frames, exception_on_overflow=True):
+        raise OSError("Input overflowed")
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestRingBuffer:
+    """Test absolute positions across wraparound."""
+
+    def test_wraparound_keeps_the_newest_samples(self):
+        """Reads by absolute position should survive the buffer wrapping."""
+        ring = RingBuffer(5)
+        ring.write(np.arange(3, dtype=np.int16))
+        ring.write(np.arange(3, 7, dtype=np.int16))
+        assert ring.total == 7
+        assert ring.read(2).tolist() == [2, 3, 4, 5, 6]
+        assert ring.read(4, 6).tolist() == [4, 5]
+
+    def test_overwritten_positions_are_clamped(self):
+        """Asking for audio that has been overwritten returns what is still held."""
+        ring = RingBuffer(4)
+        ring.write(np.arange(10, dtype=np.int16))
+        assert ring.oldest == 6
+        assert ring.read(0).tolist() == [6, 7, 8, 9]
+
+    def test_oversized_write(self):
+        """A write larger than the buffer keeps only its tail."""
+        ring = RingBuffer(3)
+        ring.write(np.arange(8, dtype=np.int16))
+        assert ring.read(0).tolist() == [5, 6, 7]
+
+
+class TestWavBytes:
+    """Test in-memory WAV encoding."""
+
+    def test_round_trip(self):
+        """Encoded bytes should decode back to the same samples and rate."""
+        samples = tone(0.25)
+        data = encode_wav(samples, RATE)
+        assert data[:4] == b"RIFF"
+        decoded, rate = decode_wav(data)
+        assert rate == RATE
+        assert np.array_equal(decoded, samples)
+
+    def test_fake_device_reads_bytes(self):
+        """The fake input device should accept WAV bytes as well as a path."""
+        device = FileInputDevice(encode_wav(tone(0.1)), speed=0)
+        assert np.array_equal(np.frombuffer(device.read(160), dtype=np.int16), tone(0.1)[:160])
+
+    def test_rejects_stereo(self, tmp_path):
+        """Only mono 16-bit audio is supported."""
+        with wave.open(str(tmp_path / "stereo.wav"), "wb") as handle:
+            handle.setnchannels(2)
+            handle.setsampwidth(2)
+            handle.setframerate(RATE)
+            handle.writeframes(b"\x00" * 400)
+        with pytest.raises(ValueError):
+            decode_wav(tmp_path / "stereo.wav")
+
+
+class TestAudioCapture:
+    """Test capture against a file-backed fake input device."""
+
+    def test_stream_has_no_gaps(self, tmp_path):
+        """Reading position by position should reproduce the input exactly."""
+        audio = np.concatenate([tone(0.4), silence(0.2), tone(0.4, 3000)])
+        device = FileInputDevice(write_wav(tmp_path / "in.wav", audio), speed=20)
+        collected, position = [], 0
+        with AudioCapture(device) as capture:
+            while position < len(audio):
+                samples, position = capture.read_since(position)
+                collected.append(samples)
+        assert np.array_equal(np.concatenate(collected)[: len(audio)], audio)
+
+    def test_recording_keeps_preroll_and_stops_on_silence(self, tmp_path):
+        """Speech that began before the recording started should be kept, and quiet should end it."""
+        audio = np.concatenate([silence(1.0), tone(0.5), silence(3.0)])
+        device = FileInputDevice(write_wav(tmp_path / "in.wav", audio), speed=10)
+        with AudioCapture(device, preroll=0.5) as capture:
+            capture.wait(int(1.2 * RATE))
+            recording = capture.record_utterance(silence_duration=0.3, max_duration=5.0)
+        onset = np.flatnonzero(recording)[0]
+        assert 0 < onset < int(0.5 * RATE)
+        assert np.count_nonzero(recording) >= int(0.45 * RATE)
+        assert len(recording) < int(1.5 * RATE)
+
+    def test_recording_from_an_earlier_position(self, tmp_path):
+        """A caller holding a position, such as a wake word hit, gets everything after it."""
+        audio = np.concatenate([silence(0.5), tone(0.3), silence(2.0)])
+        device = FileInputDevice(write_wav(tmp_path / "in.wav", audio), speed=10)
+        with AudioCapture(device) as capture:
+            hit = int(0.4 * RATE)
+            capture.wait(int(1.0 * RATE))
+            recording = capture.record_utterance(start=hit, silence_duration=0.2, preroll=0.0)
+        assert np.flatnonzero(recording)[0] == int(0.1 * RATE)
+
+    def test_extract_by_timestamp(self, tmp_path):
+        """A monotonic time window should map to about that much audio."""
+        device = FileInputDevice(write_wav(tmp_path / "in.wav", tone(1.0)), speed=1, loop=True)
+        with AudioCapture(device) as capture:
+            capture.wait(RATE // 4)
+            started = time.monotonic()
+            clip = capture.extract(started, started + 0.25, preroll=0.1)
+        assert abs(len(clip) - int(0.35 * RATE)) <= 2 * capture.chunk_size
+
+    def test_one_stream_for_many_recordings(self, tmp_path):
+        """Repeated recordings should reuse the same device rather than reopening it."""
+        device = FileInputDevice(write_wav(tmp_path / "in.wav", tone(0.5)), speed=20, loop=True)
+        with AudioCapture(device) as capture:
+            for _ in range(3):
+                assert len(capture.record_utterance(max_duration=0.2, preroll=0.0)) == pytest.approx(0.2 * RATE, abs=1024)
+            assert device.is_active()
+        assert not device.is_active()
+
+    def test_device_errors_surface_to_readers(self):
+        """A failing input stream should raise in the caller instead of hanging it."""
+        capture = AudioCapture(BrokenDevice()).start()
+        with pytest.raises(RuntimeError):
+            capture.wait(RATE, timeout=2.0)
+        capture.stop()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
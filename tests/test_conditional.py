@@ -0,0 +1,63 @@
+"""
+Conditional GET and compression tests for polled endpoints.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from floramigo.core.phd import plant_health_daemon
+
+client = TestClient(app)
+
+READING = {"temperature": 22.0, "humidity": 45.0, "moisture_pct": 40, "light_raw": 200}
+
+
+class TestConditionalGet:
+    """Test ETag and If-None-Match handling."""
+
+    @pytest.mark.parametrize("path", ["/diagnose", "/ingest/current"])
+    def test_not_modified_skips_status_computation(self, path):
+        """A matching If-None-Match should get 304 without rebuilding the payload."""
+        plant_health_daemon.ingest_reading(READING)
+        first = client.get(path)
+        etag = first.headers["etag"]
+        assert first.status_code == 200
+
+        with patch("api.routers.phd.get_plant_status") as status, patch("api.routers.ingest.get_current_readings") as current:
+            second = client.get(path, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert not status.called and not current.called
+
+    def test_new_reading_changes_etag(self):
+        """Ingesting a reading should invalidate the previous tag."""
+        plant_health_daemon.ingest_reading(READING)
+        etag = client.get("/diagnose").headers["etag"]
+        plant_health_daemon.ingest_reading({**READING, "moisture_pct": 12})
+
+        response = client.get("/diagnose", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["data"]["moisture"] == 12
+
+    def test_endpoints_have_distinct_tags(self):
+        """Different representations of the same state should not share a tag."""
+        assert client.get("/diagnose").headers["etag"] != client.get("/ingest/current").headers["etag"]
+
+
+class TestCompression:
+    """Test gzip for larger payloads."""
+
+    def test_large_responses_are_gzipped(self):
+        """Payloads over the minimum size should be compressed when the client accepts gzip."""
+        large = {"status": "fair", "issues": ["Soil moisture is low"] * 100}
+        with patch("api.routers.phd.get_plant_status", return_value=large):
+            response = client.get("/diagnose", headers={"Accept-Encoding": "gzip", "If-None-Match": '"stale"'})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == large
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
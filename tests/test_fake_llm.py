@@ -0,0 +1,97 @@
+"""
+Fake LLM server tests for offline benchmarking.
+"""
+
+import random
+import socket
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from benchmarks.fake_llm import FakeLLMConfig, create_app
+from floramigo.core.llm_client import FloramigoLLMClient, build_message
+
+
+FAST = dict(latency_ms=0, tokens_per_second=0, reply_tokens=12)
+
+
+def completion(client, **extra):
+    return client.post(
+        "/v1/chat/completions",
+        json={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Should I water?"}], **extra},
+    )
+
+
+class TestFakeLLMServer:
+    """Test the OpenAI-compatible fake server."""
+
+    def test_completion_shape_and_determinism(self):
+        """Same prompt should yield the same OpenAI-shaped reply."""
+        client = TestClient(create_app(FakeLLMConfig(**FAST)))
+        first = completion(client).json()
+        second = completion(client).json()
+
+        assert first["object"] == "chat.completion"
+        assert first["choices"][0]["message"]["content"] == second["choices"][0]["message"]["content"]
+        assert first["usage"]["completion_tokens"] == 12
+
+    def test_max_tokens_caps_reply(self):
+        """Should respect the request's max_tokens."""
+        client = TestClient(create_app(FakeLLMConfig(**FAST)))
+        data = completion(client, max_tokens=5).json()
+        assert len(data["choices"][0]["message"]["content"].split()) == 5
+
+    def test_error_injection(self):
+        """Should fail with the configured status when error rate is 1."""
+        client = TestClient(create_app(FakeLLMConfig(error_rate=1.0, error_status=429, **FAST)))
+        assert completion(client).status_code == 429
+
+    def test_streaming_chunks(self):
+        """Should stream SSE chunks terminated by [DONE]."""
+        client = TestClient(create_app(FakeLLMConfig(**FAST)))
+        body = completion(client, stream=True).text
+        events = [line for line in body.splitlines() if line.startswith("data: ")]
+
+        assert events[-1] == "data: [DONE]"
+        assert len(events) == 12 + 2
+
+    def test_latency_sampling_is_seeded(self):
+        """Same seed should give the same latency sequence."""
+        config = FakeLLMConfig(latency_ms=200, latency_jitter=0.4)
+        samples = [config.sample_latency(random.Random(f"7:{i}")) for i in range(5)]
+        again = [config.sample_latency(random.Random(f"7:{i}")) for i in range(5)]
+        assert samples == again
+
+
+class TestLLMClientAgainstFakeServer:
+    """Test FloramigoLLMClient over real HTTP against the fake server."""
+
+    @pytest.fixture
+    def base_url(self):
+        uvicorn = pytest.importorskip("uvicorn")
+        pytest.importorskip("openai")
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        server = uvicorn.Server(
+            uvicorn.Config(create_app(FakeLLMConfig(**FAST)), host="127.0.0.1", port=port, log_level="error")
+        )
+        thread = threading.Thread(target=server.run, daemon=True)
+        thread.start()
+        while not server.started:
+            time.sleep(0.01)
+        yield f"http://127.0.0.1:{port}/v1"
+        server.should_exit = True
+        thread.join(timeout=5)
+
+    def test_client_uses_base_url_without_real_key(self, base_url):
+        """Should complete a chat call offline through the base URL setting."""
+        client = FloramigoLLMClient(base_url=base_url)
+        assert client.available
+        reply = client.chat([build_message("user", "How is my plant?")])
+        assert len(reply.split()) == 12
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Fast-path intent router tests.
+"""
+
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from benchmarks.intent import SAMPLE_STATUS
+from floramigo.core.intent import ADVICE, HUMIDITY, LIGHT, MOISTURE, STATUS, TEMPERATURE, classify_intent, telemetry_answer
+from floramigo.core.orchestrator import FloramigoOrchestrator
+
+
+QUERIES = Path(__file__).resolve().parents[1] / "benchmarks" / "data" / "intent_queries.json"
+
+
+class TestClassifier:
+    """Test rule-based intent classification."""
+
+    def test_telemetry_question(self):
+        """Should route factual moisture questions to the fast path."""
+        assert classify_intent("What's the soil moisture?") == MOISTURE
+
+    def test_status_question(self):
+        """Should route general check-ins to the status template."""
+        assert classify_intent("How’s my plant?") == STATUS
+
+    def test_advice_question(self):
+        """Should keep decisions and explanations on the LLM."""
+        assert classify_intent("Should I water my snake plant?") == ADVICE
+        assert classify_intent("Why are the leaves yellow?") == ADVICE
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "How much light does a snake plant need?",
+            "What is the ideal humidity for a fern?",
+            "Is my plant getting too much sun?",
+            "What temperature does a peace lily prefer?",
+        ],
+    )
+    def test_care_questions_mentioning_a_metric(self, question):
+        """Questions about what a plant needs should reach the LLM, not the live reading."""
+        assert classify_intent(question) == ADVICE
+
+    def test_current_reading_phrasings(self):
+        """Questions that ask for the current value should still take the fast path."""
+        assert classify_intent("What is my soil moisture now?") == MOISTURE
+        assert classify_intent("What's the humidity reading?") == HUMIDITY
+        assert classify_intent("How much light does it get?") == LIGHT
+        assert classify_intent("How much light does my snake plant get? Should I move it?") == ADVICE
+
+    def test_labeled_set_accuracy(self):
+        """Should classify the labeled query set with high accuracy."""
+        rows = json.loads(QUERIES.read_text(encoding="utf-8"))
+        correct = sum(classify_intent(row["query"]) == row["intent"] for row in rows)
+        assert correct / len(rows) >= 0.9
+
+
+class TestTemplates:
+    """Test templated telemetry answers."""
+
+    def test_moisture_answer_uses_reading(self):
+        """Should answer with the soil observation and timestamp."""
+        answer = telemetry_answer(MOISTURE, SAMPLE_STATUS)
+        assert "18%" in answer
+        assert "2026-03-06T10:30:00" in answer
+
+    def test_reading_without_matching_observation(self):
+        """Should fall back to the plain reading instead of starting with None."""
+        status = {**SAMPLE_STATUS, "issues": [], "good_points": []}
+        answer = telemetry_answer(TEMPERATURE, status)
+        assert answer.startswith("Temperature is 23.5°C.")
+
+    def test_unavailable_status(self):
+        """Should fall back to the unavailable summary."""
+        status = {"status": "unavailable", "summary": "Sensor data not available.", "data": None}
+        assert telemetry_answer(MOISTURE, status) == "Sensor data not available."
+
+
+class TestOrchestratorFastPath:
+    """Test that telemetry questions skip the LLM."""
+
+    def test_fast_path_skips_llm(self):
+        """Should not call the LLM for a telemetry question."""
+        llm_client = Mock(available=True, model="gpt-4o-mini")
+        orchestrator = FloramigoOrchestrator(llm_client=llm_client)
+        with patch("floramigo.core.orchestrator.get_plant_status", return_value=SAMPLE_STATUS):
+            result = orchestrator.chat("What's the soil moisture?")
+
+        llm_client.chat.assert_not_called()
+        assert result["intent"] == MOISTURE
+        assert "18%" in result["response"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
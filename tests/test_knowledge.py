@@ -0,0 +1,151 @@
+"""
+Knowledge-base ingestion tests.
+"""
+
+import json
+import os
+from dataclasses import replace
+from unittest.mock import patch
+
+import pytest
+from floramigo.core import rag_pipeline
+from floramigo.core.bm25 import tokenize
+from floramigo.core.config import settings
+from floramigo.pcd.knowledge import KnowledgeBase, chunk_text, ingest_directory
+
+
+@pytest.fixture
+def source(tmp_path):
+    source = tmp_path / "knowledge"
+    source.mkdir()
+    (source / "orchids.md").write_text(
+        "# Orchid watering\n\nSoak orchid bark for ten minutes, then drain completely.\n\n"
+        "# Orchid light\n\nOrchids like bright filtered light from an east window.\n",
+        encoding="utf-8",
+    )
+    (source / "tips.txt").write_text("Wipe dusty leaves so they can photosynthesize.\n", encoding="utf-8")
+    (source / "fern.json").write_text(
+        json.dumps([{"text": "Boston ferns want constantly damp soil and misting.", "topic": "watering", "plant": "Boston Fern"}]),
+        encoding="utf-8",
+    )
+    return source
+
+
+def touch_later(path, text):
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestChunking:
+    """Test splitting documents into chunks."""
+
+    def test_headings_become_topics(self):
+        """Markdown headings should start a new chunk and set its topic."""
+        chunks = chunk_text("# Light\n\nBright indirect light.\n\n# Water\n\nWater weekly.")
+        assert chunks == [("light", "Bright indirect light."), ("water", "Water weekly.")]
+
+    def test_long_paragraphs_are_split(self):
+        """Chunks should not exceed the word limit."""
+        chunks = chunk_text(" ".join(f"word{i}" for i in range(25)), max_words=10)
+        assert [len(chunk.split()) for _, chunk in chunks] == [10, 10, 5]
+
+
+class TestIncrementalIngest:
+    """Test content-hashed incremental indexing."""
+
+    def test_initial_ingest(self, source, tmp_path):
+        """Should chunk every supported file and persist the index."""
+        index_file = tmp_path / "index.json"
+        report = ingest_directory(source, index_file)
+        assert report.files_changed == 3
+        assert report.chunks_added == 4
+        knowledge = KnowledgeBase.load(index_file)
+        assert len(knowledge) == 4
+        assert any(document.plant == "Boston Fern" for document in knowledge.documents.values())
+
+    def test_unchanged_files_are_skipped(self, source, tmp_path):
+        """A second run without edits should not touch the index."""
+        index_file = tmp_path / "index.json"
+        ingest_directory(source, index_file)
+        report = ingest_directory(source, index_file)
+        assert report.files_changed == 0
+        assert report.chunks_unchanged == 4
+
+    def test_only_changed_chunks_reindexed(self, source, tmp_path):
+        """Editing one section should replace only that chunk."""
+        index_file = tmp_path / "index.json"
+        ingest_directory(source, index_file)
+        path = source / "orchids.md"
+        touch_later(path, path.read_text(encoding="utf-8").replace("ten minutes", "fifteen minutes"))
+
+        report = ingest_directory(source, index_file)
+        assert (report.files_changed, report.chunks_added, report.chunks_removed, report.chunks_unchanged) == (1, 1, 1, 3)
+        knowledge = KnowledgeBase.load(index_file)
+        assert knowledge.index.search(tokenize("fifteen minutes"), k=1)
+        assert not knowledge.index.search(tokenize("ten"), k=1)
+
+    def test_deleted_files_are_removed(self, source, tmp_path):
+        """Chunks from deleted files should leave the index."""
+        index_file = tmp_path / "index.json"
+        ingest_directory(source, index_file)
+        (source / "tips.txt").unlink()
+        report = ingest_directory(source, index_file)
+        assert (report.files_removed, report.chunks_removed) == (1, 1)
+        assert not KnowledgeBase.load(index_file).index.search(tokenize("dusty"), k=1)
+
+    def test_loaded_index_matches_fresh_build(self, source, tmp_path):
+        """Persisted postings should score the same as a rebuilt index."""
+        index_file = tmp_path / "index.json"
+        fresh = KnowledgeBase()
+        fresh.ingest(source)
+        fresh.save(index_file)
+        query = tokenize("orchid light window")
+        assert KnowledgeBase.load(index_file).index.search(query, k=3) == fresh.index.search(query, k=3)
+
+    def test_malformed_index_is_rebuilt(self, source, tmp_path):
+        """An index with the right version but a broken shape should load empty and be rebuilt."""
+        index_file = tmp_path / "index.json"
+        ingest_directory(source, index_file)
+        payload = json.loads(index_file.read_text(encoding="utf-8"))
+        del payload["bm25"]["postings"]
+        payload["documents"][0]["unexpected"] = True
+        index_file.write_text(json.dumps(payload), encoding="utf-8")
+
+        assert len(KnowledgeBase.load(index_file)) == 0
+        index_file.write_text("[]", encoding="utf-8")
+        assert len(KnowledgeBase.load(index_file)) == 0
+        report = ingest_directory(source, index_file)
+        assert report.chunks_added == 4
+
+    def test_missing_source_keeps_index(self, source, tmp_path):
+        """A mistyped source directory should fail without emptying the saved index."""
+        index_file = tmp_path / "index.json"
+        ingest_directory(source, index_file)
+        saved = index_file.read_text(encoding="utf-8")
+
+        with pytest.raises(FileNotFoundError):
+            ingest_directory(tmp_path / "knowledgee", index_file)
+        assert index_file.read_text(encoding="utf-8") == saved
+        assert len(KnowledgeBase.load(index_file)) == 4
+
+
+class TestHotSwap:
+    """Test that retrieval picks up a rewritten index."""
+
+    def test_refresh_swaps_retriever(self, source, tmp_path):
+        """retrieve_care_tips should see new knowledge after the index file changes."""
+        index_file = tmp_path / "index.json"
+        patched = replace(settings, knowledge_index_file=index_file, knowledge_reload_interval=0.0, retrieval_backend="bm25")
+        with patch.object(rag_pipeline, "settings", patched), patch.object(rag_pipeline, "retriever", rag_pipeline.retriever):
+            rag_pipeline.refresh_retriever(force=True)
+            assert not any("orchid" in tip.lower() for tip in rag_pipeline.retrieve_care_tips("orchid bark soak"))
+
+            ingest_directory(source, index_file)
+            assert any("orchid" in tip.lower() for tip in rag_pipeline.retrieve_care_tips("orchid bark soak"))
+            assert rag_pipeline.refresh_retriever() is False
+        rag_pipeline.refresh_retriever(force=True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
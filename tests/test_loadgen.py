@@ -0,0 +1,97 @@
+"""
+Load generator tests.
+"""
+
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from benchmarks.loadgen import RequestFactory, parse_mix, parse_server_timing, run_load, summarize
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.post("/ingest/telemetry")
+    def ingest():
+        return {"accepted": True}
+
+    @app.get("/diagnose")
+    def diagnose():
+        return {"status": "good"}
+
+    @app.post("/ask")
+    def ask(response: Response):
+        response.headers["Server-Timing"] = "retrieval;dur=0.05, llm;dur=12.5, total;dur=13"
+        return {"response": "Water lightly."}
+
+    return app
+
+
+def run(**kwargs):
+    async def go():
+        transport = httpx.ASGITransport(app=build_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadgen") as client:
+            return await run_load(client, **kwargs)
+
+    return asyncio.run(go())
+
+
+class TestParsing:
+    """Test mix and header parsing."""
+
+    def test_parse_mix(self):
+        """Should read weights and default a bare name to 1."""
+        assert parse_mix("ingest=6, diagnose=3,ask") == {"ingest": 6.0, "diagnose": 3.0, "ask": 1.0}
+
+    def test_parse_mix_rejects_unknown_and_empty(self):
+        """Unknown endpoints and all-zero weights are errors."""
+        with pytest.raises(ValueError):
+            parse_mix("upload=1")
+        with pytest.raises(ValueError):
+            parse_mix("ask=0")
+
+    def test_parse_server_timing(self):
+        """Should extract each stage's duration."""
+        assert parse_server_timing("cache;dur=0.1, llm;desc=\"model\";dur=812.5") == {"cache": 0.1, "llm": 812.5}
+
+    def test_request_factory_is_seeded(self):
+        """The same seed should produce the same requests."""
+        first, second = RequestFactory(3), RequestFactory(3)
+        assert [first.build("ask") for _ in range(5)] == [second.build("ask") for _ in range(5)]
+        assert first.build("ingest")[1] == "/ingest/telemetry"
+
+
+class TestSummary:
+    """Test per-endpoint statistics."""
+
+    def test_error_and_rate_limit_shares(self):
+        """5xx and transport failures are errors; 429s are counted separately."""
+        summary = summarize([0.01] * 10, Counter({200: 6, 304: 1, 429: 1, 503: 1, 0: 1}), elapsed=2.0)
+        assert summary["ok"] == 7
+        assert summary["throughput_rps"] == 3.5
+        assert summary["error_rate"] == 0.2
+        assert summary["rate_limited_rate"] == 0.1
+        assert summary["latency_ms"]["p50"] == 10.0
+
+
+class TestRunLoad:
+    """Test driving an in-process app."""
+
+    def test_closed_loop_mix(self):
+        """Should hit every endpoint in the mix and collect /ask stages."""
+        report = run(mix={"ingest": 2, "diagnose": 1, "ask": 1}, duration=0.3, concurrency=4)
+        assert set(report["endpoints"]) == {"ingest", "diagnose", "ask"}
+        assert report["overall"]["error_rate"] == 0.0
+        assert report["ask_stages_ms"]["llm"]["p50"] == 12.5
+
+    def test_open_loop_rate(self):
+        """A fixed arrival rate should send about rate * duration requests."""
+        report = run(mix={"diagnose": 1}, duration=0.5, rate=40)
+        assert report["overall"]["requests"] == 20
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
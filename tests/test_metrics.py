@@ -0,0 +1,215 @@
+"""
+In-process metrics and /metrics endpoint tests.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from benchmarks.intent import SAMPLE_STATUS
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.main import app
+from api.middleware.metrics import MetricsMiddleware
+from api.middleware.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from api.routers.ask import server_timing
+from floramigo.core.metrics import (
+    ASK_STAGE_SECONDS,
+    HTTP_REQUEST_SECONDS,
+    READINGS_INGESTED,
+    STATE_WRITE_SECONDS,
+    Registry,
+    StageTimer,
+    _Metric,
+)
+from floramigo.core.orchestrator import FloramigoOrchestrator
+from floramigo.core.phd import PlantHealthDaemon
+from floramigo.core.state_store import JsonStateStore, WriterLock
+
+
+class TestRegistry:
+    """Test metric types and the text exposition format."""
+
+    def test_counter_labels(self):
+        """Labelled counters should render one sample per label set."""
+        registry = Registry()
+        counter = registry.counter("demo_total", "Demo counter.", ("kind",))
+        counter.labels("a").inc()
+        counter.labels("a").inc(2)
+        counter.labels("b").inc()
+        text = registry.render()
+        assert "# TYPE demo_total counter" in text
+        assert 'demo_total{kind="a"} 3' in text
+        assert 'demo_total{kind="b"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Bucket counts should be cumulative and end with +Inf."""
+        registry = Registry()
+        histogram = registry.histogram("demo_seconds", "Demo histogram.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+        text = registry.render()
+        assert 'demo_seconds_bucket{le="0.1"} 1' in text
+        assert 'demo_seconds_bucket{le="1"} 3' in text
+        assert 'demo_seconds_bucket{le="+Inf"} 4' in text
+        assert "demo_seconds_count 4" in text
+        assert "demo_seconds_sum 4.25" in text
+
+    def test_function_gauge_is_read_at_scrape_time(self):
+        """Callback gauges should report the value current at render time."""
+        registry = Registry()
+        values = {("x",): 0.25}
+        registry.gauge("demo_ratio", "Demo gauge.", ("cache",), function=lambda: values)
+        values[("x",)] = 0.5
+        assert 'demo_ratio{cache="x"} 0.5' in registry.render()
+
+    def test_summary_quantiles(self):
+        """Summaries should report window quantiles plus running sum and count."""
+        registry = Registry()
+        summary = registry.summary("demo_latency", "Demo summary.", quantiles=(0.5, 0.9), window=10)
+        for value in range(1, 21):
+            summary.observe(value)
+        text = registry.render()
+        assert 'demo_latency{quantile="0.5"} 15' in text
+        assert 'demo_latency{quantile="0.9"} 19' in text
+        assert "demo_latency_sum 210" in text
+        assert "demo_latency_count 20" in text
+
+    def test_get_or_create_and_type_conflict(self):
+        """Re-registering returns the same metric; a different type is an error."""
+        registry = Registry()
+        assert registry.counter("demo_total", "Demo.") is registry.counter("demo_total", "Demo.")
+        with pytest.raises(ValueError):
+            registry.histogram("demo_total", "Demo.")
+
+    def test_wrong_label_count(self):
+        """Label values must match the declared label names."""
+        with pytest.raises(ValueError):
+            Registry().counter("demo_total", "Demo.", ("a", "b")).labels("only-one")
+
+    def test_label_values_are_escaped(self):
+        """Quotes and newlines in label values should be escaped."""
+        registry = Registry()
+        registry.counter("demo_total", "Demo.", ("path",)).labels('a"b\nc').inc()
+        assert 'demo_total{path="a\\"b\\nc"} 1' in registry.render()
+
+    def test_metric_base_is_abstract(self):
+        """A metric type must define its children and samples."""
+        with pytest.raises(TypeError):
+            _Metric("demo_total", "Demo.")
+
+
+class TestMetricsMiddleware:
+    """Test per-route request latency."""
+
+    def test_labels_use_route_template(self):
+        """Path parameters should collapse into the route template."""
+        demo = FastAPI()
+
+        @demo.get("/plants/{name}")
+        def plant(name: str):
+            return {"name": name}
+
+        demo.add_middleware(MetricsMiddleware, enabled=True)
+        client = TestClient(demo)
+        child = HTTP_REQUEST_SECONDS.labels("GET", "/plants/{name}", "200")
+        before = child.count
+        client.get("/plants/basil")
+        client.get("/plants/fern")
+        client.get("/missing")
+        assert child.count == before + 2
+        assert HTTP_REQUEST_SECONDS.labels("GET", "unmatched", "404").count >= 1
+
+    def test_rate_limited_requests_keep_route(self):
+        """A 429 from the rate limiter should be recorded under the route it was aimed at."""
+        demo = FastAPI()
+
+        @demo.post("/ask")
+        def ask():
+            return {"ok": True}
+
+        demo.add_middleware(RateLimitMiddleware, limiters={"ask": TokenBucketLimiter(0.01, 1)}, enabled=True)
+        demo.add_middleware(MetricsMiddleware, enabled=True)
+        client = TestClient(demo)
+        limited = HTTP_REQUEST_SECONDS.labels("POST", "/ask", "429")
+        before = limited.count
+        assert [client.post("/ask").status_code for _ in range(2)] == [200, 429]
+        assert limited.count == before + 1
+
+
+class TestInstrumentation:
+    """Test hot-path instrumentation points."""
+
+    def test_ingest_and_state_writes(self, tmp_path):
+        """Ingesting should count the reading and time the JSON writes."""
+        store = JsonStateStore(tmp_path / "current.json", tmp_path / "history.json", tmp_path / "alerts.json")
+        daemon = PlantHealthDaemon(store=store, writer_lock=WriterLock(tmp_path / "serial.lock"))
+        readings_before = READINGS_INGESTED.value("metrics-test")
+        writes_before = STATE_WRITE_SECONDS.labels("current").count
+        daemon.ingest_reading({"temperature": 22, "humidity": 50, "moisture_pct": 45, "light_raw": 600}, source="metrics-test")
+        assert READINGS_INGESTED.value("metrics-test") == readings_before + 1
+        assert STATE_WRITE_SECONDS.labels("current").count == writes_before + 1
+
+
+class TestAskTimings:
+    """Test the per-stage /ask breakdown."""
+
+    def test_stage_timer_accumulates(self):
+        """Repeated stages should add up and the total should cover them."""
+        timer = StageTimer()
+        with timer.stage("cache"):
+            pass
+        with timer.stage("cache"):
+            pass
+        timings = timer.milliseconds()
+        assert list(timings) == ["cache", "total"]
+        assert timings["total"] >= timings["cache"]
+
+    def test_chat_reports_llm_stages(self):
+        """An LLM answer should time retrieval, prompt assembly, and the model call."""
+        llm_client = Mock(available=True, model="demo-model")
+        llm_client.chat.return_value = "Water lightly."
+        orchestrator = FloramigoOrchestrator(llm_client=llm_client, tool_calling=False)
+        orchestrator.response_cache = None
+        before = ASK_STAGE_SECONDS.labels("llm").count
+        with patch("floramigo.core.orchestrator.get_plant_status", return_value=SAMPLE_STATUS), patch(
+            "floramigo.core.orchestrator.format_sensor_context_for_llm", return_value="[SENSOR DATA]"
+        ):
+            result = orchestrator.chat("Why are the leaves drooping?", plant_name="Peace Lily")
+        assert {"profile", "status", "intent", "prompt", "retrieval", "sensor_context", "llm", "total"} <= set(result["timings"])
+        assert ASK_STAGE_SECONDS.labels("llm").count == before + 1
+
+    def test_server_timing_header(self):
+        """The header should list every stage with its duration in milliseconds."""
+        assert server_timing({"llm": 812.5, "total": 820.25}) == "llm;dur=812.5, total;dur=820.25"
+
+    def test_ask_route_timings_are_opt_in(self):
+        """/ask should always send Server-Timing but only include timings in the body on request."""
+        client = TestClient(app)
+        with patch("floramigo.core.orchestrator.get_plant_status", return_value=SAMPLE_STATUS):
+            plain = client.post("/ask", json={"message": "What's the soil moisture?"}, headers={"X-Client-Key": "timings-test"})
+            detailed = client.post(
+                "/ask",
+                json={"message": "What's the soil moisture?", "include_timings": True},
+                headers={"X-Client-Key": "timings-test"},
+            )
+        assert "total;dur=" in plain.headers["server-timing"]
+        assert plain.json()["timings"] is None
+        assert "telemetry" in detailed.json()["timings"]
+
+
+class TestMetricsEndpoint:
+    """Test the /metrics endpoint on the real app."""
+
+    def test_exposition(self):
+        """Should serve Prometheus text including route latency and cache gauges."""
+        client = TestClient(app)
+        client.get("/health")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'floramigo_http_request_seconds_count{method="GET",route="/health",status="200"}' in response.text
+        assert 'floramigo_cache_hit_ratio{cache="retrieval"}' in response.text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
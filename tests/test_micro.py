@@ -0,0 +1,75 @@
+"""
+Micro-benchmark suite tests.
+"""
+
+import json
+
+import pytest
+from benchmarks.micro import (
+    DEFAULT_BASELINE,
+    DEVICE_COUNTS,
+    HISTORY_SIZES,
+    case_key,
+    compare,
+    measure,
+    merge_rounds,
+    run_suite,
+)
+
+
+class TestMeasure:
+    """Test timing and aggregation helpers."""
+
+    def test_measure_reports_per_call_microseconds(self):
+        """Should report per-call times with min no greater than median."""
+        result = measure(lambda: sum(range(100)), min_time=0.01, repeat=3)
+        assert 0 < result["min_us"] <= result["median_us"]
+        assert result["calls"] >= 3
+
+    def test_case_key(self):
+        """Parameters should be encoded into a stable key."""
+        assert case_key("ingest_reading", history=240, devices=8) == "ingest_reading[history=240,devices=8]"
+        assert case_key("parse_reading") == "parse_reading"
+
+    def test_merge_rounds_takes_median(self):
+        """One outlier round should not move the merged figure."""
+        rounds = [{"a": {"median_us": value, "min_us": value, "calls": 10}} for value in (10.0, 11.0, 30.0)]
+        assert merge_rounds(rounds)["a"] == {"median_us": 11.0, "min_us": 11.0, "calls": 30}
+
+
+class TestCompare:
+    """Test baseline comparison."""
+
+    def test_flags_slowdowns_beyond_threshold(self):
+        """Only cases slower than baseline by more than the threshold are regressions."""
+        baseline = {"fast": {"min_us": 10.0}, "slow": {"min_us": 10.0}, "gone": {"min_us": 1.0}}
+        results = {"fast": {"min_us": 11.0}, "slow": {"min_us": 14.0}, "new": {"min_us": 5.0}}
+        report = compare(results, baseline, threshold=0.25)
+        assert report["regressions"] == ["slow"]
+        assert report["missing"] == ["gone"]
+        assert report["cases"]["new"]["ratio"] is None
+        assert report["cases"]["fast"]["ratio"] == 1.1
+
+
+class TestSuite:
+    """Test the benchmark cases themselves."""
+
+    def test_small_suite_covers_every_hot_path(self):
+        """A minimal run should produce every case family."""
+        results = run_suite(history_sizes=(5,), device_counts=(2,), min_time=0.001, repeat=1)
+        families = {key.split("[")[0] for key in results}
+        assert families == {"parse_reading", "get_relevant_snippets", "ingest_reading", "get_plant_status", "sensor_context", "system_prompt"}
+        assert "ingest_reading[alerts=yes,history=5,devices=2]" in results
+
+    def test_stored_baseline_matches_default_cases(self):
+        """The committed baseline should cover the default history sizes and device counts."""
+        with open(DEFAULT_BASELINE, "r", encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+        for history in HISTORY_SIZES:
+            for devices in DEVICE_COUNTS:
+                assert case_key("ingest_reading", history=history, devices=devices) in baseline
+                assert case_key("system_prompt", cache="cold", history=history, devices=devices) in baseline
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,61 @@
+"""
+Model tier routing tests.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from benchmarks.intent import SAMPLE_STATUS
+from floramigo.core.model_router import ModelRouter, ModelTier, score_complexity
+from floramigo.core.orchestrator import FloramigoOrchestrator
+
+
+TIERS = {
+    "light": ModelTier("light", "small-model", 100),
+    "standard": ModelTier("standard", "mid-model", 300),
+    "heavy": ModelTier("heavy", "large-model", 800),
+}
+
+
+class TestComplexityScoring:
+    """Test query complexity scores."""
+
+    def test_greeting_scores_zero(self):
+        """Greetings should be the cheapest tier."""
+        assert score_complexity("Hi there!") == 0
+
+    def test_symptoms_and_issues_raise_score(self):
+        """Symptom keywords and sensor issues should add to the score."""
+        plain = score_complexity("Tell me about my plant")
+        sick = score_complexity("Leaves are yellow with brown spots and drooping", SAMPLE_STATUS)
+        assert sick >= plain + 4
+
+
+class TestModelRouter:
+    """Test tier selection."""
+
+    def test_routes_by_score(self):
+        """Should pick light, standard, and heavy tiers by score."""
+        router = ModelRouter(TIERS, light_max_score=1, heavy_min_score=4)
+
+        assert router.select("Thanks!").name == "light"
+        assert router.select("Can you suggest a good place for my snake plant in the living room?").name == "light"
+        assert router.select("The leaves look yellow", SAMPLE_STATUS).name == "standard"
+        assert router.select("Yellow leaves, brown tips and mushy stems", SAMPLE_STATUS).name == "heavy"
+        assert router.stats()["routed"] == {"light": 2, "standard": 1, "heavy": 1}
+
+    def test_orchestrator_passes_tier_to_llm(self):
+        """Should call the LLM with the tier's model and token budget."""
+        llm_client = Mock(available=True, model="mid-model")
+        llm_client.chat.return_value = "Water lightly."
+        orchestrator = FloramigoOrchestrator(llm_client=llm_client, model_router=ModelRouter(TIERS))
+        orchestrator.response_cache = None
+        with patch("floramigo.core.orchestrator.get_plant_status", return_value=SAMPLE_STATUS):
+            orchestrator.chat("Thanks!")
+
+        _, kwargs = llm_client.chat.call_args
+        assert kwargs == {"model": "small-model", "max_tokens": 100}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,80 @@
+"""
+Plant profile index and fuzzy name resolution tests.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+from benchmarks.intent import SAMPLE_STATUS
+from floramigo.core.orchestrator import FloramigoOrchestrator
+from floramigo.pcd.profiles import ProfileIndex, get_profile, load_profiles, resolve_plant_name
+
+
+class TestResolvePlantName:
+    """Test canonical name resolution."""
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("Snake Plant", "Snake Plant"),
+            ("snake plnt", "Snake Plant"),
+            ("Sansevieria", "Snake Plant"),
+            ("Dracaena trifasciata", "Snake Plant"),
+            ("my spider plant", "Spider Plant"),
+            ("spathiphyllum", "Peace Lily"),
+            ("pease lily", "Peace Lily"),
+        ],
+    )
+    def test_resolves_typos_and_aliases(self, name, expected):
+        """Should map free-text names to the canonical profile."""
+        assert resolve_plant_name(name) == expected
+
+    @pytest.mark.parametrize("name", ["Basil", "rubber plant", "plant", "", None])
+    def test_unknown_names(self, name):
+        """Should not force unrelated names onto a profile."""
+        assert resolve_plant_name(name) is None
+
+    def test_get_profile_returns_canonical_entry(self):
+        """Should return the canonical name with its profile."""
+        name, profile = get_profile("sansevieria")
+        assert name == "Snake Plant"
+        assert "Care Profile" in profile
+
+    def test_resolutions_are_cached(self):
+        """Repeated lookups should be served from the resolution cache."""
+        index = ProfileIndex(load_profiles())
+        with patch.object(index, "_match", wraps=index._match) as match:
+            for _ in range(3):
+                index.resolve("Snake  PLNT")
+        assert match.call_count == 1
+
+    def test_fuzzy_lookup_is_fast(self):
+        """Uncached fuzzy matches should take well under a millisecond."""
+        index = ProfileIndex(load_profiles())
+        started = time.perf_counter()
+        for _ in range(200):
+            index._match("spidr plant")
+        assert (time.perf_counter() - started) / 200 < 0.001
+
+
+class TestProfilePrompt:
+    """Test profile injection into the system prompt."""
+
+    def test_profile_and_issues_injected(self):
+        """Should add the resolved care profile and common issues."""
+        with patch("floramigo.core.orchestrator.format_sensor_context_for_llm", return_value="Sensor context"):
+            prompt = FloramigoOrchestrator(tool_calling=False)._system_prompt("sansevieria", "Should I water?", True, SAMPLE_STATUS)
+        assert "The user is asking about a Snake Plant." in prompt
+        assert "Care profile for Snake Plant:" in prompt
+        assert "- Overwatering → yellow leaves, root rot" in prompt
+
+    def test_unknown_plant_keeps_name(self):
+        """Should fall back to the user's wording without a profile section."""
+        prompt = FloramigoOrchestrator(tool_calling=False)._system_prompt("Basil", "Should I water?", False)
+        assert "The user is asking about a Basil." in prompt
+        assert "Care profile" not in prompt
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,146 @@
+"""
+Rate limiting and admission control tests.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.middleware.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+
+
+def build_client(ask_burst=2, ingest_burst=3, max_concurrency=8):
+    app = FastAPI()
+
+    @app.post("/ask")
+    def ask():
+        return {"ok": True}
+
+    @app.post("/ingest/telemetry")
+    def ingest():
+        return {"ok": True}
+
+    @app.get("/ingest/current")
+    def current():
+        return {"ok": True}
+
+    @app.get("/ask/cache")
+    def cache():
+        return {"ok": True}
+
+    @app.get("/health")
+    def health():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiters={"ask": TokenBucketLimiter(0.5, ask_burst), "ingest": TokenBucketLimiter(1.0, ingest_burst)},
+        max_concurrency=max_concurrency,
+        enabled=True,
+    )
+    return TestClient(app)
+
+
+class TestTokenBucket:
+    """Test the token bucket arithmetic."""
+
+    def test_burst_then_refill(self):
+        """Should allow a burst, reject, then refill at the configured rate."""
+        limiter = TokenBucketLimiter(rate=2.0, burst=2)
+        assert limiter.acquire("a", now=0.0) == 0.0
+        assert limiter.acquire("a", now=0.0) == 0.0
+        assert limiter.acquire("a", now=0.0) == pytest.approx(0.5)
+        assert limiter.acquire("a", now=0.5) == 0.0
+
+    def test_clients_are_independent(self):
+        """One client's exhausted bucket should not affect another."""
+        limiter = TokenBucketLimiter(rate=1.0, burst=1)
+        limiter.acquire("a", now=0.0)
+        assert limiter.acquire("a", now=0.0) > 0
+        assert limiter.acquire("b", now=0.0) == 0.0
+
+    def test_idle_clients_are_evicted(self):
+        """Bucket state should stay bounded."""
+        limiter = TokenBucketLimiter(rate=1.0, burst=1, max_clients=2)
+        for key in "abc":
+            limiter.acquire(key, now=0.0)
+        assert list(limiter.buckets) == ["b", "c"]
+
+
+class TestRateLimitMiddleware:
+    """Test per-route-group limits over HTTP."""
+
+    def test_ask_limit_returns_429_with_retry_after(self):
+        """Requests past the burst should get 429 and Retry-After."""
+        client = build_client(ask_burst=2)
+        assert [client.post("/ask").status_code for _ in range(2)] == [200, 200]
+        response = client.post("/ask")
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) >= 1
+
+    def test_route_groups_have_separate_budgets(self):
+        """Exhausting /ask should not block /ingest."""
+        client = build_client(ask_burst=1, ingest_burst=3)
+        client.post("/ask")
+        assert client.post("/ask").status_code == 429
+        assert client.post("/ingest/telemetry").status_code == 200
+
+    def test_client_key_header(self):
+        """Different client keys should get separate buckets."""
+        client = build_client(ask_burst=1)
+        assert client.post("/ask", headers={"X-Client-Key": "device-1"}).status_code == 200
+        assert client.post("/ask", headers={"X-Client-Key": "device-1"}).status_code == 429
+        assert client.post("/ask", headers={"X-Client-Key": "device-2"}).status_code == 200
+
+    def test_unlimited_routes(self):
+        """Routes outside the limited groups should pass through."""
+        client = build_client(ask_burst=1)
+        assert all(client.get("/health").status_code == 200 for _ in range(10))
+
+    def test_reads_under_limited_prefixes_pass(self):
+        """GET endpoints next to the limited POST routes should not spend or need tokens."""
+        client = build_client(ask_burst=1, ingest_burst=1)
+        assert all(client.get("/ingest/current").status_code == 200 for _ in range(5))
+        assert all(client.get("/ask/cache").status_code == 200 for _ in range(5))
+        assert client.post("/ask").status_code == 200
+        assert client.post("/ingest/telemetry").status_code == 200
+        assert client.post("/ask").status_code == 429
+
+
+class TestConcurrencyCap:
+    """Test global load shedding."""
+
+    def test_rejects_when_at_capacity(self):
+        """Should answer 429 immediately once the in-flight cap is reached."""
+        release = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = RateLimitMiddleware(
+            slow_app, limiters={"ask": TokenBucketLimiter(100.0, 100)}, max_concurrency=1, enabled=True
+        )
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        async def scenario():
+            scope = {"type": "http", "method": "POST", "path": "/ask", "headers": [], "client": ("127.0.0.1", 1)}
+            first = asyncio.create_task(middleware(scope, None, send))
+            await asyncio.sleep(0)
+            await middleware(scope, None, send)
+            release.set()
+            await first
+
+        asyncio.run(scenario())
+        assert statuses == [429, 200]
+        assert middleware.in_flight == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+"""
+Tail-latency control tests: deadlines, hedged requests, and circuit breaking.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from floramigo.core.llm_client import FloramigoLLMClient, LLMUnavailableError, build_message
+from floramigo.core.resilience import CircuitBreaker, percentile
+
+
+def completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def make_client(create, **kwargs):
+    client = FloramigoLLMClient(api_key="test-key", **kwargs)
+    client._client = object()
+    client._create = create
+    return client
+
+
+MESSAGES = [build_message("user", "How is my plant?")]
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_on_error_rate(self):
+        """Should open once the windowed error rate crosses the threshold."""
+        breaker = CircuitBreaker(error_rate_threshold=0.5, min_calls=4, cooldown=60)
+        for _ in range(2):
+            breaker.record_success(0.1)
+        for _ in range(2):
+            breaker.record_failure(0.1)
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+    def test_opens_on_slow_p95(self):
+        """Should open when tail latency exceeds the threshold."""
+        breaker = CircuitBreaker(latency_threshold=1.0, min_calls=3, cooldown=60)
+        for _ in range(3):
+            breaker.record_success(2.0)
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_half_open_probe_closes_on_success(self):
+        """After cooldown a single probe should be allowed and close the breaker."""
+        breaker = CircuitBreaker(min_calls=1, cooldown=0)
+        breaker.record_failure(0.1)
+
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success(0.1)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_percentile(self):
+        """Should use nearest-rank percentiles."""
+        assert percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 0.95) == 10
+        assert percentile([1, 2, 3, 4], 0.5) == 2
+
+
+class TestLLMClientControls:
+    """Test deadlines and hedging in FloramigoLLMClient."""
+
+    def test_deadline_raises_unavailable(self):
+        """A call slower than the deadline should fail fast."""
+        client = make_client(lambda request: time.sleep(0.5) or completion("late"), timeout=0.05, hedge=False)
+        started = time.perf_counter()
+
+        with pytest.raises(LLMUnavailableError):
+            client.chat(MESSAGES)
+        assert time.perf_counter() - started < 0.3
+        assert client.stats()["timeouts"] == 1
+
+    def test_hedged_request_wins(self):
+        """A hedge fired after the delay should return when the primary stalls."""
+        calls = []
+
+        def create(request):
+            calls.append(1)
+            if len(calls) == 1:
+                time.sleep(0.5)
+                return completion("slow")
+            return completion("fast")
+
+        client = make_client(create, timeout=2.0, hedge=True, hedge_delay=0.05)
+
+        assert client.chat(MESSAGES) == "fast"
+        stats = client.stats()
+        assert stats["hedges_launched"] == 1
+        assert stats["hedges_won"] == 1
+
+    def test_open_breaker_short_circuits(self):
+        """An open breaker should skip the upstream call entirely."""
+        calls = []
+        breaker = CircuitBreaker(min_calls=1, cooldown=60)
+        breaker.record_failure(0.1)
+        client = make_client(lambda request: calls.append(1) or completion("hi"), breaker=breaker)
+
+        with pytest.raises(LLMUnavailableError):
+            client.chat(MESSAGES)
+        assert calls == []
+        assert client.stats()["short_circuited"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,147 @@
+"""
+Response cache tests for repeated /ask questions.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from floramigo.core.response_cache import ResponseCache, normalize_question, sensor_bucket
+
+
+def make_status(moisture=40, temperature=23.4, humidity=45.0, status="excellent"):
+    return {
+        "status": status,
+        "data": {"moisture": moisture, "temperature": temperature, "humidity": humidity},
+    }
+
+
+class TestKeying:
+    """Test question normalization and sensor bucketing."""
+
+    def test_normalize_question_strips_punctuation_and_case(self):
+        """Should ignore case and punctuation differences."""
+        assert normalize_question("Should I water my Snake Plant?!") == "should i water my snake plant"
+
+    def test_small_sensor_jitter_shares_bucket(self):
+        """Readings in the same bands should produce the same bucket."""
+        assert sensor_bucket(make_status(41, 23.1, 44.0)) == sensor_bucket(make_status(48, 22.2, 49.9))
+
+    def test_status_change_changes_bucket(self):
+        """A different status class should not reuse cached answers."""
+        assert sensor_bucket(make_status(status="good")) != sensor_bucket(make_status(status="fair"))
+
+
+class TestResponseCache:
+    """Test lookups, eviction, and persistence."""
+
+    def test_exact_hit_after_put(self):
+        """Should return a stored response for the same question and state."""
+        cache = ResponseCache(max_entries=4, ttl_seconds=60, similarity_threshold=0.85)
+        cache.put("Should I water my snake plant?", "Snake Plant", make_status(), "Not yet.", latency=1.5)
+
+        assert cache.get("should i water my snake plant", "snake plant", make_status()) == "Not yet."
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["saved_latency_seconds"] == pytest.approx(1.5)
+
+    def test_near_duplicate_hit(self):
+        """Should match lightly reworded questions above the threshold."""
+        cache = ResponseCache(max_entries=4, ttl_seconds=60, similarity_threshold=0.7)
+        cache.put("should i water my snake plant", "Snake Plant", make_status(), "Not yet.")
+
+        assert cache.get("should i water my snake plant today", "Snake Plant", make_status()) == "Not yet."
+        assert cache.stats()["near_hits"] == 1
+
+    def test_negated_question_misses(self):
+        """A long question that differs by a negation or a number should not reuse the answer."""
+        cache = ResponseCache(max_entries=4, ttl_seconds=60, similarity_threshold=0.85)
+        question = "should i water my snake plant this week or wait until the weekend"
+        cache.put(question, "Snake Plant", make_status(), "Wait for the weekend.")
+
+        assert cache.get(question.replace("should i", "should i not"), "Snake Plant", make_status()) is None
+        assert cache.get(question.replace("this week", "in 2 weeks"), "Snake Plant", make_status()) is None
+        assert cache.get(question.replace("or wait", "or just wait"), "Snake Plant", make_status()) == "Wait for the weekend."
+
+    def test_different_plant_misses(self):
+        """Should not share answers across plants."""
+        cache = ResponseCache(max_entries=4, ttl_seconds=60, similarity_threshold=0.7)
+        cache.put("should i water it", "Snake Plant", make_status(), "Not yet.")
+
+        assert cache.get("should i water it", "Peace Lily", make_status()) is None
+
+    def test_ttl_expiry(self):
+        """Should drop entries older than the TTL."""
+        cache = ResponseCache(max_entries=4, ttl_seconds=0.01, similarity_threshold=1.0)
+        cache.put("hello", None, None, "Hi!")
+        time.sleep(0.02)
+
+        assert cache.get("hello", None, None) is None
+
+    def test_lru_eviction(self):
+        """Should evict the least recently used entry when full."""
+        cache = ResponseCache(max_entries=2, ttl_seconds=60, similarity_threshold=1.0)
+        cache.put("first", None, None, "1")
+        cache.put("second", None, None, "2")
+        cache.get("first", None, None)
+        cache.put("third", None, None, "3")
+
+        assert cache.get("second", None, None) is None
+        assert cache.get("first", None, None) == "1"
+
+    def test_disk_backing_round_trip(self, tmp_path):
+        """Should reload persisted entries from disk."""
+        path = tmp_path / "response_cache.json"
+        cache = ResponseCache(max_entries=4, ttl_seconds=60, path=path)
+        cache.put("hello", None, None, "Hi!")
+        cache.flush()
+
+        assert ResponseCache(max_entries=4, ttl_seconds=60, path=path).get("hello", None, None) == "Hi!"
+
+    def test_malformed_rows_are_skipped(self, tmp_path):
+        """Bad rows in the cache file should be dropped, keeping the good ones."""
+        path = tmp_path / "response_cache.json"
+        ResponseCache(max_entries=4, ttl_seconds=60, path=path, flush_interval=0).put("hello", None, None, "Hi!")
+        rows = json.loads(path.read_text())
+        rows += [{"question": "missing fields"}, "not a row", {**rows[0], "question": "later", "created_at": "yesterday"}]
+        path.write_text(json.dumps(rows))
+
+        cache = ResponseCache(max_entries=4, ttl_seconds=60, path=path)
+        assert cache.get("hello", None, None) == "Hi!"
+        assert len(cache._entries) == 1
+
+    def test_concurrent_persists_leave_valid_file(self, tmp_path):
+        """Parallel writers should never clobber each other's temporary file."""
+        path = tmp_path / "response_cache.json"
+        cache = ResponseCache(max_entries=64, ttl_seconds=60, path=path, flush_interval=0)
+
+        def writer(index):
+            for step in range(10):
+                cache.put(f"question {index} {step}", None, None, "answer")
+
+        threads = [threading.Thread(target=writer, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(json.loads(path.read_text())) == 40
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_puts_are_flushed_in_the_background(self, tmp_path):
+        """A burst of puts should be written once, after the flush interval, off the caller's thread."""
+        path = tmp_path / "response_cache.json"
+        cache = ResponseCache(max_entries=8, ttl_seconds=60, path=path, flush_interval=0.05)
+        for index in range(5):
+            cache.put(f"question {index}", None, None, "answer")
+        assert not path.exists()
+
+        deadline = time.time() + 2.0
+        while not path.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(json.loads(path.read_text())) == 5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,201 @@
+"""
+Care-tip retrieval tests.
+"""
+
+import random
+import time
+from unittest.mock import patch
+
+import pytest
+from benchmarks.intent import SAMPLE_STATUS
+from benchmarks.retrieval import DATA_DIR, evaluate, load_queries, score
+from floramigo.core import rag_pipeline
+from floramigo.core.bm25 import BM25Index, tokenize
+from floramigo.core.orchestrator import FloramigoOrchestrator
+from floramigo.core.rag_pipeline import BM25Retriever, Retriever, VectorRetriever, retrieve_care_tips
+from floramigo.pcd.corpus import build_care_documents
+
+
+class TestTokenizer:
+    """Test tokenization and light stemming."""
+
+    def test_stopwords_and_stemming(self):
+        """Should drop stopwords and fold simple inflections."""
+        assert tokenize("Should I be watering the leaves?") == ["water", "leave"]
+        assert tokenize("watered waters") == ["water", "water"]
+
+
+class TestBM25Index:
+    """Test inverted index scoring."""
+
+    @pytest.fixture
+    def index(self):
+        index = BM25Index()
+        index.add("water", tokenize("Water deeply and let the soil drain"))
+        index.add("light", tokenize("Bright indirect light helps growth"))
+        index.add("humidity", tokenize("Low humidity causes crispy brown leaf tips"))
+        return index
+
+    def test_ranks_matching_document_first(self, index):
+        """Should rank the document sharing rare query terms highest."""
+        assert index.search(tokenize("brown tips on my leaves"), k=1)[0][0] == "humidity"
+
+    def test_remove_document(self, index):
+        """Removed documents should no longer be returned."""
+        index.remove("light")
+        assert "light" not in index
+        assert index.search(tokenize("bright light"), k=3) == []
+
+    def test_replace_document(self, index):
+        """Re-adding an id should replace its postings."""
+        index.add("water", tokenize("Mist the leaves"))
+        assert index.search(tokenize("drain"), k=3) == []
+        assert len(index) == 3
+
+    def test_large_corpus_query_latency(self):
+        """Queries should stay well under a millisecond on thousands of documents."""
+        rng = random.Random(3)
+        vocabulary = [f"term{i}" for i in range(3000)] + tokenize("water soil light humidity yellow leaves pests")
+        index = BM25Index()
+        for doc in range(5000):
+            index.add(f"doc{doc}", rng.choices(vocabulary, k=25))
+
+        query = tokenize("yellow leaves and wet soil")
+        started = time.perf_counter()
+        for _ in range(100):
+            index.search(query, k=5)
+        assert (time.perf_counter() - started) / 100 < 0.002
+
+
+class TestRetrieveCareTips:
+    """Test retrieval over snippets and plant profiles."""
+
+    def test_profiles_are_indexed(self):
+        """Should build documents from the plant profiles file."""
+        assert any(document.plant == "Peace Lily" for document in build_care_documents())
+
+    def test_plant_specific_issue(self):
+        """Should surface the matching common issue for the named plant."""
+        tips = retrieve_care_tips("my leaves are turning yellow", "Peace Lily")
+        assert any("Peace Lily common issue: Overwatering" in tip for tip in tips)
+
+    def test_other_plants_filtered(self):
+        """Should not return profile entries for a different plant."""
+        tips = retrieve_care_tips("brown tips", "Spider Plant")
+        assert not any(tip.startswith(("Snake Plant", "Peace Lily")) for tip in tips)
+
+    def test_result_size_and_tailoring_line(self):
+        """Should cap results, pad with general tips, and keep the tailoring hint."""
+        tips = retrieve_care_tips("hello", "Basil")
+        assert 1 < len(tips) <= 5
+        assert tips[0].startswith("Check soil moisture")
+        assert tips[-1].startswith("Tailor advice for Basil")
+
+    def test_base_retriever_is_abstract(self):
+        """The base class should not be usable without a ranking."""
+        with pytest.raises(TypeError):
+            Retriever(build_care_documents())
+
+
+class TestVectorIndex:
+    """Test the NumPy hashing-vector index and its persistence."""
+
+    @pytest.fixture
+    def documents(self):
+        pytest.importorskip("numpy")
+        return build_care_documents()
+
+    def test_top_k_matches_full_sort(self, documents):
+        """argpartition top-k should agree with a full ranking."""
+        from floramigo.core.vector_index import VectorIndex
+
+        index = VectorIndex.build([d.doc_id for d in documents], [d.text for d in documents])
+        scores = index.matrix @ index.embed_query("yellow leaves and root rot")
+        expected = [index.doc_ids[i] for i in scores.argsort()[::-1][:3]]
+        assert [doc_id for doc_id, _ in index.search("yellow leaves and root rot", k=3)] == expected
+
+    def test_persisted_index_is_memory_mapped(self, documents, tmp_path):
+        """A saved index should reload through a memory map."""
+        import numpy as np
+
+        VectorRetriever(documents, tmp_path)
+        reloaded = VectorRetriever(documents, tmp_path)
+        assert isinstance(reloaded.index.matrix, np.memmap)
+        assert reloaded.index.matrix.dtype == np.float32
+
+    def test_changed_corpus_rebuilds(self, documents, tmp_path):
+        """A fingerprint mismatch should rebuild instead of loading stale vectors."""
+        VectorRetriever(documents, tmp_path)
+        rebuilt = VectorRetriever(documents[:-1], tmp_path)
+        assert len(rebuilt.index) == len(documents) - 1
+
+    def test_plant_filter(self, documents):
+        """Vector search should apply the same plant filter as BM25."""
+        results = VectorRetriever(documents).search("brown leaf tips", 4, plant="Spider Plant")
+        assert results[0].doc_id == "profile:spider-plant:issue:0"
+        assert all(document.plant in (None, "Spider Plant") for document in results)
+
+
+class TestRetrievalCache:
+    """Test memoized retrieval and prompt prefixes."""
+
+    def test_normalized_questions_share_an_entry(self):
+        """Case and punctuation differences should hit the same cache entry."""
+        rag_pipeline.clear_retrieval_cache()
+        first = retrieve_care_tips("Why are my leaves turning YELLOW?", "Peace Lily")
+        second = retrieve_care_tips("why are my leaves turning yellow", "Peace Lily")
+        stats = rag_pipeline.retrieval_cache_stats()
+        assert first == second
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    def test_reload_clears_cache(self):
+        """Swapping the retriever should drop cached results."""
+        retrieve_care_tips("brown tips", "Spider Plant")
+        rag_pipeline.refresh_retriever(force=True)
+        assert rag_pipeline.retrieval_cache_stats()["size"] == 0
+
+    def test_prompt_prefix_is_stable_and_dynamic_context_last(self):
+        """The prefix should be reused verbatim and sensor data should come last."""
+        orchestrator = FloramigoOrchestrator(tool_calling=False)
+        with patch("floramigo.core.orchestrator.format_sensor_context_for_llm", return_value="[SENSOR DATA]"):
+            first = orchestrator._system_prompt("Snake Plant", "Should I water?", True, SAMPLE_STATUS)
+            second = orchestrator._system_prompt("snake plant", "Is it getting enough light?", True, SAMPLE_STATUS)
+        prefix = orchestrator._prompt_prefix("Snake Plant")
+        assert first.startswith(prefix) and second.startswith(prefix)
+        assert first.index("Care profile") < first.index("Helpful care tips") < first.index("[SENSOR DATA]")
+        assert first.endswith("[SENSOR DATA]")
+
+    def test_invalidate_prompt_cache(self):
+        """Explicit invalidation should rebuild the prefix."""
+        orchestrator = FloramigoOrchestrator(tool_calling=False)
+        prefix = orchestrator._prompt_prefix("Peace Lily")
+        orchestrator.invalidate_prompt_cache()
+        assert orchestrator._prefix_cache == {}
+        assert orchestrator._prompt_prefix("Peace Lily") == prefix
+
+
+class TestRetrievalBenchmark:
+    """Test the labeled retrieval benchmark."""
+
+    def test_labels_reference_real_documents(self):
+        """Every relevant id in the query set should exist in the corpus."""
+        doc_ids = {document.doc_id for document in build_care_documents()}
+        queries = load_queries(DATA_DIR / "retrieval_queries.json")
+        assert {"watering", "light", "humidity", "pests", "species"} <= {row["category"] for row in queries}
+        assert all(set(row["relevant"]) <= doc_ids for row in queries)
+
+    def test_score_recall_and_reciprocal_rank(self):
+        """Should score recall over all labels and the rank of the first hit."""
+        assert score(["a", "b", "c"], {"b", "d"}, k=3) == (0.5, 0.5)
+        assert score(["a", "b"], {"z"}, k=2) == (0.0, 0.0)
+
+    def test_bm25_quality_floor(self):
+        """BM25 should keep its recall and MRR on the labeled set."""
+        report = evaluate(BM25Retriever(build_care_documents()), load_queries(DATA_DIR / "retrieval_queries.json"), k=5, repeat=1)
+        assert report["recall@5"] >= 0.8
+        assert report["mrr"] >= 0.7
+        assert set(report["categories"]) >= {"pests", "species"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+"""
+Singleflight tests for coalescing identical concurrent LLM calls.
+"""
+
+import threading
+import time
+
+import pytest
+from floramigo.core.singleflight import SingleFlight, prompt_key
+
+
+class TestSingleFlight:
+    """Test in-flight request deduplication."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Identical concurrent keys should run the function once."""
+        flight = SingleFlight()
+        calls = []
+        results = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return "shared answer"
+
+        def worker():
+            results.append(flight.do("same-question", slow_call))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert [result for result, _ in results] == ["shared answer"] * 5
+        assert sum(1 for _, shared in results if shared) == 4
+        assert flight.stats()["coalesced"] == 4
+
+    def test_errors_propagate_to_waiters(self):
+        """Waiters should see the leader's exception."""
+        flight = SingleFlight()
+        errors = []
+
+        def failing_call():
+            time.sleep(0.05)
+            raise RuntimeError("upstream down")
+
+        def worker():
+            try:
+                flight.do("key", failing_call)
+            except RuntimeError as exc:
+                errors.append(str(exc))
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == ["upstream down"] * 3
+        assert flight.in_flight() == 0
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Completed calls should not be reused by later requests."""
+        flight = SingleFlight()
+        assert flight.do("key", lambda: 1) == (1, False)
+        assert flight.do("key", lambda: 2) == (2, False)
+
+    def test_prompt_key_separates_parts(self):
+        """Part boundaries should be part of the key."""
+        assert prompt_key("ab", "c") != prompt_key("a", "bc")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+"""
+Shared state store tests for multi-worker deployments.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from floramigo.core.phd import PlantHealthDaemon
+from floramigo.core.state_store import SQLiteStateStore, WriterLock
+
+ROOT = Path(__file__).resolve().parents[1]
+READING = {"temperature": 22.0, "humidity": 45.0, "moisture_pct": 40, "light_raw": 200}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "state.db"
+
+
+def worker(db_path, tmp_path):
+    return PlantHealthDaemon(store=SQLiteStateStore(db_path), writer_lock=WriterLock(tmp_path / "serial.lock"))
+
+
+class TestSQLiteStateStore:
+    """Test the SQLite WAL store."""
+
+    def test_writes_bump_version(self, db_path):
+        """Every write should advance the shared version."""
+        store = SQLiteStateStore(db_path)
+        before = store.version()
+        store.save_current(READING)
+        store.append_alerts([{"type": "moisture_low"}], keep=50)
+        assert store.version() == before + 2
+        assert store.load_current() == READING
+
+    def test_wal_mode(self, db_path):
+        """The database should use write-ahead logging so readers never block the writer."""
+        store = SQLiteStateStore(db_path)
+        assert store._conn().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_history_is_throttled_across_writers(self, db_path):
+        """Two workers writing within the interval should record one history row."""
+        first, second = SQLiteStateStore(db_path), SQLiteStateStore(db_path)
+        assert first.append_history(READING, keep=10, min_interval=60) is True
+        assert second.append_history(READING, keep=10, min_interval=60) is False
+        assert len(second.load_history(10)) == 1
+
+    def test_alerts_and_chat_are_trimmed(self, db_path):
+        """Alert and chat tables should keep only the newest rows."""
+        store = SQLiteStateStore(db_path)
+        store.append_alerts([{"n": i} for i in range(8)], keep=5)
+        store.append_chat([{"role": "user", "content": str(i)} for i in range(6)], keep=4)
+        assert [alert["n"] for alert in store.load_alerts(50)] == [3, 4, 5, 6, 7]
+        assert [message["content"] for message in store.recent_chat(10)] == ["2", "3", "4", "5"]
+
+
+class TestSharedDaemons:
+    """Test two daemons standing in for two API workers."""
+
+    def test_reading_visible_to_other_worker(self, db_path, tmp_path):
+        """A reading ingested by one worker should be served by another."""
+        a, b = worker(db_path, tmp_path), worker(db_path, tmp_path)
+        a.ingest_reading({**READING, "moisture_pct": 8})
+
+        status = b.get_plant_status()
+        assert status["data"]["moisture"] == 8
+        assert any(alert["type"] == "moisture_critical" for alert in b.get_alerts())
+        assert a.state_tag() == b.state_tag()
+
+    def test_plant_assignment_is_shared(self, db_path, tmp_path):
+        """Assigning a plant on one worker should switch thresholds everywhere."""
+        a, b = worker(db_path, tmp_path), worker(db_path, tmp_path)
+        a.assign_plant("peace lily")
+        b.get_plant_status()
+        assert b.plant_name == "Peace Lily"
+        assert b.thresholds["moisture_low"] == a.thresholds["moisture_low"]
+
+    def test_restart_does_not_duplicate_history(self, db_path, tmp_path):
+        """A worker starting against a populated store should load each history row once."""
+        store = SQLiteStateStore(db_path)
+        for minute in range(3):
+            store.append_history({**READING, "moisture_pct": minute}, keep=1440, min_interval=0)
+        first = worker(db_path, tmp_path)
+        assert [entry["moisture_pct"] for entry in first.history] == [0, 1, 2]
+
+        restarted = worker(db_path, tmp_path)
+        restarted.get_plant_status()
+        assert len(restarted.history) == len(first.history) == 3
+
+    def test_reading_from_another_process(self, db_path, tmp_path):
+        """Readings written by a separate process should be picked up."""
+        reader = worker(db_path, tmp_path)
+        script = (
+            "import sys; from pathlib import Path\n"
+            "from floramigo.core.phd import PlantHealthDaemon\n"
+            "from floramigo.core.state_store import SQLiteStateStore\n"
+            "PlantHealthDaemon(store=SQLiteStateStore(Path(sys.argv[1]))).ingest_reading("
+            "{'temperature': 30.5, 'humidity': 50, 'moisture_pct': 55, 'light_raw': 300})\n"
+        )
+        subprocess.run([sys.executable, "-c", script, str(db_path)], cwd=ROOT, check=True, timeout=60)
+        assert reader.get_current_readings()["temperature"] == 30.5
+
+
+class TestWriterLock:
+    """Test the single serial-monitor owner."""
+
+    def test_only_one_owner(self, tmp_path):
+        """A second worker should not acquire the serial lock until it is released."""
+        first, second = WriterLock(tmp_path / "serial.lock"), WriterLock(tmp_path / "serial.lock")
+        assert first.acquire() is True
+        assert second.acquire() is False
+        first.release()
+        assert second.acquire() is True
+        second.release()
+
+    def test_daemon_start_respects_lock(self, db_path, tmp_path):
+        """start() should refuse when another worker owns the serial port."""
+        owner = WriterLock(tmp_path / "serial.lock")
+        owner.acquire()
+        daemon = worker(db_path, tmp_path)
+        assert daemon.start() is False
+        assert daemon.running is False
+        owner.release()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Per-plant threshold compilation tests.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from floramigo.core.phd import THRESHOLDS, PlantHealthDaemon
+from floramigo.core.state_store import JsonStateStore, WriterLock
+from floramigo.pcd.thresholds import compile_thresholds, fahrenheit_to_celsius, parse_range, plant_thresholds
+
+
+def reading(**overrides):
+    values = {"temperature": 22.0, "humidity": 45.0, "moisture_pct": 40, "light_raw": 200}
+    values.update(overrides)
+    return values
+
+
+class TestCompileThresholds:
+    """Test parsing profile care strings into numeric bands."""
+
+    def test_parse_range(self):
+        """Should read closed and open-ended ranges."""
+        assert parse_range("65–85 (avoid below 50)") == (65.0, 85.0)
+        assert parse_range("Low to average (30–50%)") == (30.0, 50.0)
+        assert parse_range("High (40–60%+)") == (40.0, None)
+        assert parse_range("Bright indirect") is None
+
+    def test_temperature_converted_to_celsius(self):
+        """Should convert °F bands and the avoid-below limit to °C."""
+        thresholds = compile_thresholds({"Care Profile": {"Temperature (°F)": "65–85 (avoid below 50)"}}, THRESHOLDS)
+        assert thresholds["temperature_low"] == fahrenheit_to_celsius(65) == 18.3
+        assert thresholds["temperature_high"] == 29.4
+        assert thresholds["temperature_critical"] == 10.0
+
+    def test_moisture_phrases(self):
+        """Should map soil moisture wording to moisture bands."""
+        dry = compile_thresholds({"Care Profile": {"Soil Moisture": "Allow soil to dry thoroughly between waterings"}}, THRESHOLDS)
+        moist = compile_thresholds({"Care Profile": {"Soil Moisture": "Consistently moist, not waterlogged"}}, THRESHOLDS)
+        assert dry["moisture_low"] < THRESHOLDS["moisture_low"] < moist["moisture_low"]
+
+    def test_open_ended_humidity_keeps_default_high(self):
+        """A '60%+' band should not lower the high-humidity limit."""
+        _, thresholds = plant_thresholds("Peace Lily", THRESHOLDS)
+        assert thresholds["humidity_low"] == 40.0
+        assert thresholds["humidity_high"] == THRESHOLDS["humidity_high"]
+
+    def test_compiled_once_per_plant(self):
+        """Should return the cached bands for repeated lookups, including fuzzy names."""
+        name, first = plant_thresholds("Snake Plant", THRESHOLDS)
+        _, second = plant_thresholds("sansevieria", THRESHOLDS)
+        assert name == "Snake Plant"
+        assert first is second
+
+    def test_unknown_plant_uses_defaults(self):
+        """Should fall back to the global thresholds."""
+        name, thresholds = plant_thresholds("Basil", THRESHOLDS)
+        assert name is None
+        assert dict(thresholds) == THRESHOLDS
+
+
+class TestDaemonThresholds:
+    """Test that the daemon evaluates readings against the assigned plant."""
+
+    @pytest.fixture
+    def daemon(self):
+        daemon = PlantHealthDaemon()
+        daemon.alerts = []
+        daemon.history = []
+        return daemon
+
+    def test_assign_plant(self, daemon):
+        """Should resolve the plant and swap in its bands."""
+        assert daemon.assign_plant("snake plnt") == "Snake Plant"
+        assert daemon.thresholds["moisture_low"] == 10.0
+        assert daemon.assign_plant(None) is None
+        assert daemon.thresholds["moisture_low"] == THRESHOLDS["moisture_low"]
+
+    def test_species_specific_moisture(self, daemon):
+        """15% moisture is fine for a snake plant but low for a peace lily."""
+        daemon.assign_plant("Snake Plant")
+        daemon.ingest_reading(reading(moisture_pct=15, humidity=40.0))
+        assert daemon.get_plant_status()["status"] == "excellent"
+
+        daemon.assign_plant("Peace Lily")
+        daemon.ingest_reading(reading(moisture_pct=15, humidity=40.0))
+        status = daemon.get_plant_status()
+        assert status["plant"] == "Peace Lily"
+        assert any("critically dry" in issue for issue in status["issues"])
+
+    def test_avoid_below_raises_critical_alert(self, daemon):
+        """Temperatures below the profile's avoid-below limit should be critical."""
+        daemon.assign_plant("Spider Plant")
+        daemon.ingest_reading(reading(temperature=8.0, humidity=55.0))
+        assert daemon.get_alerts()[-1]["type"] == "temperature_critical"
+        assert daemon.get_plant_status()["status"] == "needs_attention"
+
+
+class TestIngestPlantName:
+    """Test the plant name sent with telemetry."""
+
+    def test_alias_of_current_plant_is_not_reassigned(self, tmp_path):
+        """A typo or alias that resolves to the current plant should not rewrite it on every reading."""
+        store = JsonStateStore(tmp_path / "current.json", tmp_path / "history.json", tmp_path / "alerts.json")
+        daemon = PlantHealthDaemon(plant_name="Snake Plant", store=store, writer_lock=WriterLock(tmp_path / "serial.lock"))
+        client = TestClient(app)
+        body = {"temperature": 22.0, "humidity": 45.0, "moisture_pct": 40, "light_raw": 300}
+        with patch("api.routers.ingest.plant_health_daemon", daemon), patch.object(
+            daemon, "assign_plant", wraps=daemon.assign_plant
+        ) as assign:
+            for name in ("snake plnt", "Snake Plant", "snake plant"):
+                assert client.post("/ingest/telemetry", json={**body, "plant_name": name}).status_code == 200
+            assign.assert_not_called()
+            client.post("/ingest/telemetry", json={**body, "plant_name": "peace lily"})
+            assign.assert_called_once_with("peace lily")
+        assert daemon.plant_name == "Peace Lily"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+"""
+On-demand tool calling tests.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from benchmarks.intent import SAMPLE_STATUS
+from floramigo.core.llm_client import FloramigoLLMClient, LLMUnavailableError, build_message
+from floramigo.core.orchestrator import FloramigoOrchestrator
+from floramigo.core.tools import TOOL_HANDLERS, TOOL_SPECS, run_tool
+
+
+HISTORY = [
+    {"timestamp": f"2026-03-06T10:0{i}:00", "temperature": 22.0 + i, "humidity": 40.0, "moisture_pct": 50 - i * 5, "light_raw": 200}
+    for i in range(4)
+]
+
+
+def tool_call(name, arguments):
+    return SimpleNamespace(id=f"call_{name}", function=SimpleNamespace(name=name, arguments=json.dumps(arguments)))
+
+
+def response(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, tool_calls=tool_calls))])
+
+
+class TestToolHandlers:
+    """Test tool implementations over the daemon and profiles."""
+
+    def test_recent_history_limit(self):
+        """Should return the requested number of recent readings."""
+        with patch("floramigo.core.tools.get_history", side_effect=lambda limit: HISTORY[-limit:]):
+            rows = json.loads(run_tool("get_recent_history", '{"limit": 2}'))
+        assert [row["moisture_pct"] for row in rows] == [40, 35]
+
+    def test_plant_profile_lookup(self):
+        """Should return the care profile for a known plant."""
+        profile = json.loads(run_tool("get_plant_profile", '{"plant_name": "snake plant"}'))
+        assert profile["name"] == "Snake Plant"
+        assert "Care Profile" in profile
+
+    def test_unknown_tool_and_bad_arguments(self):
+        """Should report errors to the model instead of raising."""
+        assert "error" in json.loads(run_tool("delete_everything", "{}"))
+        assert "error" in json.loads(run_tool("get_recent_history", "[1, 2]"))
+
+    def test_handler_failure_is_reported(self):
+        """Errors raised inside a handler should come back as a JSON error, not escape."""
+        with patch("floramigo.core.tools.get_history", side_effect=OSError("database is locked")):
+            payload = json.loads(run_tool("get_recent_history", '{"limit": 2}'))
+        assert "database is locked" in payload["error"]
+
+    def test_specs_match_handlers(self):
+        """Every advertised tool should have a handler."""
+        assert {spec["function"]["name"] for spec in TOOL_SPECS} == set(TOOL_HANDLERS)
+
+
+class TestToolLoop:
+    """Test the function-calling loop in FloramigoLLMClient."""
+
+    def test_executes_tool_then_answers(self):
+        """Should run requested tools and return the final answer."""
+        requests = []
+        replies = [
+            response(tool_calls=[tool_call("get_rolling_stats", {"window": 30})]),
+            response(content="Moisture has been falling steadily."),
+        ]
+
+        def create(request):
+            requests.append(request)
+            return replies.pop(0)
+
+        client = FloramigoLLMClient(api_key="test-key", hedge=False)
+        client._client = object()
+        client._create = create
+
+        answer = client.chat_with_tools(
+            [build_message("user", "Is it drying out?")],
+            TOOL_SPECS,
+            lambda name, arguments: json.dumps({"tool": name}),
+        )
+
+        assert answer == "Moisture has been falling steadily."
+        assert requests[1]["messages"][-1] == {"role": "tool", "tool_call_id": "call_get_rolling_stats", "content": '{"tool": "get_rolling_stats"}'}
+        assert client.stats()["tool_calls"] == 1
+
+    def test_rounds_share_one_deadline(self):
+        """Several slow rounds should not each get a fresh timeout."""
+
+        def create(request):
+            time.sleep(0.06)
+            return response(tool_calls=[tool_call("get_rolling_stats", {"window": 30})])
+
+        client = FloramigoLLMClient(api_key="test-key", hedge=False, timeout=0.15)
+        client._client = object()
+        client._create = create
+
+        started = time.perf_counter()
+        with pytest.raises(LLMUnavailableError):
+            client.chat_with_tools(
+                [build_message("user", "Is it drying out?")],
+                TOOL_SPECS,
+                lambda name, arguments: "{}",
+                max_rounds=10,
+            )
+        assert time.perf_counter() - started < 0.4
+
+
+class TestToolModePrompt:
+    """Test that tool mode keeps the system prompt small."""
+
+    def test_tool_mode_prompt_is_smaller(self):
+        """Tool mode should drop the full sensor block and tips."""
+        with patch("floramigo.core.orchestrator.format_sensor_context_for_llm", return_value="[SENSOR DATA]\n" + "x" * 400):
+            full = FloramigoOrchestrator(tool_calling=False)._system_prompt("Snake Plant", "Should I water?", True, SAMPLE_STATUS)
+            compact = FloramigoOrchestrator(tool_calling=True)._system_prompt("Snake Plant", "Should I water?", True, SAMPLE_STATUS)
+
+        assert len(compact) < len(full)
+        assert "Helpful care tips" not in compact
+        assert SAMPLE_STATUS["summary"] in compact
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+"""
+On-device wake word detection tests.
+"""
+
+import random
+
+import numpy as np
+import pytest
+from benchmarks.wake_word import (
+    CONFUSABLE_PHRASES,
+    WAKE_PHRASE,
+    Voice,
+    background,
+    evaluate,
+    place,
+    stream,
+    synthesize,
+    synthetic_fixtures,
+)
+from floramigo.voice.wake_word import SAMPLE_RATE, EnergyGate, KeywordSpotter, mfcc, subsequence_dtw
+
+
+@pytest.fixture(scope="module")
+def user():
+    return Voice(random.Random(3))
+
+
+@pytest.fixture(scope="module")
+def spotter(user):
+    rng = random.Random(4)
+    spotter = KeywordSpotter()
+    for seed in range(3):
+        spotter.enroll(place(synthesize(WAKE_PHRASE, user.vary(rng), seed=seed), seed=seed)[0])
+    return spotter
+
+
+class TestFeatures:
+    """Test MFCC extraction and template matching."""
+
+    def test_mfcc_shape_and_mean_normalisation(self):
+        """10 ms frames, c0 dropped, and each coefficient centred on zero."""
+        features = mfcc(background(1.0, 0.05, seed=1))
+        assert features.shape == (1 + (SAMPLE_RATE - 400) // 160, 12)
+        assert np.allclose(features.mean(axis=0), 0, atol=1e-4)
+
+    def test_subsequence_match_ignores_surrounding_audio(self, user):
+        """A phrase inside a longer clip should still match far better than another phrase."""
+        phrase = mfcc(synthesize(WAKE_PHRASE, user, seed=1))
+        surrounded = mfcc(place(synthesize(WAKE_PHRASE, user, seed=1), lead=1.0, tail=1.0)[0])
+        other = mfcc(synthesize(CONFUSABLE_PHRASES["hey google"], user, seed=1))
+        assert subsequence_dtw(phrase, phrase) == pytest.approx(0, abs=1e-5)
+        assert subsequence_dtw(phrase, surrounded) < 0.2
+        assert subsequence_dtw(phrase, other) > 2 * subsequence_dtw(phrase, surrounded)
+
+    def test_energy_gate_tracks_the_noise_floor(self):
+        """Room noise stays below the gate while louder sound opens it."""
+        gate = EnergyGate()
+        assert not gate.speech(np.full(50, 0.003)).any()
+        assert gate.speech(np.full(5, 0.1)).all()
+
+
+class TestKeywordSpotter:
+    """Test enrollment, detection, and the streaming path."""
+
+    def test_detects_the_enrolled_phrase(self, spotter, user):
+        """New attempts of the wake phrase should trigger."""
+        rng = random.Random(9)
+        for seed in range(5):
+            assert spotter.detect(place(synthesize(WAKE_PHRASE, user.vary(rng), seed=50 + seed), seed=seed)[0])
+
+    @pytest.mark.parametrize("phrase", ["hey google", "flamingo", "amigo", "hello flora"])
+    def test_rejects_confusable_phrases(self, spotter, user, phrase):
+        """Phrases that share sounds with the wake phrase should not trigger."""
+        assert not spotter.detect(place(synthesize(CONFUSABLE_PHRASES[phrase], user, seed=7))[0])
+
+    def test_silence_never_reaches_the_matcher(self, spotter):
+        """The energy gate should keep quiet rooms from costing any template matching."""
+        spotter.stats = dict.fromkeys(spotter.stats, 0)
+        hit_at, _ = stream(spotter, background(10.0, 0.003, seed=2))
+        assert hit_at is None
+        assert spotter.stats["evaluations"] == 0
+
+    def test_streaming_fires_shortly_after_the_phrase(self, spotter, user):
+        """Fed in microphone-sized chunks, the hit should land within half a second of the phrase."""
+        audio, phrase_end = place(synthesize(WAKE_PHRASE, user.vary(random.Random(11)), seed=77), seed=3)
+        hit_at, _ = stream(spotter, audio)
+        assert hit_at is not None
+        assert 0 <= hit_at - phrase_end < SAMPLE_RATE // 2
+
+    def test_int16_input(self, spotter, user):
+        """Raw 16-bit microphone samples should work like floats."""
+        audio = place(synthesize(WAKE_PHRASE, user.vary(random.Random(12)), seed=78), seed=4)[0]
+        assert spotter.detect((audio * 32767).astype(np.int16))
+
+    def test_enrolling_silence_fails(self):
+        """An enrollment take without speech should be refused."""
+        with pytest.raises(ValueError):
+            KeywordSpotter().enroll(background(2.0, 0.003, seed=5))
+
+    def test_no_templates_never_fires(self, user):
+        """Without enrollment the detector should stay silent."""
+        assert not KeywordSpotter().detect(place(synthesize(WAKE_PHRASE, user, seed=1))[0])
+
+    def test_save_and_load(self, spotter, tmp_path):
+        """Templates and the calibrated threshold should survive a round trip."""
+        spotter.save(tmp_path / "wake.npz")
+        loaded = KeywordSpotter.load(tmp_path / "wake.npz")
+        assert loaded.threshold == pytest.approx(spotter.threshold)
+        assert len(loaded.templates) == len(spotter.templates)
+        assert np.array_equal(loaded.templates[0], spotter.templates[0])
+
+
+class TestBenchmark:
+    """Test the false accept and latency report."""
+
+    def test_report(self):
+        """The synthetic fixtures should run clean and report latency and chunk cost."""
+        report = evaluate(synthetic_fixtures(seed=5, positives=4, speakers=2))
+        assert report["false_rejects"] == 0
+        assert report["false_accepts"] == 0
+        assert report["scores"]["worst_positive"] < report["threshold"] < report["scores"]["best_negative"]
+        assert report["latency_ms"]["p50"] is not None
+        assert report["silence"]["evaluations"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])